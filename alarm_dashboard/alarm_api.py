@@ -0,0 +1,223 @@
+# 경보 조회 API (읽기 전용 HTTP JSON)
+# - 병동 현황판 / EMR 배너 등 다른 시스템이 통합 경보 레벨(1~5)과 시리즈별 경보 상태를 가져가는 용도
+# - 표준 라이브러리 http.server 만 사용 (추가 설치 없음), Streamlit 과 별도 프로세스로 실행
+# - 시작 시 모든 경보결과 파일을 읽어 메모리 스냅샷(시리즈 + 타임라인 + 미리 만든 JSON)으로 보관
+#   ResultWatcher 가 파일 변경을 확정하면 백그라운드 스레드가 새 스냅샷을 만들어 통째로 교체 (요청 처리는 잠금 없이 조회만)
+#   새 스냅샷을 만들다 실패하면 (쓰는 중인 파일 등) 이전 스냅샷으로 계속 응답
+# - 엔드포인트 (이름은 URL 인코딩, 월은 YYYY-MM)
+#   GET /series                                                 시리즈 목록 (?group=hospital|community)
+#   GET /series/<이름>                                          시리즈 이력 (?start=YYYY-MM&end=YYYY-MM)
+#   GET /level?hospital=<이름>&community=<이름>&date=YYYY-MM    통합 레벨 + 두 시리즈 경보 상태 (date 생략 시 최근 관측 월)
+#   GET /health                                                 스냅샷 시각, 시리즈 수
+# - python alarm_api.py [--host 127.0.0.1] [--port 8600] [--folder 경보결과 폴더]
+# - 부하 측정: python api_loadtest.py
+
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from dashboard_data import AlarmTimeline, PreparedSeries, month_index
+from data_snapshot import read_result
+from result_watcher import ResultWatcher
+from series_registry import available_series, load_registry
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATUS_LABELS = {0: '정상', 1: '주의', 2: '경고'}
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _number(value):
+    return None if np.isnan(value) else float(value)
+
+
+def _to_json(obj):
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _parse_month(text, name):
+    try:
+        return month_index(pd.Timestamp(text))
+    except (ValueError, TypeError):
+        raise BadRequest(f"{name} 는 YYYY-MM 형식이어야 합니다: {text}")
+
+
+# 1. 스냅샷 (파일이 바뀔 때마다 통째로 새로 만듦)
+class AlarmSnapshot:
+    """
+    경보결과 폴더 전체를 읽어 만든 읽기 전용 스냅샷
+    - 시리즈 목록 / 시리즈별 전체 이력 JSON 은 미리 만들어 두고, 기간 조회 / 레벨 조회는 결과를 LRU 로 보관
+    """
+
+    def __init__(self, folder):
+        self.registry = load_registry(folder)
+        self.hospital_names = available_series(self.registry, 'hospital')
+        self.community_names = available_series(self.registry, 'community')
+        self.series = {name: PreparedSeries(read_result(self.registry[name]['path']))
+                       for name in self.hospital_names + self.community_names}
+        self.timeline = (AlarmTimeline(self.series, self.hospital_names, self.community_names)
+                         if self.series else None)
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+
+        self.series_list = [self._series_info(name) for name in self.series]
+        self.series_list_json = {None: _to_json(self.series_list)}
+        for group in ('hospital', 'community'):
+            self.series_list_json[group] = _to_json([s for s in self.series_list if s['group'] == group])
+        self.records = {name: self._records(s) for name, s in self.series.items()}
+        self.history_json = lru_cache(maxsize=1024)(self._history_json)
+        self.level_json = lru_cache(maxsize=4096)(self._level_json)
+
+    def _series_info(self, name):
+        entry, s = self.registry[name], self.series[name]
+        observed = self.timeline.observed_labels([name])
+        return {'name': name, 'group': entry['group'], 'title': entry['title'], 'y_label': entry['y_label'],
+                'start': s.month_str[0] if len(s) else None, 'end': s.month_str[-1] if len(s) else None,
+                'last_observed': observed[-1] if observed else None}
+
+    @staticmethod
+    def _records(s):
+        ds = pd.DatetimeIndex(s.ds).strftime('%Y-%m-%d')
+        return [{'ds': ds[i], 'y': _number(s.y[i]), 'yhat': _number(s.yhat[i]),
+                 'yhat_lower': _number(s.yhat_lower[i]), 'yhat_upper': _number(s.yhat_upper[i]),
+                 'alarm': bool(s.alarm[i]), 'recent_alert_count': int(s.recent_alert_count[i]),
+                 'interpretation': s.interpretation[i]}
+                for i in range(len(s))]
+
+    def _history_json(self, name, start, end):
+        if name not in self.series:
+            raise NotFound(f"시리즈가 없습니다: {name}")
+        s = self.series[name]
+        lo = 0 if start is None else int(np.searchsorted(s.month_index, _parse_month(start, 'start')))
+        hi = len(s) if end is None else int(np.searchsorted(s.month_index, _parse_month(end, 'end'), side='right'))
+        return _to_json({'name': name, 'group': self.registry[name]['group'], 'history': self.records[name][lo:hi]})
+
+    def _series_state(self, name, i):
+        row = self.timeline.row[name]
+        observed = bool(self.timeline.observed[row, i])
+        count = int(self.timeline.recent_alert_count[row, i])
+        return {'name': name, 'observed': observed, 'alarm': bool(self.timeline.alarm[row, i]),
+                'recent_alert_count': count, 'status': STATUS_LABELS[min(count, 2)] if observed else '자료 없음',
+                'next_yhat': _number(self.timeline.next_yhat[row, i])}
+
+    def _level_json(self, hospital, community, date):
+        if hospital not in self.hospital_names:
+            raise NotFound(f"병원 시리즈가 없습니다: {hospital}")
+        if community not in self.community_names:
+            raise NotFound(f"지역사회 시리즈가 없습니다: {community}")
+        if date is None:
+            observed = self.timeline.observed_labels([hospital, community])
+            if not observed:
+                raise NotFound("실제값이 있는 월이 없습니다.")
+            date = str(observed[-1])
+        i = _parse_month(date, 'date') - self.timeline.start
+        if not 0 <= i < len(self.timeline.months):
+            raise NotFound(f"해당 월 자료가 없습니다: {date}")
+        level = self.timeline.levels[self.timeline.hospital_row[hospital], self.timeline.community_row[community], i]
+        return _to_json({'date': str(self.timeline.labels[i]), 'level': int(level),
+                         'hospital': self._series_state(hospital, i),
+                         'community': self._series_state(community, i)})
+
+
+# 2. 저장소 (현재 스냅샷 + 파일 감시)
+class AlarmStore:
+    def __init__(self, folder, poll_seconds=1.0):
+        self.folder = folder
+        self.watcher = ResultWatcher(folder, min_interval=poll_seconds)
+        self.snapshot = AlarmSnapshot(folder)
+
+    def refresh_forever(self):
+        while True:
+            time.sleep(self.watcher.min_interval)
+            changed = self.watcher.poll()
+            if not changed:
+                continue
+            try:
+                self.snapshot = AlarmSnapshot(self.folder)
+                print(f"🔄 스냅샷 갱신 ({len(changed)}개 파일 변경, {self.snapshot.loaded_at})")
+            except Exception as e:
+                print(f"⚠️ 스냅샷 갱신 실패, 이전 스냅샷 유지: {e}")
+
+    def start(self):
+        threading.Thread(target=self.refresh_forever, daemon=True).start()
+
+
+# 3. HTTP 처리
+class AlarmRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive (현황판이 주기적으로 조회)
+    disable_nagle_algorithm = True  # 헤더와 본문을 따로 쓰므로 Nagle 이 켜져 있으면 응답마다 ~40 ms 지연
+    store = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+        snapshot = self.store.snapshot
+        try:
+            if parts == ['series']:
+                group = query.get('group')
+                if group not in snapshot.series_list_json:
+                    raise BadRequest(f"group 은 hospital 또는 community 입니다: {group}")
+                body = snapshot.series_list_json[group]
+            elif len(parts) == 2 and parts[0] == 'series':
+                body = snapshot.history_json(parts[1], query.get('start'), query.get('end'))
+            elif parts == ['level']:
+                if 'hospital' not in query or 'community' not in query:
+                    raise BadRequest("hospital, community 를 지정해야 합니다.")
+                body = snapshot.level_json(query['hospital'], query['community'], query.get('date'))
+            elif parts == ['health']:
+                body = _to_json({'status': 'ok', 'loaded_at': snapshot.loaded_at, 'series': len(snapshot.series)})
+            else:
+                raise NotFound(f"없는 경로입니다: {url.path}")
+            self._send(200, body)
+        except BadRequest as e:
+            self._send(400, _to_json({'error': str(e)}))
+        except NotFound as e:
+            self._send(404, _to_json({'error': str(e)}))
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 요청마다 로그를 남기지 않음 (현황판 조회가 잦음)
+        pass
+
+
+def make_server(store, host='127.0.0.1', port=8600):
+    handler = type('Handler', (AlarmRequestHandler,), {'store': store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='경보 조회 API (읽기 전용)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--folder', default=BASE_DIR)
+    args = parser.parse_args()
+
+    store = AlarmStore(args.folder)
+    store.start()
+    server = make_server(store, args.host, args.port)
+    print(f"✅ 경보 조회 API: http://{args.host}:{args.port} (시리즈 {len(store.snapshot.series)}개)", flush=True)
+    server.serve_forever()
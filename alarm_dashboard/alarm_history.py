@@ -0,0 +1,137 @@
+# 과거 경보 내역 (사전 색인 테이블)
+# - 여러 시리즈의 경보 행만 모아 열 배열(시리즈 코드, 시점, 월 인덱스, 현재값, 예측 상한값, 초과량, 단계)로 한 번 만들어 둠
+# - 정렬 키(시점 / 현재값 / 초과량 / 시리즈)별 오름·내림차순 순서를 미리 계산 → 조회 시 다시 정렬하지 않음
+# - 조회: 필터(시리즈, 기간, 단계)는 bool 마스크, 정렬은 미리 만든 순서에서 마스크로 걸러내기, 페이지는 슬라이스
+#   DataFrame 은 보이는 페이지 행만 만듦 (연도 / 주 단위 / 시리즈가 늘어도 화면 비용은 페이지 크기만큼)
+# - 단계: 해당 시점 포함 최근 2개월 경보 횟수 1 → 주의, 2 이상 → 경고 (경보 메시지와 같은 기준)
+# - python alarm_history.py [시리즈 수] [시리즈당 행 수]   (합성 데이터로 색인 / 조회 시간 측정)
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard_data import PreparedSeries, month_index, month_label
+
+SEVERITY_LABELS = {1: '주의', 2: '경고'}
+SORT_KEYS = ('ds', 'y', 'excess', 'series')
+
+
+# 1. 색인 테이블
+class AlarmHistory:
+    """
+    series: {시리즈명: PreparedSeries}. 행은 시리즈 → 시점 순 (모든 배열 읽기 전용)
+    """
+
+    def __init__(self, series):
+        self.names = list(series)
+        self.row = {name: i for i, name in enumerate(self.names)}
+        alarms = [s.alarm for s in series.values()]
+
+        def gather(attr):
+            return np.concatenate([getattr(s, attr)[a] for s, a in zip(series.values(), alarms)] or [np.array([])])
+
+        self.code = np.repeat(np.arange(len(self.names), dtype=np.int32), [int(a.sum()) for a in alarms])
+        self.ds = gather('ds').astype('datetime64[ns]')
+        self.month_index = gather('month_index').astype(np.int64)
+        self.month_str = gather('month_str').astype(object)
+        self.y = gather('y').astype(float)
+        self.yhat_upper = gather('yhat_upper').astype(float)
+        self.excess = self.y - self.yhat_upper
+        self.severity = np.where(gather('recent_alert_count') >= 2, 2, 1).astype(np.int8)
+
+        # 정렬 순서 (안정 정렬 → 같은 값은 시리즈 → 시점 순 유지, 내림차순은 값 부호를 바꿔 NaN 을 항상 뒤로)
+        keys = {'ds': self.ds.astype(np.int64), 'y': self.y, 'excess': self.excess, 'series': self.code}
+        self.orders = {}
+        for key, values in keys.items():
+            self.orders[key, False] = np.argsort(values, kind='stable')
+            self.orders[key, True] = np.argsort(-values.astype(float), kind='stable')
+
+        arrays = [self.code, self.ds, self.month_index, self.y, self.yhat_upper, self.excess, self.severity]
+        self.nbytes = (sum(a.nbytes for a in arrays) + sum(o.nbytes for o in self.orders.values())
+                       + sum(sys.getsizeof(m) for m in self.month_str))
+        for a in arrays + [self.month_str] + list(self.orders.values()):
+            a.setflags(write=False)
+
+    def __len__(self):
+        return len(self.code)
+
+    def months(self, names=None):
+        """
+        names 의 경보가 있는 첫 달 ~ 마지막 달 ('YYYY-MM' 목록, 기간 선택용)
+        """
+        indexes = self.month_index[self._series_mask(names)]
+        if not len(indexes):
+            return []
+        return [month_label(m) for m in range(indexes.min(), indexes.max() + 1)]
+
+    def _series_mask(self, names):
+        if names is None:
+            return np.ones(len(self), dtype=bool)
+        return np.isin(self.code, [self.row[n] for n in names if n in self.row])
+
+    # 2. 조회
+    def query(self, names=None, start=None, end=None, severity=None, sort='ds', descending=True,
+              page=1, page_size=20):
+        """
+        반환: (보이는 페이지 DataFrame, 조건에 맞는 전체 행 수, 페이지 수)
+        start / end: 기간 ('YYYY-MM' 또는 날짜, 양끝 포함), severity: 단계 목록 (1 주의, 2 경고)
+        """
+        mask = self._series_mask(names)
+        if start is not None:
+            mask &= self.month_index >= month_index(start)
+        if end is not None:
+            mask &= self.month_index <= month_index(end)
+        if severity is not None:
+            mask &= np.isin(self.severity, list(severity))
+
+        order = self.orders[sort, descending]
+        positions = order[mask[order]]
+        total = len(positions)
+        n_pages = max(1, -(-total // page_size))
+        page = min(max(page, 1), n_pages)
+        return self.page_frame(positions[(page - 1) * page_size: page * page_size]), total, n_pages
+
+    def page_frame(self, rows):
+        """
+        선택된 행만 표로 만듦
+        """
+        return pd.DataFrame({
+            '시리즈': [self.names[c] for c in self.code[rows]],
+            '경보 발생 시점': self.month_str[rows],
+            '단계': [SEVERITY_LABELS[s] for s in self.severity[rows]],
+            '현재값': self.y[rows],
+            '예측 상한값': self.yhat_upper[rows],
+            '초과량': self.excess[rows],
+        })
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    n_series, n_rows = (args + [200, 520][len(args):])[:2]
+
+    rng = np.random.default_rng(0)
+    ds = pd.date_range('2015-01-04', periods=n_rows, freq='W')
+    series = {}
+    for i in range(n_series):
+        yhat = rng.uniform(10, 100, n_rows)
+        y = yhat + rng.normal(0, 10, n_rows)
+        series[f'시리즈{i}'] = PreparedSeries(pd.DataFrame({
+            'ds': ds, 'y': y, 'yhat': yhat, 'yhat_lower': yhat - 15, 'yhat_upper': yhat + 15, '경보': y > yhat + 15,
+        }))
+
+    start = time.perf_counter()
+    history = AlarmHistory(series)
+    built = time.perf_counter() - start
+
+    names = list(series)[::3]
+    start = time.perf_counter()
+    for page in range(1, 51):
+        frame, total, n_pages = history.query(names, start='2018-01', severity=[2], sort='excess', page=page)
+    queried = (time.perf_counter() - start) / 50
+
+    print(f"📊 시리즈 {n_series}개 x {n_rows}행 → 경보 {len(history):,}건, 색인 {built * 1000:.1f} ms "
+          f"({history.nbytes / 1e6:.1f} MB)")
+    print(f"📌 조회 (시리즈 {len(names)}개 + 기간 + 단계 필터, 초과량 정렬, 페이지 20행): {queried * 1000:.2f} ms, "
+          f"{total:,}건 / {n_pages}페이지")
@@ -0,0 +1,67 @@
+# 통합 경보 레벨 엔진
+# - 시리즈별 경보를 공통 월 축에 맞춘 bool 행렬 (시리즈 x 월) 로 만들고,
+#   병원 x 지역사회 x 월 전체의 통합 레벨(1~5)을 브로드캐스팅 한 번으로 계산 (조합/월마다 규칙을 다시 평가하지 않음)
+# - 레벨 규칙 (기준 월 m 기준)
+#   5: 병원 이상치 2개월 연속 (m-1, m), 4: 병원 + 지역사회 이상치, 3: 병원만, 2: 지역사회만, 1: 안정
+# - 값이 없는 달은 경보 없음으로 취급
+# - python alarm_levels.py [병원 수] [지역사회 수] [개월 수]   (합성 데이터로 계산 시간 측정)
+
+import sys
+import time
+
+import numpy as np
+
+LEVELS = (1, 2, 3, 4, 5)
+
+
+# 1. 월 축 정렬
+def align_alarms(month_indexes, alarms, start, n_months):
+    """
+    month_indexes / alarms: 시리즈별 (월 인덱스 배열, 경보 bool 배열) 목록
+    반환: (시리즈 수, n_months) bool 행렬 (start 월부터)
+    """
+    matrix = np.zeros((len(alarms), n_months), dtype=bool)
+    for row, (months, alarm) in enumerate(zip(month_indexes, alarms)):
+        matrix[row, np.asarray(months) - start] = alarm
+    return matrix
+
+
+def two_month_counts(alarm):
+    """
+    (시리즈 x 월) 경보 행렬 → 해당 월 포함 최근 2개월 경보 횟수
+    """
+    counts = alarm.astype(np.int8)
+    counts[:, 1:] += alarm[:, :-1]
+    return counts
+
+
+# 2. 레벨 행렬
+def level_matrix(hospital_alarm, community_alarm):
+    """
+    hospital_alarm: (병원 수, 월) bool, community_alarm: (지역사회 수, 월) bool
+    반환: (병원 수, 지역사회 수, 월) int8 레벨
+    """
+    hospital = hospital_alarm[:, None, :]
+    community = community_alarm[None, :, :]
+    consecutive = (two_month_counts(hospital_alarm) >= 2)[:, None, :]
+
+    level = np.where(community, 2, 1).astype(np.int8)
+    level = np.where(hospital, np.where(community, 4, 3), level)
+    return np.where(consecutive, 5, level).astype(np.int8)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    n_hospital, n_community, n_months = (args + [200, 50, 120][len(args):])[:3]
+
+    rng = np.random.default_rng(0)
+    hospital_alarm = rng.random((n_hospital, n_months)) < 0.1
+    community_alarm = rng.random((n_community, n_months)) < 0.1
+
+    start = time.perf_counter()
+    levels = level_matrix(hospital_alarm, community_alarm)
+    elapsed = time.perf_counter() - start
+
+    print(f"📊 병원 {n_hospital} x 지역사회 {n_community} x {n_months}개월 = {levels.size:,} 칸: "
+          f"{elapsed * 1000:.1f} ms ({levels.nbytes / 1e6:.1f} MB)")
+    print("📌 레벨 분포:", {level: int((levels == level).sum()) for level in LEVELS})
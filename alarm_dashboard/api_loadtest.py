@@ -0,0 +1,131 @@
+# 경보 조회 API 부하 측정
+# - 현황판 여러 대가 keep-alive 연결로 동시에 조회하는 상황을 흉내 냄
+#   요청 구성: 통합 레벨 70% (병원 x 지역사회 x 월 무작위), 시리즈 이력 20%, 시리즈 목록 10%
+# - --url 을 주지 않으면 alarm_api.py 를 별도 프로세스로 띄워서 측정 (측정이 끝나면 종료)
+#   한 코어 기준 측정: taskset -c 0 python api_loadtest.py
+# - 결과: 초당 요청 수, 지연시간 p50 / p95 / p99, 오류 수
+# - python api_loadtest.py [--url http://127.0.0.1:8600] [--clients 8] [--seconds 10]
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def wait_ready(host, port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def get_json(conn, path):
+    conn.request('GET', path)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+# 1. 요청 목록 만들기 (서버의 시리즈 목록 기준)
+def build_paths(host, port, n=2000, seed=0):
+    conn = http.client.HTTPConnection(host, port)
+    _, series = get_json(conn, '/series')
+    hospitals = [s for s in series if s['group'] == 'hospital']
+    communities = [s for s in series if s['group'] == 'community']
+    months = [f'{year}-{month:02d}' for year in range(2021, 2025) for month in range(1, 13)]
+
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.7 and hospitals and communities:
+            paths.append(f"/level?hospital={quote(rng.choice(hospitals)['name'])}"
+                         f"&community={quote(rng.choice(communities)['name'])}&date={rng.choice(months)}")
+        elif r < 0.9:
+            start = rng.choice(months)
+            paths.append(f"/series/{quote(rng.choice(series)['name'])}?start={start}")
+        else:
+            paths.append('/series')
+    return paths
+
+
+# 2. 측정
+def run_client(host, port, paths, stop_at, latencies, errors):
+    conn = http.client.HTTPConnection(host, port)
+    i = random.randrange(len(paths))
+    while time.monotonic() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(path)
+        except OSError:
+            errors.append(path)
+            conn = http.client.HTTPConnection(host, port)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def run_load(host, port, clients, seconds):
+    paths = build_paths(host, port)
+    latencies, errors = [], []
+    stop_at = time.monotonic() + seconds
+    threads = [threading.Thread(target=run_client, args=(host, port, paths, stop_at, latencies, errors))
+               for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='경보 조회 API 부하 측정')
+    parser.add_argument('--url', default=None)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        host, port = '127.0.0.1', 8699
+        server = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, 'alarm_api.py'), '--port', str(port)],
+                                  stdout=subprocess.DEVNULL)
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+
+    try:
+        if not wait_ready(host, port):
+            sys.exit("❌ 서버가 응답하지 않습니다.")
+        latencies, errors, elapsed = run_load(host, port, args.clients, args.seconds)
+    finally:
+        if server is not None:
+            server.terminate()
+
+    ms = np.array(latencies) * 1000
+    print(f"📊 클라이언트 {args.clients}개, {elapsed:.1f}초: {len(ms):,}건 → {len(ms) / elapsed:,.0f} req/s, 오류 {len(errors)}건")
+    if len(ms):
+        print(f"📌 지연시간 p50 {np.percentile(ms, 50):.2f} ms / p95 {np.percentile(ms, 95):.2f} ms / "
+              f"p99 {np.percentile(ms, 99):.2f} ms")
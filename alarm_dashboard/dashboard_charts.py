@@ -0,0 +1,230 @@
+# 대시보드 차트 렌더링
+# - 시리즈 그래프: matplotlib → PNG 바이트 (stream_app.py 에서 (시리즈, 표시 구간, 기준 월, 테마) 키로 캐시)
+#   이상치 별표는 scatter 한 번으로 그림 (기준 월 이상치만 테두리 검정)
+# - Plotly 모드: 전체 데이터를 한 번 보내고 확대/이동/툴팁은 브라우저에서 처리 (초기 화면은 표시 구간)
+# - 게이지: 레벨이 5개뿐이므로 테마별로 5개를 미리 만들어 두고 재사용
+# - 스파크라인: 전체 현황 타일용 축 없는 작은 그래프 (실제값, 예측 구간, 이상치)
+# - pyplot 전역 상태를 쓰지 않음 (Figure 객체 직접 생성 → 세션 스레드 간 간섭/누수 없음)
+# - matplotlib / plotly 는 해당 그래프를 처음 그릴 때 import (첫 화면에 그래프가 없으면 불러오지 않아 시작이 빠름)
+
+import io
+
+import numpy as np
+import pandas as pd
+
+THEMES = {
+    'light': {'background': '#fef9f5', 'text': '#2B2D42', 'grid': '#CCCCCC', 'needle': '#2B3F73', 'level': 'black'},
+    'dark': {'background': '#1f2430', 'text': '#e6e6e6', 'grid': '#4a5060', 'needle': '#e6e6e6', 'level': 'white'},
+}
+LEVEL_COLORS = ['#00cc96', '#636efa', '#f4c430', '#ffa15a', '#ef553b']
+OUTLIER_COLOR = '#FFC107'
+
+
+# 1. 표시 구간
+def view_mask(series, start_month, end_month):
+    """
+    start_month ~ end_month (월 인덱스, 양끝 포함) 에 들어가는 행
+    """
+    return (series.month_index >= start_month) & (series.month_index <= end_month)
+
+
+# 2. matplotlib 그래프 (PNG)
+def series_figure_png(series, title_text, y_label, current_date, view, theme='light', fontprop=None):
+    import matplotlib.dates as mdates
+    from matplotlib.figure import Figure
+
+    colors = THEMES[theme]
+    ds = series.ds[view]
+    current_date = np.datetime64(pd.Timestamp(current_date), 'ns')
+    observed = ds <= current_date
+
+    fig = Figure(figsize=(7, 3))
+    ax = fig.subplots()
+
+    # 배경색 적용
+    fig.patch.set_facecolor(colors['background'])
+    ax.set_facecolor(colors['background'])
+
+    # 신뢰구간
+    ax.fill_between(ds, series.yhat_lower[view], series.yhat_upper[view],
+                    where=~np.isnan(series.yhat_lower[view]),
+                    color='red', alpha=0.2, label='신뢰구간(95%)')
+
+    # 실제값
+    ax.plot(ds[observed], series.y[view][observed],
+            marker='o', color='royalblue', linestyle='-',
+            markersize=2.5, linewidth=0.8, label=f'실제 {y_label}')
+
+    # 예측값
+    ax.plot(ds, series.yhat[view],
+            marker='o', linestyle='--', color='red',
+            markersize=2.5, linewidth=0.8, label='One-step 예측')
+
+    # 이상치 (한 번에, 기준 월만 테두리 검정). 범례는 이상치가 없어도 항상 표시
+    outlier = view & series.alarm
+    outlier_ds = series.ds[outlier]
+    ax.scatter(outlier_ds, series.y[outlier], marker='*', s=36, color=OUTLIER_COLOR,
+               edgecolors=np.where(outlier_ds == current_date, 'black', 'gray'), linewidths=0.8,
+               label='이상치', zorder=3)
+
+    ax.axvline(current_date, color='gray', linestyle='--', linewidth=0.8, label='예측 시작')
+
+    ax.set_title(title_text, fontsize=7, fontproperties=fontprop, color=colors['text'])
+    ax.set_xlabel("날짜", fontsize=6, fontproperties=fontprop, color=colors['text'])
+    ax.set_ylabel(y_label, fontsize=6, fontproperties=fontprop, color=colors['text'])
+    ax.tick_params(axis='both', labelsize=5, colors=colors['text'])
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.xaxis.set_major_locator(mdates.MonthLocator())
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    ax.grid(True, linestyle='--', linewidth=0.4, color=colors['grid'])
+
+    # 범례 정렬
+    handles, labels = ax.get_legend_handles_labels()
+    label_handle_map = dict(zip(labels, handles))
+    order = ['신뢰구간(95%)', f'실제 {y_label}', 'One-step 예측', '이상치', '예측 시작']
+    ordered = [lbl for lbl in order if lbl in label_handle_map]
+    legend = ax.legend(
+        [label_handle_map[lbl] for lbl in ordered],
+        ordered,
+        fontsize=4,            # 글씨 크기 줄이기
+        markerscale=0.3,       # 마커 크기 줄이기
+        loc='upper left',
+        frameon=False,
+        labelspacing=0.2,      # 항목 간 간격
+        handlelength=0.8,      # 마커와 텍스트 거리
+        handletextpad=0.2,     # 마커와 텍스트 간격
+        borderpad=0.2,         # 범례 테두리와 내부 여백
+        prop=fontprop          # 폰트 설정
+    )
+    for text in legend.get_texts():
+        text.set_color(colors['text'])
+
+    # st.pyplot 과 같은 설정으로 PNG 저장
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+# 3. Plotly 그래프 (브라우저 렌더링)
+def series_figure_plotly(series, title_text, y_label, current_date, view, theme='light'):
+    import plotly.graph_objects as go
+
+    colors = THEMES[theme]
+    current_date = pd.Timestamp(current_date)
+    observed = series.ds <= np.datetime64(current_date, 'ns')
+    outlier = series.alarm
+    outlier_ds = series.ds[outlier]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=series.ds, y=series.yhat_upper, mode='lines', line=dict(width=0),
+                             hoverinfo='skip', showlegend=False))
+    fig.add_trace(go.Scatter(x=series.ds, y=series.yhat_lower, mode='lines', line=dict(width=0),
+                             fill='tonexty', fillcolor='rgba(255,0,0,0.2)', name='신뢰구간(95%)'))
+    fig.add_trace(go.Scatter(x=series.ds[observed], y=series.y[observed], mode='lines+markers',
+                             line=dict(color='royalblue', width=1), marker=dict(size=4), name=f'실제 {y_label}'))
+    fig.add_trace(go.Scatter(x=series.ds, y=series.yhat, mode='lines+markers',
+                             line=dict(color='red', width=1, dash='dash'), marker=dict(size=4), name='One-step 예측'))
+    # 이상치: PNG 와 같이 기준 월만 테두리 검정 (점마다 테두리 색 지정)
+    outline = np.where(outlier_ds == np.datetime64(current_date, 'ns'), 'black', 'gray')
+    fig.add_trace(go.Scatter(x=outlier_ds, y=series.y[outlier], mode='markers', name='이상치',
+                             marker=dict(symbol='star', size=10, color=OUTLIER_COLOR,
+                                         line=dict(width=1, color=outline.tolist()))))
+    fig.add_vline(x=current_date, line=dict(color='gray', dash='dash', width=1))
+
+    shown = series.ds[view]
+    x_range = [shown.min(), shown.max()] if len(shown) else None
+    fig.update_layout(
+        title=dict(text=title_text, font=dict(size=13)),
+        height=320,
+        margin=dict(t=40, b=10, l=10, r=10),
+        paper_bgcolor=colors['background'],
+        plot_bgcolor=colors['background'],
+        font=dict(color=colors['text'], family='Noto Sans KR'),
+        legend=dict(orientation='h', y=-0.25, font=dict(size=10)),
+        xaxis=dict(range=x_range, tickformat='%Y-%m', gridcolor=colors['grid']),
+        yaxis=dict(title=y_label, gridcolor=colors['grid']),
+        hovermode='x unified',
+    )
+    return fig
+
+
+# 4. 게이지 (레벨 1~5)
+def gauge_figure(level, theme='light'):
+    import plotly.graph_objects as go
+
+    colors = THEMES[theme]
+    level_labels = ['1', '2', '3', '4', '5']
+
+    # 반원 게이지 구성
+    fig = go.Figure()
+    fig.add_trace(go.Pie(
+        values=[20] * len(LEVEL_COLORS) + [100],  # 마지막은 투명 채우기
+        rotation=-270,
+        hole=0.6,
+        direction='clockwise',
+        text=level_labels + [''],
+        textinfo='text',
+        textposition='inside',
+        insidetextfont=dict(color='black', size=12),
+        marker_colors=LEVEL_COLORS + ['rgba(0,0,0,0)'],
+        hoverinfo='skip',
+        showlegend=False
+    ))
+
+    # 중앙 숫자
+    fig.add_annotation(
+        text=f"<b>{level}</b>",
+        x=0.5, y=0.42,
+        font=dict(size=36, color=colors['level'], family='Noto Sans KR'),
+        showarrow=False
+    )
+
+    # 바늘 위치 계산 (중심 기준 각도, 레벨당 36도)
+    angle_rad = np.radians(180 - ((level - 0.5) * 36) - 8)
+    fig.add_shape(
+        type='line',
+        x0=0.5, y0=0.5, x1=0.5 + 0.2 * np.cos(angle_rad), y1=0.5 + 0.2 * np.sin(angle_rad),
+        line=dict(color=colors['needle'], width=4)
+    )
+
+    # 배경 설정
+    fig.update_layout(
+        height=300,
+        margin=dict(t=30, b=0, l=10, r=10),
+        paper_bgcolor=colors['background'],
+        plot_bgcolor=colors['background']
+    )
+    return fig
+
+
+def gauge_figures(theme='light'):
+    return {level: gauge_figure(level, theme) for level in range(1, 6)}
+
+
+# 5. 스파크라인 (전체 현황 타일용 작은 그래프)
+def sparkline_png(series, current_date, view, theme='light'):
+    from matplotlib.figure import Figure
+
+    colors = THEMES[theme]
+    ds = series.ds[view]
+    current_date = np.datetime64(pd.Timestamp(current_date), 'ns')
+    observed = ds <= current_date
+
+    fig = Figure(figsize=(2.6, 0.8))
+    ax = fig.subplots()
+    fig.patch.set_facecolor(colors['background'])
+    ax.set_facecolor(colors['background'])
+
+    ax.fill_between(ds, series.yhat_lower[view], series.yhat_upper[view],
+                    where=~np.isnan(series.yhat_lower[view]), color='red', alpha=0.15, linewidth=0)
+    ax.plot(ds[observed], series.y[view][observed], color='royalblue', linewidth=1)
+    outlier = view & series.alarm & (series.ds <= current_date)
+    ax.scatter(series.ds[outlier], series.y[outlier], marker='*', s=30, color=OUTLIER_COLOR,
+               edgecolors='gray', linewidths=0.5, zorder=3)
+    ax.axvline(current_date, color='gray', linestyle='--', linewidth=0.6)
+    ax.set_axis_off()
+    fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=120)
+    return buffer.getvalue()
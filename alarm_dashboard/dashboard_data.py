@@ -0,0 +1,185 @@
+# 대시보드 데이터 계층
+# - 경보결과 엑셀(ds, y, yhat, yhat_lower, yhat_upper, 경보, 경보해석)을 읽고 ds / 경보를 한 번만 정리
+# - 파일 서명(mtime, 크기)을 캐시 키에 넣어 파일이 교체되면 자동으로 다시 읽음
+# - PreparedSeries: 경보 bool 배열, datetime64 ds, 월 인덱스, 파생 컬럼을 파일당 한 번만 만들어 렌더링 함수가 공유
+#   (과거 경보 표는 alarm_history.AlarmHistory 가 여러 시리즈를 묶어 색인)
+# - AlarmTimeline: 전체 시리즈의 (시리즈 x 월) 경보/최근 2개월 횟수/다음달 예측값 행렬과
+#   병원 x 지역사회 x 월 통합 레벨 (기준 월 이동은 조회만)
+# - 두 객체 모두 nbytes (대략적인 메모리 사용량) 를 가짐 → memory_cache 의 메모리 상한 계산에 사용
+# - Streamlit 에 의존하지 않음 (캐시 데코레이터는 stream_app.py 에서 씌움)
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from alarm_levels import align_alarms, level_matrix, two_month_counts
+
+ALARM_TRUE_VALUES = ['TRUE', '1', '1.0', 'T']
+
+
+# 1. 경보 플래그 정리
+def parse_alarm_flag(values):
+    """
+    엑셀마다 다른 경보 표기 (True/False, 1/0, 1.0, 'T', 빈칸) → bool
+    """
+    return pd.Series(values).astype(str).str.strip().str.upper().isin(ALARM_TRUE_VALUES).to_numpy()
+
+
+# 2. 파일 서명 (캐시 무효화용)
+def file_signature(path):
+    """
+    (mtime_ns, 크기). 파일이 없으면 None
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# 3. 경보결과 파일 읽기
+def read_alarm_file(path):
+    df = pd.read_excel(path)
+    df['ds'] = pd.to_datetime(df['ds'])
+    df['경보'] = parse_alarm_flag(df['경보'])
+    if '경보해석' in df.columns:
+        df['경보해석'] = df['경보해석'].fillna('').astype(str)
+    return df
+
+
+# 4. 렌더링용으로 한 번만 정리한 시리즈
+class PreparedSeries:
+    """
+    경보결과 파일 하나를 ds 순으로 정리해 두고 모든 렌더링 함수가 복사 없이 읽는 객체
+    - ds (datetime64), 월 인덱스 (연*12 + 월-1), 'YYYY-MM' 문자열, 경보 bool 배열
+    - 최근 2개월 경보 횟수, 다음달 yhat 을 미리 계산
+    배열은 읽기 전용 (여러 세션이 같은 객체를 공유). 원본 DataFrame 은 보관하지 않음
+    """
+
+    def __init__(self, df):
+        frame = df.sort_values('ds', kind='stable').reset_index(drop=True)
+        self.ds = frame['ds'].to_numpy(dtype='datetime64[ns]')
+        self.month_index = frame['ds'].dt.year.to_numpy() * 12 + frame['ds'].dt.month.to_numpy() - 1
+        self.month_str = frame['ds'].dt.strftime('%Y-%m').to_numpy()
+        self.alarm = frame['경보'].to_numpy(dtype=bool)
+        self.y = frame['y'].to_numpy(dtype=float)
+        self.yhat = frame['yhat'].to_numpy(dtype=float)
+        self.yhat_lower = frame['yhat_lower'].to_numpy(dtype=float)
+        self.yhat_upper = frame['yhat_upper'].to_numpy(dtype=float)
+        self.interpretation = (frame['경보해석'].str.strip().to_numpy() if '경보해석' in frame.columns
+                               else np.full(len(frame), '', dtype=object))
+
+        # 해당 시점 포함 최근 2개월(2행) 경보 횟수, 다음 행의 yhat
+        alarm_int = self.alarm.astype(int)
+        self.recent_alert_count = alarm_int + np.concatenate([[0], alarm_int[:-1]])
+        self.next_yhat = np.concatenate([self.yhat[1:], [np.nan]])
+
+        arrays = ('ds', 'month_index', 'month_str', 'alarm', 'y', 'yhat', 'yhat_lower', 'yhat_upper',
+                  'interpretation', 'recent_alert_count', 'next_yhat')
+        # 문자열(object) 배열은 문자열 자체 크기까지 포함
+        self.nbytes = sum(pd.Series(getattr(self, name)).memory_usage(index=False, deep=True) for name in arrays)
+        for name in arrays:
+            getattr(self, name).setflags(write=False)
+
+    def __len__(self):
+        return len(self.ds)
+
+    def index_of(self, date):
+        """
+        date 와 같은 ds 의 위치. 없으면 None
+        """
+        date = np.datetime64(pd.Timestamp(date), 'ns')
+        i = int(np.searchsorted(self.ds, date))
+        return i if i < len(self.ds) and self.ds[i] == date else None
+
+
+# 5. 월별 경보 타임라인 (시점 이동용)
+def month_index(date):
+    date = pd.Timestamp(date)
+    return date.year * 12 + date.month - 1
+
+
+def month_label(index):
+    return f'{index // 12}-{index % 12 + 1:02d}'
+
+
+class AlarmTimeline:
+    """
+    모든 시리즈를 공통 월 축(가장 이른 달 ~ 가장 늦은 달)에 맞춘 (시리즈 x 월) 행렬
+    - 경보, 최근 2개월(해당 월 포함) 경보 횟수, 다음달 yhat, 관측 여부
+    - 병원 x 지역사회 x 월 통합 경보 레벨 (alarm_levels.level_matrix)
+    기준 월을 옮기면 (행, 월 위치) 로 조회만 함
+    """
+
+    def __init__(self, series, hospital_names, community_names):
+        self.names = list(series)
+        self.row = {name: i for i, name in enumerate(self.names)}
+        self.start = min(s.month_index.min() for s in series.values())
+        end = max(s.month_index.max() for s in series.values())
+        self.months = np.arange(self.start, end + 1)
+        self.labels = np.array([month_label(m) for m in self.months])
+
+        n = len(self.months)
+        self.next_yhat = np.full((len(self.names), n), np.nan)
+        self.observed = np.zeros((len(self.names), n), dtype=bool)
+        for row, s in enumerate(series.values()):
+            self.next_yhat[row, s.month_index - self.start] = s.next_yhat
+            self.observed[row, s.month_index - self.start] = ~np.isnan(s.y)
+        self.alarm = align_alarms([s.month_index for s in series.values()],
+                                  [s.alarm for s in series.values()], self.start, n)
+        self.recent_alert_count = two_month_counts(self.alarm)
+
+        self.hospital_names = [h for h in hospital_names if h in self.row]
+        self.community_names = [c for c in community_names if c in self.row]
+        self.hospital_row = {h: i for i, h in enumerate(self.hospital_names)}
+        self.community_row = {c: i for i, c in enumerate(self.community_names)}
+        self.levels = level_matrix(self.alarm[[self.row[h] for h in self.hospital_names]],
+                                   self.alarm[[self.row[c] for c in self.community_names]])
+        self.nbytes = sum(a.nbytes for a in (self.months, self.labels, self.next_yhat, self.observed,
+                                             self.alarm, self.recent_alert_count, self.levels))
+
+    def position(self, date):
+        """
+        date 가 속한 월의 위치. 범위 밖이면 None
+        """
+        i = month_index(date) - self.start
+        return i if 0 <= i < len(self.months) else None
+
+    def level_at(self, hospital_name, community_name, date):
+        """
+        (병원, 지역사회, 기준 월) 통합 레벨. 기준 월이 범위 밖이면 1
+        """
+        i = self.position(date)
+        if i is None:
+            return 1
+        return int(self.levels[self.hospital_row[hospital_name], self.community_row[community_name], i])
+
+    def levels_at(self, date):
+        """
+        기준 월의 병원 x 지역사회 레벨 표
+        """
+        i = self.position(date)
+        values = self.levels[:, :, i] if i is not None else 1
+        return pd.DataFrame(values, index=self.hospital_names, columns=self.community_names)
+
+    def observed_labels(self, names=None):
+        """
+        names 중 하나라도 실제값(y)이 있는 월 ('YYYY-MM')
+        """
+        rows = [self.row[n] for n in (self.names if names is None else names) if n in self.row]
+        if not rows:
+            return []
+        return list(self.labels[self.observed[rows].any(axis=0)])
+
+    def table(self, name):
+        """
+        시리즈 하나의 월별 표 (월, 경보, 최근 2개월 경보 횟수, 다음달 예측값)
+        """
+        row = self.row[name]
+        return pd.DataFrame({
+            '월': self.labels,
+            '경보': self.alarm[row],
+            '최근 2개월 경보': self.recent_alert_count[row],
+            '다음달 예측값': self.next_yhat[row],
+        })
@@ -0,0 +1,152 @@
+# 대시보드 동시 접속 부하 측정 (브라우저 없이)
+# - streamlit.testing 의 AppTest 로 세션 N개를 한 프로세스에서 동시에 띄우고 (캐시는 실제 서버처럼 프로세스 공용)
+#   각 세션이 병원 / 지역사회 / 기준 월 / 차트 모드 / 보기를 무작위로 바꾸며 다시 실행되는 시간을 측정
+# - 결과: 첫 화면 / 이후 재실행 지연시간 p50 / p95 / p99, 프로세스 최대 메모리, 공용 캐시 사용량
+# - 폰트 파일(../fonts/NotoSansKR-VariableFont_wght.ttf)이 있어야 stream_app.py 가 실행됨
+# - python dashboard_loadtest.py [--sessions 8] [--steps 20] [--seed 0]
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from memory_cache import cache_stats
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return None
+
+
+# 1. AppTest 동시 실행 준비
+def install_shared_runtime():
+    """
+    AppTest 는 실행마다 전역 Runtime 을 가짜로 바꿨다가 끝나면 None 으로 되돌리므로, 세션을 동시에 돌리면
+    먼저 끝난 세션이 다른 세션의 Runtime 을 지워 그 세션이 끝나지 않음 → 공용 가짜 Runtime 하나를 고정해 두고
+    AppTest 가 바꾸는 대상은 빈 클래스로 돌림 (캐시는 원래대로 프로세스 공용)
+    스크립트 컴파일 캐시도 실행마다 새로 만들므로 실제 서버처럼 하나를 공유 (동시 컴파일 시 Python 3.11 SystemError)
+    """
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage('/mock/media'))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = shared
+    app_test.Runtime = type('Runtime', (), {'_instance': None})
+
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+
+# 2. 세션 하나 (사용자가 선택을 바꾸는 흐름)
+def random_action(at, rng, hospital_names, community_names):
+    """
+    위젯 하나를 무작위로 바꿈. 반환: 동작 이름
+    """
+    if at.radio(key='view_mode').value == '전체 현황':
+        if rng.random() < 0.3:
+            at.radio(key='view_mode').set_value('상세')
+            return 'view'
+        months = at.select_slider(key='current_month').options
+        at.select_slider(key='current_month').set_value(rng.choice(months))
+        return 'month'
+
+    action = rng.choices(['hospital', 'community', 'month', 'chart', 'view'], weights=[3, 3, 5, 1, 1])[0]
+    if action == 'hospital':
+        at.selectbox(key='hospital_select').set_value(rng.choice(hospital_names))
+    elif action == 'community':
+        at.selectbox(key='community_select').set_value(rng.choice(community_names))
+    elif action == 'month':
+        months = at.select_slider(key='current_month').options
+        at.select_slider(key='current_month').set_value(rng.choice(months))
+    elif action == 'chart':
+        at.toggle(key='interactive_charts').set_value(not at.toggle(key='interactive_charts').value)
+    else:
+        at.radio(key='view_mode').set_value('전체 현황')
+    return action
+
+
+def run_session(seed, steps, results, errors):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(os.path.join(BASE_DIR, 'stream_app.py'), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    results.append(('first', time.perf_counter() - start))
+    if at.exception:
+        errors.append(str(at.exception[0].message))
+        return
+
+    hospital_names = [o for o in at.selectbox(key='hospital_select').options if o != '선택']
+    community_names = [o for o in at.selectbox(key='community_select').options if o != '선택']
+    for _ in range(steps):
+        action = random_action(at, rng, hospital_names, community_names)
+        start = time.perf_counter()
+        at.run()
+        results.append((action, time.perf_counter() - start))
+        if at.exception:
+            errors.append(str(at.exception[0].message))
+            return
+
+
+# 3. 동시 실행 / 집계
+def percentiles(values):
+    ms = np.array(values) * 1000
+    return f"p50 {np.percentile(ms, 50):7.1f} ms / p95 {np.percentile(ms, 95):7.1f} ms / p99 {np.percentile(ms, 99):7.1f} ms"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='대시보드 동시 접속 부하 측정')
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.chdir(BASE_DIR)
+    install_shared_runtime()
+    results, errors = [], []
+    threads = [threading.Thread(target=run_session, args=(args.seed + i, args.steps, results, errors))
+               for i in range(args.sessions)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    first = [t for action, t in results if action == 'first']
+    reruns = [t for action, t in results if action != 'first']
+    print(f"📊 세션 {args.sessions}개 x {args.steps}회 변경, 총 {elapsed:.1f}초, 오류 {len(errors)}건")
+    if first:
+        print(f"📌 첫 화면   ({len(first):4d}회): {percentiles(first)}")
+    if reruns:
+        print(f"📌 재실행    ({len(reruns):4d}회): {percentiles(reruns)}")
+        for action in sorted({a for a, _ in results if a != 'first'}):
+            values = [t for a, t in results if a == action]
+            print(f"   - {action:10s}({len(values):4d}회): {percentiles(values)}")
+    if peak_rss_mb() is not None:
+        print(f"💾 최대 메모리: {peak_rss_mb():.0f} MB")
+    for stats in cache_stats():
+        hit_rate = f"{stats['hit_rate']:.0%}" if stats['hit_rate'] is not None else '-'
+        print(f"💾 공용 캐시 {stats['name']}: {stats['entries']}개, {stats['bytes'] / 2**20:.1f} / "
+              f"{stats['max_bytes'] / 2**20:.0f} MB, 적중률 {hit_rate}, 밀려남 {stats['evictions']}건")
+    for message in errors[:3]:
+        print(f"⚠️ {message}")
@@ -0,0 +1,102 @@
+# 경보결과 데이터 스냅샷 (빠른 시작용)
+# - 엑셀 파싱은 openpyxl import + 파일당 수십 ms 가 걸리므로 이미지 빌드 시 한 번 변환해 둠 (Dockerfile)
+# - 시리즈별 구조화 배열(.npy: ds, y, yhat, yhat_lower, yhat_upper, 경보, 경보해석)을 .snapshot/ 에 저장하고
+#   대시보드 / API 는 np.load(mmap_mode='r') 로 메모리 매핑해서 읽음 (파싱 없음)
+# - manifest.json 에 원본 엑셀의 파일 서명(mtime, 크기)을 기록 → 원본이 바뀌었으면 스냅샷 대신 엑셀을 읽음
+#   (운영 중 결과 파일이 갱신돼도 잘못된 값을 보여주지 않음, 다음 빌드 때 다시 만들어짐)
+# - python data_snapshot.py [폴더]
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from dashboard_data import file_signature, read_alarm_file
+from series_registry import available_series, load_registry
+
+SNAPSHOT_DIR = '.snapshot'
+MANIFEST_FILE = 'manifest.json'
+FIELDS = [('ds', 'datetime64[ns]'), ('y', 'f8'), ('yhat', 'f8'), ('yhat_lower', 'f8'), ('yhat_upper', 'f8'),
+          ('alarm', '?')]
+
+
+# 1. 변환 (빌드 시)
+def to_records(df):
+    interpretation = (df['경보해석'].astype(str).to_numpy() if '경보해석' in df.columns
+                      else np.full(len(df), '', dtype=object))
+    width = max([1] + [len(text) for text in interpretation])
+    records = np.empty(len(df), dtype=FIELDS + [('interpretation', f'U{width}')])
+    for name, _ in FIELDS:
+        records[name] = df['경보' if name == 'alarm' else name].to_numpy()
+    records['interpretation'] = interpretation
+    return records
+
+
+def build_snapshot(folder):
+    """
+    폴더의 경보결과 엑셀(등록된 시리즈 전체)을 .snapshot/ 으로 변환. 반환: manifest
+    """
+    out_dir = os.path.join(folder, SNAPSHOT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    registry = load_registry(folder)
+
+    manifest = {}
+    for name in available_series(registry):
+        path = registry[name]['path']
+        filename = os.path.basename(path)
+        npy_name = os.path.splitext(filename)[0] + '.npy'
+        np.save(os.path.join(out_dir, npy_name), to_records(read_alarm_file(path)))
+        manifest[filename] = {'npy': npy_name, 'signature': list(file_signature(path))}
+
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+# 2. 읽기 (실행 시)
+_manifests = {}
+
+
+def _manifest(folder):
+    path = os.path.join(folder, SNAPSHOT_DIR, MANIFEST_FILE)
+    signature = file_signature(path)
+    if signature is None:
+        return {}
+    cached = _manifests.get(path)
+    if cached is None or cached[0] != signature:
+        with open(path, encoding='utf-8') as f:
+            cached = _manifests[path] = (signature, json.load(f))
+    return cached[1]
+
+
+def read_snapshot(path):
+    """
+    원본 엑셀과 서명이 같은 스냅샷이 있으면 read_alarm_file 과 같은 DataFrame, 없으면 None
+    """
+    folder, filename = os.path.split(path)
+    entry = _manifest(folder).get(filename)
+    signature = file_signature(path)
+    if entry is None or signature is None or tuple(entry['signature']) != signature:
+        return None
+    records = np.load(os.path.join(folder, SNAPSHOT_DIR, entry['npy']), mmap_mode='r')
+    return pd.DataFrame({
+        'ds': records['ds'], 'y': records['y'], 'yhat': records['yhat'],
+        'yhat_lower': records['yhat_lower'], 'yhat_upper': records['yhat_upper'],
+        '경보': records['alarm'], '경보해석': records['interpretation'].astype(object),
+    })
+
+
+def read_result(path):
+    """
+    경보결과 읽기: 스냅샷이 최신이면 스냅샷, 아니면 엑셀
+    """
+    df = read_snapshot(path)
+    return df if df is not None else read_alarm_file(path)
+
+
+if __name__ == '__main__':
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    manifest = build_snapshot(folder)
+    print(f"💾 스냅샷 저장: {os.path.join(folder, SNAPSHOT_DIR)} ({len(manifest)}개 시리즈)")
@@ -0,0 +1,105 @@
+# 프로세스 공용 캐시 (메모리 상한)
+# - Streamlit 캐시는 항목 수(max_entries)로만 제한되어 큰 시리즈 / 그래프가 쌓이면 메모리가 계속 늘어남
+#   BoundedCache: 바이트 예산을 넘으면 가장 오래 안 쓴 항목부터 버리는 LRU (스레드 안전)
+# - 같은 키를 여러 세션이 동시에 요청하면 한 세션만 만들고 나머지는 기다렸다가 결과를 공유 (아침 회의 동시 접속)
+# - shared_cache(이름, 바이트) 는 이름별로 프로세스에 하나만 만듦
+#   (Streamlit 은 매 실행마다 스크립트를 다시 돌리지만 import 한 모듈은 그대로이므로 모든 세션이 같은 객체를 씀)
+# - 캐시에 넣은 값은 여러 세션이 공유하므로 읽기 전용으로만 사용
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+def sizeof(value):
+    """
+    캐시 항목 크기 추정 (바이트): bytes / nbytes 속성(ndarray, PreparedSeries, AlarmTimeline) / Plotly 는 JSON 길이
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    if hasattr(value, 'to_plotly_json'):
+        return len(value.to_json())
+    return sys.getsizeof(value)
+
+
+class BoundedCache:
+    def __init__(self, name, max_bytes):
+        self.name = name
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()   # 키 → (값, 크기), 뒤쪽이 최근 사용
+        self._building = {}           # 키 → 만드는 중인 세션이 잡은 잠금
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            key_lock = self._building.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # 기다리는 동안 다른 세션이 만들었으면 그대로 사용
+            with self._lock:
+                if key in self._items:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return self._items[key][0]
+            try:
+                value = factory()
+                size = sizeof(value)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+            with self._lock:
+                self.misses += 1
+                self._insert(key, value, size)
+            return value
+
+    def _insert(self, key, value, size):
+        if size > self.max_bytes:
+            return   # 예산보다 큰 항목은 보관하지 않음
+        self._items[key] = (value, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, (_, old_size) = self._items.popitem(last=False)
+            self.total_bytes -= old_size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {'name': self.name, 'entries': len(self._items), 'bytes': self.total_bytes,
+                    'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'hit_rate': self.hits / requests if requests else None}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def shared_cache(name, max_bytes):
+    """
+    이름별 프로세스 공용 캐시. 이미 있으면 그 객체를 돌려주고 상한만 갱신
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = BoundedCache(name, max_bytes)
+        cache.max_bytes = max_bytes
+        return cache
+
+
+def cache_stats():
+    with _caches_lock:
+        return [cache.stats() for cache in _caches.values()]
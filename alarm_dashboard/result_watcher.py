@@ -0,0 +1,115 @@
+# 경보결과 파일 변경 감시
+# - 폴더의 *_경보결과.xlsx 를 주기적으로 stat 해서 (mtime, 크기) 가 바뀐 파일을 찾음
+# - 월별 작업이 파일을 여러 번 나눠 쓰는 경우를 위해, 서명이 settle_seconds 동안 그대로일 때만 변경으로 확정 (묶음 쓰기 → 1번)
+# - 확정 시 내용 해시(sha1)를 비교해 내용이 같으면(같은 파일 재저장) 변경으로 보지 않음
+#   (시작 시에는 해시를 만들지 않으므로 파일별 첫 변경은 항상 변경으로 봄)
+# - 파일별 버전 번호를 올려 두고, 화면(세션)은 자신이 그린 버전과 비교만 함
+# - 여러 세션이 같은 객체를 공유하므로 min_interval 안의 중복 poll 은 건너뜀 (스레드 안전)
+
+import glob
+import hashlib
+import os
+import threading
+import time
+
+from dashboard_data import file_signature
+from series_registry import RESULT_SUFFIX
+
+
+def content_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultWatcher:
+    """
+    poll() → 이번에 변경이 확정된 파일 경로 목록, version(path) → 변경 확정 횟수, paths() → 확정된 파일 경로 집합
+    """
+
+    def __init__(self, folder, pattern='*' + RESULT_SUFFIX, settle_seconds=2.0, min_interval=1.0):
+        self.folder = folder
+        self.pattern = pattern
+        self.settle_seconds = settle_seconds
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._confirmed = {}   # 경로 → (서명, 해시)
+        self._pending = {}     # 경로 → (서명, 마지막으로 서명이 바뀐 시각)
+        self._versions = {}
+        self._last_poll = None
+        self.poll()
+
+    def _paths(self):
+        return glob.glob(os.path.join(self.folder, self.pattern))
+
+    def poll(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._last_poll is not None and now - self._last_poll < self.min_interval:
+                return []
+            first_poll = self._last_poll is None
+            self._last_poll = now
+
+            changed = []
+            current = {path: file_signature(path) for path in self._paths()}
+            for path in set(self._confirmed) - set(current):
+                # 삭제된 파일
+                del self._confirmed[path]
+                self._pending.pop(path, None)
+                self._versions[path] = self._versions.get(path, 0) + 1
+                changed.append(path)
+
+            for path, signature in current.items():
+                if signature is None:
+                    continue
+                if first_poll:
+                    self._confirmed[path] = (signature, None)
+                    self._versions[path] = 0
+                    continue
+                confirmed = self._confirmed.get(path)
+                if confirmed is not None and confirmed[0] == signature:
+                    self._pending.pop(path, None)
+                    continue
+
+                pending = self._pending.get(path)
+                if pending is None or pending[0] != signature:
+                    # 새로 바뀌었거나 아직 쓰는 중 → 대기 시작 / 연장
+                    self._pending[path] = (signature, now)
+                    continue
+                if now - pending[1] < self.settle_seconds:
+                    continue
+
+                # settle_seconds 동안 그대로 → 내용 비교 후 확정
+                del self._pending[path]
+                digest = content_hash(path)
+                old_digest = confirmed[1] if confirmed is not None else None
+                self._confirmed[path] = (signature, digest)
+                if old_digest is not None and old_digest == digest:
+                    continue
+                self._versions[path] = self._versions.get(path, 0) + 1
+                changed.append(path)
+            return changed
+
+    def version(self, path):
+        return self._versions.get(path, 0)
+
+    def paths(self):
+        with self._lock:
+            return set(self._confirmed)
+
+    def versions(self, paths):
+        return {path: self.version(path) for path in paths}
+
+
+if __name__ == '__main__':
+    import sys
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    watcher = ResultWatcher(folder)
+    print(f"📌 감시 중: {folder} ({len(watcher.versions(watcher._paths()))}개 파일, Ctrl+C 로 종료)")
+    while True:
+        for path in watcher.poll():
+            print(f"📢 변경: {os.path.basename(path)} (버전 {watcher.version(path)})")
+        time.sleep(watcher.min_interval)
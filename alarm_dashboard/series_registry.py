@@ -0,0 +1,65 @@
+# 대시보드 시리즈 목록 (registry)
+# - 시리즈명 → 파일, 구분(hospital / community), 그래프 제목, y 라벨
+# - 기본 목록(DEFAULT_SERIES) + series_registry.csv (있으면, 같은 이름은 덮어씀) + 폴더의 *_경보결과.xlsx 자동 등록
+#   자동 등록: 파일명에서 '_경보결과' 를 뗀 이름, '병원' 이 들어가면 hospital 아니면 community
+# - 파일이 실제로 있는 시리즈만 available_series 로 반환 (없는 파일을 선택해 오류 나는 일 없음)
+# - series_registry.csv 컬럼: 이름, 구분, 파일, 제목, y라벨   (병동/병원이 많아지면 이 파일에 행만 추가)
+
+import glob
+import os
+
+import pandas as pd
+
+REGISTRY_FILE = 'series_registry.csv'
+RESULT_SUFFIX = '_경보결과.xlsx'
+
+DEFAULT_SERIES = [
+    # (이름, 구분, 파일, 제목, y 라벨)
+    ("CRE(충북대병원)", "hospital", "CRE(병원내부)_경보결과.xlsx", "CRE(충북대병원) 이상치 탐지", "CRE 발생 건수"),
+    ("표본감시(충북대병원)", "hospital", "표본감시(병원내부)_경보결과.xlsx", "표본감시(충북대병원) 이상치 탐지", "표본감시 발생 건수"),
+    ("CRE(전국)", "community", "CRE(전국)_경보결과.xlsx", "CRE(전국) 이상치 탐지", "CRE 발생 건수"),
+    ("CRE(충북)", "community", "CRE(충북)_경보결과.xlsx", "CRE(충북) 이상치 탐지", "CRE 발생 건수"),
+    ("표본감시(전국)", "community", "표본감시(전국)_경보결과.xlsx", "표본감시(전국) 이상치 탐지", "표본감시 발생 건수"),
+    ("표본감시(충북)", "community", "표본감시(충북)_경보결과.xlsx", "표본감시(충북) 이상치 탐지", "표본감시 발생 건수"),
+]
+
+
+def _entry(group, filename, title, y_label, folder):
+    return {'group': group, 'file': filename, 'path': os.path.join(folder, filename),
+            'title': title, 'y_label': y_label}
+
+
+# 1. 목록 만들기
+def load_registry(folder, discover=True):
+    """
+    반환: {시리즈명: {'group', 'file', 'path', 'title', 'y_label'}} (등록 순서 유지)
+    """
+    registry = {name: _entry(group, filename, title, y_label, folder)
+                for name, group, filename, title, y_label in DEFAULT_SERIES}
+
+    registry_path = os.path.join(folder, REGISTRY_FILE)
+    if os.path.exists(registry_path):
+        for row in pd.read_csv(registry_path, dtype=str).fillna('').itertuples(index=False):
+            name, group, filename, title, y_label = row[:5]
+            registry[name] = _entry(group, filename, title or f'{name} 이상치 탐지',
+                                    y_label or f"{name.split('(')[0]} 발생 건수", folder)
+
+    if discover:
+        known_files = {entry['file'] for entry in registry.values()}
+        for path in sorted(glob.glob(os.path.join(folder, '*' + RESULT_SUFFIX))):
+            filename = os.path.basename(path)
+            if filename in known_files:
+                continue
+            name = filename[:-len(RESULT_SUFFIX)]
+            group = 'hospital' if '병원' in name else 'community'
+            registry[name] = _entry(group, filename, f'{name} 이상치 탐지', f"{name.split('(')[0]} 발생 건수", folder)
+    return registry
+
+
+# 2. 조회
+def available_series(registry, group=None):
+    """
+    파일이 있는 시리즈명 목록 (group 을 주면 해당 구분만)
+    """
+    return [name for name, entry in registry.items()
+            if (group is None or entry['group'] == group) and os.path.exists(entry['path'])]
@@ -1,20 +1,25 @@
 # 0. 라이브러리 임포트 및 설정
+# matplotlib / plotly 는 그래프를 처음 그릴 때 불러옴 (dashboard_charts.py). 첫 화면 시간은 서버 로그에 출력
+import time
+script_started = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import matplotlib.dates as mdates
-from datetime import datetime
 import os
-import plotly.graph_objects as go
-import logging
 import warnings
 
+from alarm_history import SEVERITY_LABELS, AlarmHistory
+from dashboard_charts import gauge_figures, series_figure_plotly, series_figure_png, sparkline_png, view_mask
+from dashboard_data import AlarmTimeline, PreparedSeries, file_signature, month_index
+from data_snapshot import read_result
+from memory_cache import shared_cache
+from result_watcher import ResultWatcher
+from series_registry import REGISTRY_FILE, available_series, load_registry
+
 # 경고 제거
-logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
-logging.getLogger('prophet').setLevel(logging.WARNING)
 warnings.filterwarnings('ignore')
+imports_done = time.perf_counter()
 
 # 폰트 설정 (절대경로 Docker/로컬 공통 안전 방식)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # /app/alarm_dashboard
@@ -25,10 +30,17 @@ FONT_PATH = os.path.abspath(
 if not os.path.exists(FONT_PATH):
     st.error(f"❌ 폰트 파일 경로 오류: {FONT_PATH} 에 파일이 없습니다.")
     st.stop()
-else:
+
+
+# PNG 그래프를 처음 그릴 때 한 번만 폰트 등록 (폰트 캐시는 이미지 빌드 시 생성, Dockerfile)
+@st.cache_resource(show_spinner=False)
+def chart_font():
+    import matplotlib
+    import matplotlib.font_manager as fm
     fontprop = fm.FontProperties(fname=FONT_PATH)
-    plt.rcParams['font.family'] = fontprop.get_name()
-    plt.rcParams['axes.unicode_minus'] = False
+    matplotlib.rcParams['font.family'] = fontprop.get_name()
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    return fontprop
 
 # 자동 비율 설정
 st.markdown("""
@@ -55,150 +67,171 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# 2. 파일 매핑
-hospital_file_map = {
-    "CRE(충북대병원)": ("CRE(충북대)_경보결과.xlsx", "CRE(충북대병원) 이상치 탐지", "CRE 발생 건수"),
-    "표본감시(충북대병원)": ("표본감시(충북대)_경보결과.xlsx", "표본감시(충북대병원) 이상치 탐지", "표본감시 발생 건수")
-}
+# 2. 시리즈 목록 (series_registry.py: 기본 목록 + series_registry.csv + *_경보결과.xlsx 자동 등록)
+# 폴더나 series_registry.csv 가 바뀌면 다시 만듦
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_series_registry(folder_signature):
+    return load_registry(BASE_DIR)
 
-community_file_map = {
-    "CRE(전국)": ("CRE(전국)_경보결과.xlsx", "CRE(전국) 이상치 탐지", "CRE 발생 건수"),
-    "CRE(충북)": ("CRE(충북)_경보결과.xlsx", "CRE(충북) 이상치 탐지", "CRE 발생 건수"),
-    "표본감시(전국)": ("표본감시(전국)_경보결과.xlsx", "표본감시(전국) 이상치 탐지", "표본감시 발생 건수"),
-    "표본감시(충북)": ("표본감시(충북)_경보결과.xlsx", "표본감시(충북) 이상치 탐지", "표본감시 발생 건수")
-}
 
-# 3. 현재 날짜 설정 및 data_dict 정의
-current_date = pd.to_datetime('2023-08-01')
-data_dict = {}
+series_registry = load_series_registry(
+    (file_signature(BASE_DIR), file_signature(os.path.join(BASE_DIR, REGISTRY_FILE)))
+)
+hospital_names = available_series(series_registry, 'hospital')
+community_names = available_series(series_registry, 'community')
 
-for name, (filename, _, _) in hospital_file_map.items():
-    filepath = filename
-    if os.path.exists(filepath):
-        df = pd.read_excel(filepath)
-        df['ds'] = pd.to_datetime(df['ds'])
-        data_dict[name] = df
-    else:
-        pass
-
-for name, (filename, _, _) in community_file_map.items():
-    filepath = filename
-    if os.path.exists(filepath):
-        df = pd.read_excel(filepath)
-        df['ds'] = pd.to_datetime(df['ds'])
-        data_dict[name] = df
-    else:
-        pass
-        
-# 4. 시각화 함수
-def plot_graph(df, title_text, y_label, current_date):
-    df = df[df['ds'].dt.year == 2023]
-    past_mask = df['ds'] < current_date
-    current_mask = df['ds'] == current_date
+# 3. 데이터 로딩 (프로세스 공용 캐시, memory_cache.py)
+# Streamlit 은 위젯을 바꿀 때마다 스크립트 전체를 다시 실행하므로, 엑셀 파싱과 렌더링용 정리는 (경로, 파일 서명) 기준으로
+# 모든 세션이 공유하는 캐시에서 한 번만 수행 (동시에 요청해도 한 세션만 만듦, 복사 없음)
+# 빌드 시 만든 스냅샷(.snapshot/, data_snapshot.py)이 최신이면 엑셀 대신 메모리 매핑으로 읽음
+# 파일이 교체되면 서명이 바뀌어 자동으로 다시 읽고, 옛 항목은 메모리 상한을 넘을 때 오래된 것부터 밀려남
+# 상한 (MB): 환경변수 ALARM_SERIES_CACHE_MB (시리즈 / 타임라인), ALARM_FIGURE_CACHE_MB (그래프 / 스파크라인)
+SERIES_CACHE_MB = int(os.environ.get('ALARM_SERIES_CACHE_MB', 256))
+FIGURE_CACHE_MB = int(os.environ.get('ALARM_FIGURE_CACHE_MB', 128))
+series_cache = shared_cache('series', SERIES_CACHE_MB * 1024 * 1024)
+figure_cache = shared_cache('figures', FIGURE_CACHE_MB * 1024 * 1024)
 
-    fig, ax = plt.subplots(figsize=(7, 3))
-    
-    # 배경색 적용
-    fig.patch.set_facecolor("#fef9f5")
-    ax.set_facecolor("#fef9f5")
-
-    # 신뢰구간
-    ax.fill_between(df['ds'], df['yhat_lower'], df['yhat_upper'],
-                    where=~df['yhat_lower'].isna(),
-                    color='red', alpha=0.2, label='신뢰구간(95%)')
-
-    # 실제값
-    ax.plot(df.loc[past_mask | current_mask, 'ds'],
-            df.loc[past_mask | current_mask, 'y'],
-            marker='o', color='royalblue', linestyle='-',
-            markersize=2.5, linewidth=0.8, label=f'실제 {y_label}')
-
-    # 예측값
-    ax.plot(df['ds'], df['yhat'],
-            marker='o', linestyle='--', color='red',
-            markersize=2.5, linewidth=0.8, label='One-step 예측')
-
-    # 이상치
-    ax.plot([], [], marker='*', color='#FFC107', markersize=6, linestyle='None', label='이상치')  # 범례 고정용
-    outlier_label_added = False
-
-    try:
-        df['경보'] = df['경보'].apply(lambda x: True if str(x).strip().upper() in ['TRUE', '1', '1.0', 'T'] else False)
-        outlier_rows = df[df['경보']]
-        for _, row in outlier_rows.iterrows():
-            edge_color = 'black' if row['ds'] == current_date else 'gray'
-            if not outlier_label_added:
-                ax.plot(row['ds'], row['y'], marker='*', color='#FFC107', markersize=6,
-                        markeredgecolor=edge_color, markeredgewidth=0.8, label='이상치')
-                outlier_label_added = True
-            else:
-                ax.plot(row['ds'], row['y'], marker='*', color='#FFC107', markersize=6,
-                        markeredgecolor=edge_color, markeredgewidth=0.8)
-    except Exception as e:
-        st.error(f"⚠️ 이상치 시각화 오류: {e}")
-
-    ax.axvline(current_date, color='gray', linestyle='--', linewidth=0.8, label='예측 시작')
-
-    ax.set_title(title_text, fontsize=7, fontproperties=fontprop)
-    ax.set_xlabel("날짜", fontsize=6, fontproperties=fontprop)
-    ax.set_ylabel(y_label, fontsize=6, fontproperties=fontprop)
-    ax.tick_params(axis='both', labelsize=5, colors='#2B2D42')
-    ax.xaxis.set_major_locator(mdates.MonthLocator())
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-    plt.xticks(rotation=45)
-    ax.grid(True, linestyle='--', linewidth=0.4, color='#CCCCCC')
-
-    # 범례 정렬
-    handles, labels = ax.get_legend_handles_labels()
-    label_handle_map = dict(zip(labels, handles))
-    order = ['신뢰구간(95%)', f'실제 {y_label}', 'One-step 예측', '이상치', '예측 시작']
-    ordered_handles = [label_handle_map[lbl] for lbl in order if lbl in label_handle_map]
-    ordered_labels = [lbl for lbl in order if lbl in label_handle_map]
-
-    # 범례 표시
-    ax.legend(
-        ordered_handles,
-        ordered_labels,
-        fontsize=4,            # 글씨 크기 줄이기
-        markerscale=0.3,       # 마커 크기 줄이기
-        loc='upper left',
-        frameon=False,
-        labelspacing=0.2,      # 항목 간 간격
-        handlelength=0.8,      # 마커와 텍스트 거리
-        handletextpad=0.2,     # 마커와 텍스트 간격
-        borderpad=0.2,         # 범례 테두리와 내부 여백
-        prop=fontprop          # 폰트 설정
-    )
-    st.pyplot(fig, use_container_width=True)
+
+def load_prepared_series(filepath, signature):
+    return series_cache.get_or_create(('series', filepath, signature),
+                                      lambda: PreparedSeries(read_result(filepath)))
+
+
+def load_data_dict(names):
+    """
+    화면에 필요한 시리즈만 로딩 (목록이 커져도 보이는 것만 읽음)
+    반환: (시리즈명 → PreparedSeries, 시리즈별 파일 서명 튜플)
+    """
+    data, signatures = {}, []
+    for name in dict.fromkeys(names):
+        filepath = series_registry[name]['path']
+        signature = file_signature(filepath)
+        if signature is not None:
+            data[name] = load_prepared_series(filepath, signature)
+            signatures.append((name, signature))
+    return data, tuple(signatures)
+
+
+# 월별 경보 타임라인: 같은 시리즈 묶음 / 파일 서명이면 모든 세션이 공유 (기준 월을 옮겨도 다시 계산하지 않음)
+def build_alarm_timeline(signatures, data):
+    return series_cache.get_or_create(('timeline', signatures),
+                                      lambda: AlarmTimeline(data, hospital_names, community_names))
+
+# 과거 경보 내역 색인 (alarm_history.py): 같은 시리즈 묶음 / 파일 서명이면 모든 세션이 공유
+def build_alarm_history(signatures, data):
+    return series_cache.get_or_create(('history', signatures), lambda: AlarmHistory(data))
+
+# 그래프 표시 구간: 기준 월 앞 7개월 ~ 뒤 4개월 (12개월)
+PLOT_MONTHS_BEFORE = 7
+PLOT_MONTHS_AFTER = 4
+
+# 3-1. 결과 파일 자동 갱신
+# 감시는 프로세스에 하나 (모든 세션 공유, 1초 안의 중복 확인은 건너뜀). 쓰기가 2초간 멈춘 뒤 내용이 바뀐 경우만 변경으로 확정
+# 화면의 패널(시리즈 그래프 + 경보 메시지 + 과거 경보 내역 / 통합 게이지 / 전체 현황 타일 / 과거 경보 표)은 세션에 고정한
+# 파일 서명으로 그림 (페이지를 다시 실행해도 같은 버전 → 그래프 / 표는 캐시에서 그대로)
+# 세션마다 감시 fragment 하나만 REFRESH_SECONDS 마다 실행: 아무것도 그리지 않고 패널별 고정 버전과 감시 버전을 비교만 함
+# 바뀐 패널이 있으면 그 패널의 서명만 풀고 페이지를 다시 실행 → 바뀐 패널만 새로 읽고 그림 (나머지는 캐시 / 변경 없음 전송)
+# 전체 현황에서는 새 결과 파일이 생겨도 다시 실행 (시리즈 목록 / 페이지가 바뀜)
+# 주기 (초): 환경변수 ALARM_REFRESH_SECONDS
+REFRESH_SECONDS = float(os.environ.get('ALARM_REFRESH_SECONDS', 5))
+
+
+@st.cache_resource(show_spinner=False)
+def get_result_watcher():
+    return ResultWatcher(BASE_DIR, settle_seconds=2.0, min_interval=1.0)
+
+
+def panel_data(names, key):
+    """
+    패널 key 가 그릴 시리즈 데이터. 파일 서명은 세션에 고정 (처음 그릴 때 / 시리즈가 바뀔 때 읽고,
+    watch_results 가 이 패널 파일의 변경을 확인해 고정을 풀 때까지 같은 버전을 그림)
+    반환: (시리즈명 → PreparedSeries, 시리즈별 파일 서명 튜플)
+    """
+    pins = st.session_state.setdefault("panel_pins", {})
+    pin = pins.get(key)
+    if pin is None or pin['names'] != names:
+        paths = [series_registry[name]['path'] for name in names]
+        versions = get_result_watcher().versions(paths)
+        data, signatures = load_data_dict(names)
+        pins[key] = {'names': names, 'paths': paths, 'versions': versions, 'signatures': signatures}
+        return data, signatures
+    data = {name: load_prepared_series(series_registry[name]['path'], signature)
+            for name, signature in pin['signatures']}
+    return data, pin['signatures']
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def watch_results(known_paths=None):
+    """
+    세션에 하나. 고정된 패널 중 파일 변경이 확정된 패널의 고정을 풀고 페이지를 다시 실행
+    known_paths 가 있으면(전체 현황) 목록에 없는 결과 파일이 생겨도 다시 실행
+    """
+    watcher = get_result_watcher()
+    watcher.poll()
+    pins = st.session_state.get("panel_pins", {})
+    changed = [key for key, pin in pins.items() if watcher.versions(pin['paths']) != pin['versions']]
+    for key in changed:
+        del pins[key]
+    if changed or (known_paths is not None and watcher.paths() - known_paths):
+        st.rerun()
+
+# 3-2. 첫 화면 시간 (프로세스에서 처음 그린 화면만 한 번 출력)
+@st.cache_resource(show_spinner=False)
+def first_render_log():
+    return {}
+
+
+def report_first_render():
+    now = time.perf_counter()
+    times = {'import': imports_done - script_started, 'data': data_loaded - imports_done,
+             'render': now - data_loaded, 'total': now - script_started}
+    if first_render_log().setdefault('times', times) is not times:
+        return
+    print(f"⏱️ 첫 화면 {times['total']:.2f}초 (import {times['import']:.2f}초, 데이터 {times['data']:.2f}초, "
+          f"그리기 {times['render']:.2f}초)", flush=True)
+
+# 4. 시각화 함수
+# 그래프는 (시리즈, 파일 서명, 표시 구간, 기준 월, 테마) 가 같으면 다시 그리지 않음 (PNG / Plotly 객체, 공용 캐시)
+def render_series_png(key, series, title_text, y_label, current_date, start_month, end_month, theme):
+    def render():
+        view = view_mask(series, start_month, end_month)
+        return series_figure_png(series, title_text, y_label, current_date, view, theme, chart_font())
+    return figure_cache.get_or_create(('png', key, title_text, y_label, current_date, start_month, end_month, theme),
+                                      render)
+
+
+def render_series_plotly(key, series, title_text, y_label, current_date, start_month, end_month, theme):
+    def render():
+        view = view_mask(series, start_month, end_month)
+        return series_figure_plotly(series, title_text, y_label, current_date, view, theme)
+    return figure_cache.get_or_create(('plotly', key, title_text, y_label, current_date, start_month, end_month, theme),
+                                      render)
+
+
+def plot_graph(name, series, signature, title_text, y_label, current_date):
+    current_month = month_index(current_date)
+    args = ((name, signature), series, title_text, y_label, pd.Timestamp(current_date),
+            current_month - PLOT_MONTHS_BEFORE, current_month + PLOT_MONTHS_AFTER, chart_theme)
+    if interactive_charts:
+        st.plotly_chart(render_series_plotly(*args), width='stretch')
+    else:
+        st.image(render_series_png(*args), width='stretch')
 
 # 6. 경보 메시지 관련 함수
 # 경보 탑지 함수
-def render_alert_message(df, current_date, dataset_label):
+def render_alert_message(series, current_date, dataset_label):
     """
     현재 날짜 기준 경보 메시지를 해석해서 출력합니다.
     """
-    df = df.copy()
-    df['ds'] = pd.to_datetime(df['ds'])
-    df['월'] = df['ds'].dt.strftime("%Y-%m")
-    
-    df['경보'] = df['경보'].apply(lambda x: str(x).strip().upper() in ["TRUE", "1", "1.0", "T"])
-
-    current_date = pd.to_datetime(current_date)
-    current_row = df[df['ds'] == current_date]
     current_date_str = pd.to_datetime(current_date).strftime("%Y-%m")
-    
-    if current_row.empty:
+    i = series.index_of(current_date)
+
+    if i is None:
         st.warning(f"⚠️ {current_date_str}에 해당하는 데이터를 찾을 수 없습니다.")
         return
 
-    row = current_row.iloc[0]
-    current_val = int(row['y'])
-    threshold = row['yhat_upper']
-    is_alert = row['경보']
-
-    # 이상치 판정 횟수 계산 (최근 2개월 포함)
-    recent_rows = df[df['ds'] <= row['ds']].tail(2)
-    alert_count = recent_rows['경보'].sum()
+    # 이상치 판정 횟수 (최근 2개월 포함, 미리 계산)
+    alert_count = series.recent_alert_count[i]
 
     # 상태 메시지 결정
     if alert_count >= 2:
@@ -211,24 +244,16 @@ def render_alert_message(df, current_date, dataset_label):
         status = "🟢 정상"
         desc = "이상치 없음"
 
-   # 해석 텍스트
-    interpretation = row.get('경보해석', '').strip()
-
-    # 다음 행의 yhat 값 가져오기
-    current_idx = df.index[df['ds'] == current_date]
-    
-    if not current_idx.empty and current_idx[0] + 1 < len(df):
-        next_yhat = df.loc[current_idx[0] + 1, 'yhat']
-    else:
-        next_yhat = None
-    
-
+   # 해석 텍스트, 다음 행의 yhat 값
+    interpretation = series.interpretation[i]
+    next_yhat = series.next_yhat[i]
+    next_yhat_text = f"{next_yhat:.2f}" if not np.isnan(next_yhat) else "-"
 
     # 메시지 출력
     message_md = f"""
     <div class="responsive-box" style="background-color:#fef9f5; max-width: 100%; padding:10px; border-radius:8px;">
         <span style="color:#D72638; font-weight:bold;">📌 [{current_date_str}] {status}: {desc}</span><br>
-        <span style="color:black;">▶ 다음달 예측값은 {next_yhat:.2f} 입니다.</span><br>
+        <span style="color:black;">▶ 다음달 예측값은 {next_yhat_text} 입니다.</span><br>
     """
     if interpretation:
         message_md += f'<span style="color:black;">▶ {interpretation}</span><br>'
@@ -237,38 +262,79 @@ def render_alert_message(df, current_date, dataset_label):
     st.markdown(message_md, unsafe_allow_html=True)
 
 # 과거 경보 테이블 표시 함수
-def display_alert_table(df):
-    """
-    과거 경보 내역을 테이블로 표시합니다.
-    """
-    df = df.copy()
-    df['ds'] = pd.to_datetime(df['ds'])
-    df['월'] = df['ds'].dt.strftime("%Y-%m")
-
-    df['경보'] = df['경보'].apply(lambda x: str(x).strip().upper() in ["TRUE", "1", "1.0", "T"])
-
-    alert_df = df[df['경보']].copy()
-    alert_df = alert_df[['월', 'y', 'yhat_upper']].rename(columns={
-        '월': '경보 발생 시점',
-        'y': '현재값',
-        'yhat_upper': '예측 상한값'
-    })
+# 미리 색인한 경보 표(alarm_history)에서 시리즈 / 기간 / 단계 필터, 정렬, 페이지를 조회하고 보이는 페이지만 꾸며서 표시
+HISTORY_PAGE_SIZE = 10
+HISTORY_SORTS = {
+    "최근순": ('ds', True),
+    "오래된순": ('ds', False),
+    "초과량 큰 순": ('excess', True),
+    "현재값 큰 순": ('y', True),
+}
 
-    alert_df['현재값'] = alert_df['현재값'].astype(int)
-    alert_df['예측 상한값'] = alert_df['예측 상한값'].round(2)
 
-    if alert_df.empty:
+def display_alert_table(alarm_history, names, key):
+    """
+    과거 경보 내역을 테이블로 표시합니다. (names 가 여러 개면 시리즈 필터 표시, key: 위젯 키 접두어)
+    """
+    if not alarm_history.months(names):
         st.info("📭 과거 경보 내역이 없습니다.")
-    else:
-        styled_table = (
-            alert_df.style
-            .format({'예측 상한값': '{:.2f}'})  # 소수점 2자리
-            .set_properties(**{'text-align': 'center'})  # 셀 가운데 정렬
-            .set_table_styles([
-                {'selector': 'th', 'props': [('text-align', 'center')]}  # 컬럼명 가운데 정렬
-            ])
-        )
-        st.dataframe(styled_table, use_container_width=True, hide_index=True)
+        return
+
+    # 선택지가 바뀌어 세션 값이 무효가 되면 기본값으로
+    show_series = len(names) > 1
+    if show_series:
+        if not set(st.session_state.get(f"{key}_series", [])) <= set(names):
+            st.session_state.pop(f"{key}_series", None)
+        names = st.multiselect("시리즈", names, default=names, key=f"{key}_series")
+    months = alarm_history.months(names)
+    if not months:
+        st.info("📭 조건에 맞는 경보 내역이 없습니다.")
+        return
+    period = (months[0], months[-1])
+    if len(months) > 1:
+        if not set(st.session_state.get(f"{key}_period", ())) <= set(months):
+            st.session_state.pop(f"{key}_period", None)
+        period = st.select_slider("기간", options=months, value=period, key=f"{key}_period")
+
+    severity_col, sort_col, page_col = st.columns([2, 2, 1])
+    with severity_col:
+        severity = st.multiselect("단계", list(SEVERITY_LABELS.values()), default=list(SEVERITY_LABELS.values()),
+                                  key=f"{key}_severity")
+    with sort_col:
+        sort_label = st.selectbox("정렬", list(HISTORY_SORTS), key=f"{key}_sort")
+
+    # 조건이 바뀌면 첫 페이지로
+    filters = (tuple(names), tuple(period), tuple(severity), sort_label)
+    if st.session_state.get(f"{key}_filters") != filters:
+        st.session_state[f"{key}_filters"] = filters
+        st.session_state[f"{key}_page"] = 1
+
+    sort, descending = HISTORY_SORTS[sort_label]
+    levels = [level for level, label in SEVERITY_LABELS.items() if label in severity]
+    page = st.session_state.get(f"{key}_page", 1)
+    page_df, total, n_pages = alarm_history.query(names, period[0], period[1], levels, sort, descending,
+                                                  page, HISTORY_PAGE_SIZE)
+    st.session_state[f"{key}_page"] = min(max(page, 1), n_pages)
+    with page_col:
+        page = st.number_input(f"페이지 (/{n_pages})", min_value=1, max_value=n_pages, key=f"{key}_page")
+
+    if page_df.empty:
+        st.info("📭 조건에 맞는 경보 내역이 없습니다.")
+        return
+    if not show_series:
+        page_df = page_df.drop(columns='시리즈')
+
+    styled_table = (
+        page_df.style
+        .format({'현재값': '{:.0f}', '예측 상한값': '{:.2f}', '초과량': '{:+.2f}'}, na_rep='-')  # 현재값 정수, 나머지 소수점 2자리
+        .set_properties(**{'text-align': 'center'})  # 셀 가운데 정렬
+        .set_table_styles([
+            {'selector': 'th', 'props': [('text-align', 'center')]}  # 컬럼명 가운데 정렬
+        ])
+    )
+    st.dataframe(styled_table, width='stretch', hide_index=True)
+    first_row = (page - 1) * HISTORY_PAGE_SIZE + 1
+    st.caption(f"전체 {total}건 중 {first_row}~{first_row + len(page_df) - 1}번째")
 
 # 7. 경보 레벨 색상 매핑
 level_color_map = {
@@ -280,137 +346,204 @@ level_color_map = {
 }
 
 # 8. 게이지 차트 함수
+# 가능한 게이지는 테마별 5개뿐이므로 한 번만 만들어 모든 세션이 재사용 (테마 2개 → 최대 10개)
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_gauge_figures(theme):
+    return gauge_figures(theme)
+
+
 def draw_gauge(level, color_hex=None):
-    
+
     # 경보 레벨 유효성 확인
     if level < 1 or level > 5:
         st.error("경보 레벨은 1~5 사이여야 합니다.")
         return
 
-    # 색상 및 라벨 설정
-    level_colors = ['#00cc96', '#636efa', '#f4c430', '#ffa15a', '#ef553b']
-    level_labels = ['1', '2', '3', '4', '5']
-    total_levels = 5
-
-    # 반원 게이지 구성
-    fig = go.Figure()
-    fig.add_trace(go.Pie(
-        values=[20] * total_levels + [100],  # 마지막은 투명 채우기
-        rotation=-270,
-        hole=0.6,
-        direction='clockwise',
-        text=level_labels + [''],
-        textinfo='text',
-        textposition='inside',
-        insidetextfont=dict(color='black', size=12),
-        marker_colors=level_colors + ['rgba(0,0,0,0)'],
-        hoverinfo='skip',
-        showlegend=False
-    ))
-
-    # 중앙 숫자 (검은색)
-    fig.add_annotation(
-        text=f"<b>{level}</b>",
-        x=0.5, y=0.42,
-        font=dict(size=36, color='black', family='Noto Sans KR'),
-        showarrow=False
-    )
-
-    # 바늘 위치 계산 (중심 기준 각도, 시계방향 45도씩)
-    angle_deg = 180 - ((level - 0.5) * 36) - 8
-    angle_rad = np.radians(angle_deg)
-    x = 0.5 + 0.2 * np.cos(angle_rad)  # 바늘 길이
-    y = 0.5 + 0.2 * np.sin(angle_rad)
-
-   # 바늘 추가 (흰색)
-    fig.add_shape(
-        type='line',
-        x0=0.5, y0=0.5, x1=x, y1=y,
-        line=dict(color='#2B3F73', width=4)
-    )
-
-    # 배경 설정
-    fig.update_layout(
-        height=300,
-        margin=dict(t=30, b=0, l=10, r=10),
-        paper_bgcolor='#fef9f5',
-        plot_bgcolor='#fef9f5'
-    )
-
     # 스트림릿에 출력
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(load_gauge_figures(chart_theme)[level], width='stretch')
 
 # 9. 경보 레벨 판단 함수
-def get_alarm_level(hospital_df, community_df, current_date):
-    current_month = pd.to_datetime(current_date).strftime("%Y-%m")
-
-    # 병원 데이터 처리
-    hospital_df = hospital_df.copy()
-    hospital_df["ds"] = pd.to_datetime(hospital_df["ds"])
-    hospital_df["월"] = hospital_df["ds"].dt.strftime("%Y-%m")
-    hospital_df["경보"] = hospital_df["경보"].apply(lambda x: str(x).strip().upper() in ["TRUE", "1", "1.0", "T"])
-
-    # 지역사회 데이터 처리
-    community_df = community_df.copy()
-    community_df["ds"] = pd.to_datetime(community_df["ds"])
-    community_df["월"] = community_df["ds"].dt.strftime("%Y-%m")
-    community_df["경보"] = community_df["경보"].apply(lambda x: str(x).strip().upper() in ["TRUE", "1", "1.0", "T"])
-
-    # 현재 월 기준 경보 여부
-    hosp_alarm_bool = hospital_df[hospital_df["월"] == current_month]["경보"].any()
-    comm_alarm_bool = community_df[community_df["월"] == current_month]["경보"].any()
-
-    # 최근 2개월 병원 경보 여부 확인
-    recent_hosp = hospital_df.sort_values("ds", ascending=False).head(2)
-    two_month_alarm = recent_hosp["경보"].sum() >= 2
-
-    # 경보 레벨 판정
-    if two_month_alarm:
-        return 5
-    elif hosp_alarm_bool and comm_alarm_bool:
-        return 4
-    elif hosp_alarm_bool:
-        return 3
-    elif comm_alarm_bool:
-        return 2
-    else:
-        return 1
+# 레벨은 병원 x 지역사회 x 월 전체를 타임라인에서 한 번에 계산해 두었으므로 (병원, 지역사회, 월) 위치로 조회만 함
+# (레벨 5: 기준 월 포함 최근 2개월 병원 이상치, 4: 병원 + 지역사회, 3: 병원만, 2: 지역사회만, 1: 안정)
+def get_alarm_level(timeline, hospital_name, community_name, current_date):
+    return timeline.level_at(hospital_name, community_name, current_date)
 
 # current_date 매번 외부에서 받도록 설정
-def get_integrated_alert_level(hospital_df, community_df, current_date):
-    level = get_alarm_level(hospital_df, community_df, current_date)
+def get_integrated_alert_level(timeline, hospital_name, community_name, current_date):
+    level = get_alarm_level(timeline, hospital_name, community_name, current_date)
     color_hex = level_color_map.get(level, "#000000")
     return level, color_hex
 
-# 10. 3분할 레이아웃 (고정된 정렬 구조)
+
+# 통합 게이지 패널: 두 시리즈 중 하나의 파일이 바뀌면 새 버전으로 다시 계산
+def integrated_gauge(hospital_name, community_name, current_date):
+    data, signatures = panel_data([hospital_name, community_name], "gauge")
+    if len(data) == 2:
+        level, color_hex = get_integrated_alert_level(build_alarm_timeline(signatures, data),
+                                                      hospital_name, community_name, current_date)
+        draw_gauge(level, color_hex)
+    else:
+        st.warning("⚠️ 결과 파일을 찾을 수 없어 통합 경보를 계산하지 못했습니다.")
+
+
+# 시리즈 패널: 그래프 + 경보 메시지 + 과거 경보 내역 (fragment: 경보 내역 필터 / 페이지를 바꾸면 이 패널만 다시 실행)
+@st.fragment
+def series_panel(name, dataset_label, current_date, key):
+    data, signatures = panel_data([name], key)
+    if name in data:
+        y_label = series_registry[name]['y_label']
+        plot_graph(name, data[name], dict(signatures)[name], f"{dataset_label} 이상치 예측", y_label, current_date)
+        render_alert_message(data[name], current_date, dataset_label=dataset_label)
+        st.markdown("#### 과거 경보 내역")
+        display_alert_table(build_alarm_history(signatures, data), [name], key=f"{key}_history")
+    else:
+        st.warning(f"⚠️ {name} 결과 파일을 찾을 수 없습니다.")
+
+# 10. 전체 현황 (타일 그리드)
+TILE_COLUMNS = 4
+TILES_PER_PAGE = 12
+SPARKLINE_MONTHS = 12
+
+
+def render_sparkline_png(key, series, current_date, start_month, end_month, theme):
+    def render():
+        view = view_mask(series, start_month, end_month)
+        return sparkline_png(series, current_date, view, theme)
+    return figure_cache.get_or_create(('sparkline', key, current_date, start_month, end_month, theme), render)
+
+
+# 타일마다 서명을 따로 고정 (이 시리즈 / 기준 지역사회 파일이 바뀐 타일만 새로 읽고 그림)
+def render_tile(name, current_date, reference_community):
+    entry = series_registry[name]
+    key = f"tile_{name}"
+    names = [name] + ([reference_community] if entry['group'] == 'hospital' and reference_community else [])
+    data, signatures = panel_data(names, key)
+    if name not in data:
+        st.markdown(f"**{name}**<br>⚪ 자료 없음", unsafe_allow_html=True)
+        return
+    alarm_timeline = build_alarm_timeline(signatures, data)
+    row, i = alarm_timeline.row[name], alarm_timeline.position(current_date)
+    observed = i is not None and alarm_timeline.observed[row, i]
+    alert_count = alarm_timeline.recent_alert_count[row, i] if i is not None else 0
+
+    if not observed:
+        status = "⚪ 자료 없음"
+    elif alert_count >= 2:
+        status = "🔴 경고"
+    elif alert_count == 1:
+        status = "🟡 주의"
+    else:
+        status = "🟢 정상"
+
+    badge = ""
+    if entry['group'] == 'hospital' and reference_community in alarm_timeline.community_row:
+        level = alarm_timeline.level_at(name, reference_community, current_date)
+        badge = (f' <span style="background-color:{level_color_map[level]}; color:white; padding:1px 8px; '
+                 f'border-radius:8px;">레벨 {level}</span>')
+    st.markdown(f"**{name}**<br>{status}{badge}", unsafe_allow_html=True)
+
+    current_month = month_index(current_date)
+    st.image(render_sparkline_png((name, dict(signatures)[name]), data[name], pd.Timestamp(current_date),
+                                  current_month - SPARKLINE_MONTHS + 1, current_month, chart_theme),
+             width='stretch')
+
+
+def render_overview(names, current_date, reference_community):
+    for start in range(0, len(names), TILE_COLUMNS):
+        for col, name in zip(st.columns(TILE_COLUMNS), names[start:start + TILE_COLUMNS]):
+            with col, st.container(border=True):
+                render_tile(name, current_date, reference_community)
+
+
+# 전체 현황 과거 경보 표 (fragment: 필터 / 페이지를 바꾸면 표만 다시 실행)
+@st.fragment
+def overview_history(names, key):
+    data, signatures = panel_data(names, key)
+    if data:
+        display_alert_table(build_alarm_history(signatures, data), list(data), key)
+    else:
+        st.info("📭 과거 경보 내역이 없습니다.")
+
+
+# 11. 3분할 레이아웃 (고정된 정렬 구조)
 
 # 변수 초기화
-hospital_df, community_df = None, None
+hospital_series, community_series = None, None
 hospital_choice, community_choice = None, None
-y_label_hospital, y_label_community = None, None
 
-# 🔷 1번째 3열: 게이지 + 병원 그래프 + 지역사회 그래프
+# 보기 선택: 상세 (병원 1개 + 지역사회 1개) / 전체 현황 (등록된 모든 시리즈 타일, 페이지 단위)
+view_mode = st.radio("보기", ["상세", "전체 현황"], horizontal=True, key="view_mode")
+
+if view_mode == "전체 현황":
+    filter_col, reference_col, page_col = st.columns([2, 2, 1])
+    with filter_col:
+        group_filter = st.radio("구분", ["전체", "병원", "지역사회"], horizontal=True, key="overview_group")
+    with reference_col:
+        reference_community = st.selectbox("통합 레벨 기준 지역사회", community_names, key="overview_community")
+    overview_names = {"전체": hospital_names + community_names,
+                      "병원": hospital_names, "지역사회": community_names}[group_filter]
+    n_pages = max(1, -(-len(overview_names) // TILES_PER_PAGE))
+    with page_col:
+        page = st.number_input(f"페이지 (/{n_pages})", min_value=1, max_value=n_pages, value=1, key="overview_page")
+    page_names = overview_names[(page - 1) * TILES_PER_PAGE: page * TILES_PER_PAGE]
+    needed_names = page_names + ([reference_community] if reference_community else [])
+else:
+    # 선택 상자는 아래에서 그리지만 값은 세션 상태에 먼저 있으므로, 선택된 시리즈만 미리 로딩
+    needed_names = [st.session_state.get(key) for key in ("hospital_select", "community_select")]
+    needed_names = [name for name in needed_names if name in series_registry] or hospital_names[:1]
+
+# data_dict, 타임라인 정의 (필요한 시리즈만, 기준 월 목록용)
+data_dict, data_signatures = load_data_dict(needed_names)
+alarm_timeline = build_alarm_timeline(data_signatures, data_dict)
+data_loaded = time.perf_counter()
+
+# 결과 파일 감시 (세션에 하나). 전체 현황에서는 새 파일이 생겨도 다시 그림
+if view_mode == "전체 현황":
+    watch_results({series_registry[name]['path'] for name in hospital_names + community_names})
+else:
+    watch_results()
+
+# 기준 월 선택 (실제값이 있는 전체 기간, 기본값은 가장 최근 월)
+month_options = alarm_timeline.observed_labels()
+if st.session_state.get("current_month") not in month_options:
+    st.session_state.pop("current_month", None)
+slider_col, mode_col = st.columns([4, 1])
+with slider_col:
+    selected_month = st.select_slider("기준 월", options=month_options, value=month_options[-1], key="current_month")
+with mode_col:
+    # Plotly 모드: 데이터를 한 번 보내고 확대/툴팁은 브라우저에서 처리
+    interactive_charts = st.toggle("인터랙티브 차트", value=False, key="interactive_charts")
+current_date = pd.to_datetime(selected_month)
+chart_theme = 'dark' if st.context.theme.type == 'dark' else 'light'
+
+if view_mode == "전체 현황":
+    render_overview(page_names, current_date, reference_community)
+    st.markdown("#### 과거 경보 내역")
+    overview_history(page_names, key="overview_history")
+    report_first_render()
+    st.stop()
+
+# 🔷 3열: 게이지 + 경보레벨표 / 병원 패널 / 지역사회 패널
+# 시리즈 패널(그래프 + 경보 메시지 + 과거 경보 내역)은 각자 서명을 고정해 파일이 바뀐 패널만 새로 그림
 col1, col2, col3 = st.columns([1.1, 1.5, 1.5])
 
 with col2:
     st.markdown('<span class="responsive-box" style="font-size:20px;">🏥 병원 감염</span>', unsafe_allow_html=True)
-    hospital_options = ["선택"] + list(hospital_file_map.keys())
+    hospital_options = ["선택"] + hospital_names
     hospital_choice = st.selectbox("", hospital_options, index=0, key="hospital_select")
 
     if hospital_choice != "선택":
-        hospital_df = data_dict[hospital_choice]
-        y_label_hospital = hospital_file_map[hospital_choice][2]
-        plot_graph(hospital_df, "병원 감염 이상치 예측", y_label_hospital, current_date)
+        hospital_series = data_dict[hospital_choice]
+        series_panel(hospital_choice, "병원 감염", current_date, key="hospital")
 
 with col3:
     st.markdown('<span class="responsive-box" style="font-size:20px;">🌐 지역사회 감염</span>', unsafe_allow_html=True)
-    community_options = ["선택"] + list(community_file_map.keys())
+    community_options = ["선택"] + community_names
     community_choice = st.selectbox("", community_options, index=0, key="community_select")
 
     if community_choice != "선택":
-        community_df = data_dict[community_choice]
-        y_label_community = community_file_map[community_choice][2]
-        plot_graph(community_df, "지역사회 감염 이상치 예측", y_label_community, current_date)
+        community_series = data_dict[community_choice]
+        series_panel(community_choice, "지역사회 감염", current_date, key="community")
 
 with col1:
     st.markdown('<span class="responsive-box" style="font-size:20px;">🔔 통합 경보</span>', unsafe_allow_html=True)
@@ -421,9 +554,8 @@ with col1:
     st.markdown(" ")
     st.markdown(" ")
     
-    if hospital_df is not None and community_df is not None:
-        level, color_hex = get_integrated_alert_level(hospital_df, community_df, current_date)
-        draw_gauge(level, color_hex)
+    if hospital_series is not None and community_series is not None:
+        integrated_gauge(hospital_choice, community_choice, current_date)
     else:
         st.markdown("""
         <div class="responsive-box" style="background-color:#fef9f5; padding:10px; border-radius:16px;min-height:300px;">
@@ -433,24 +565,8 @@ with col1:
         </div>
         """, unsafe_allow_html=True)
 
-# 🟨 2번째 3열: 빈칸 + 병원 메시지 + 지역사회 메시지
-col1, col2, col3 = st.columns([1.1, 1.5, 1.5])
-
-with col1:
-    st.markdown(" ")  # 통합 경보 메시지 없음 → 빈칸 처리
-
-with col2:
-    if hospital_df is not None:
-        render_alert_message(hospital_df, current_date, dataset_label="병원 감염")
-
-with col3:
-    if community_df is not None:
-        render_alert_message(community_df, current_date, dataset_label="지역사회 감염")
-
-# 🟥 3번째 3열: 경보레벨표 + 병원 과거 경보 + 지역사회 과거 경보
-col1, col2, col3 = st.columns([1.1, 1.5, 1.5])
-
-with col1:
+    # 경보레벨표 (게이지 아래)
+    st.markdown(" ")
     st.markdown("#### 경보 레벨 체계 (5단계)")
     level_rows = [
         ("1단계", "안정", "🟢", "병원 감염 및 지역사회 감염 모두 안정"),
@@ -476,12 +592,4 @@ with col1:
         f"<tr>{''.join([f'<td>{cell}</td>' for cell in row])}</tr>" for row in level_rows
     ]) + "</table>", unsafe_allow_html=True)
 
-with col2:
-    if hospital_df is not None:
-        st.markdown("#### 과거 경보 내역")
-        display_alert_table(hospital_df)
-
-with col3:
-    if community_df is not None:
-        st.markdown("#### 과거 경보 내역")
-        display_alert_table(community_df)
+report_first_render()
@@ -0,0 +1,120 @@
+# 시차(lag) 교차상관 분석 모듈
+# - 모든 변수쌍 x 시차 0..max_lag 의 상관계수를 NumPy einsum 한 번으로 계산 (변수쌍/시차마다 corr() 반복 호출 없음)
+# - 결측은 변수쌍/시차별로 두 값이 모두 있는 시점만 사용 (pandas corr() 의 pairwise complete 와 동일)
+# - lag k 의 의미: 선행변수의 t-k 시점 값과 대상변수의 t 시점 값의 상관 (k개월 먼저 움직이는 외부 변수 찾기)
+# - method='spearman' 이면 변수별 순위로 바꾼 뒤 같은 계산 (순위는 변수별 관측값 전체 기준)
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+
+# 1. 시차별 상관 텐서
+def _lag_stack(values, max_lag):
+    """
+    (n, p) → (max_lag+1, n, p): [l] 은 l 칸 뒤로 민 값 (앞쪽은 NaN)
+    """
+    n, p = values.shape
+    stacked = np.full((max_lag + 1, n, p), np.nan)
+    for lag in range(max_lag + 1):
+        stacked[lag, lag:] = values[:n - lag]
+    return stacked
+
+
+def lagged_corr_tensor(values, max_lag=6, method='pearson'):
+    """
+    values: (n, p) 배열. 반환: (corr, n_obs) 모두 (max_lag+1, p, p)
+    corr[l, i, j] = corr(변수 i 의 t-l 값, 변수 j 의 t 값)
+    """
+    values = np.asarray(values, dtype=float)
+    if method == 'spearman':
+        values = pd.DataFrame(values).rank().to_numpy()
+    elif method != 'pearson':
+        raise ValueError(f"지원하지 않는 method: {method} (pearson / spearman)")
+
+    lead = _lag_stack(values, max_lag)
+    lead_mask = ~np.isnan(lead)
+    lag_mask = ~np.isnan(values)
+    a = np.where(lead_mask, lead, 0.0)
+    b = np.where(lag_mask, values, 0.0)
+    ma = lead_mask.astype(float)
+    mb = lag_mask.astype(float)
+
+    # 변수쌍별 공통 관측 시점에 대한 합계들 (행렬곱으로 모든 쌍/시차 동시 계산)
+    n_obs = np.einsum('lti,tj->lij', ma, mb)
+    sum_a = np.einsum('lti,tj->lij', a, mb)
+    sum_b = np.einsum('lti,tj->lij', ma, b)
+    sum_ab = np.einsum('lti,tj->lij', a, b)
+    sum_a2 = np.einsum('lti,tj->lij', a * a, mb)
+    sum_b2 = np.einsum('lti,tj->lij', ma, b * b)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n_obs * sum_ab - sum_a * sum_b
+        var = (n_obs * sum_a2 - sum_a ** 2) * (n_obs * sum_b2 - sum_b ** 2)
+        corr = np.where((n_obs >= 3) & (var > 0), cov / np.sqrt(np.clip(var, 0, None)), np.nan)
+    return np.clip(corr, -1, 1), n_obs.astype(int)
+
+
+# 2. tidy 테이블
+def lagged_correlation(df, columns=None, max_lag=6, method='pearson', target=None):
+    """
+    반환 컬럼: 선행변수, 대상변수, lag, corr, n
+    target 을 주면 대상변수가 target 인 행만 (외부 변수 → 내부 건수 방향)
+    """
+    columns = list(columns) if columns is not None else list(df.select_dtypes('number').columns)
+    corr, n_obs = lagged_corr_tensor(df[columns].to_numpy(dtype=float), max_lag, method)
+
+    lags, i, j = np.meshgrid(np.arange(max_lag + 1), np.arange(len(columns)), np.arange(len(columns)),
+                             indexing='ij')
+    names = np.asarray(columns, dtype=object)
+    table = pd.DataFrame({
+        '선행변수': names[i.ravel()],
+        '대상변수': names[j.ravel()],
+        'lag': lags.ravel(),
+        'corr': corr.ravel(),
+        'n': n_obs.ravel(),
+    })
+    # 같은 변수의 lag 0 (자기 자신) 은 제외
+    table = table[~((table['선행변수'] == table['대상변수']) & (table['lag'] == 0))]
+    if target is not None:
+        table = table[table['대상변수'] == target]
+    return table.reset_index(drop=True)
+
+
+def matrix_at_lag(table, lag=0):
+    """
+    tidy 테이블에서 특정 lag 의 상관행렬 (lag 0 이면 df.corr() 와 같은 값, 대각선 1)
+    """
+    matrix = table[table['lag'] == lag].pivot(index='선행변수', columns='대상변수', values='corr')
+    order = list(dict.fromkeys(table['선행변수']))
+    matrix = matrix.reindex(index=order, columns=order)
+    if lag == 0:
+        for name in order:
+            matrix.loc[name, name] = 1.0
+    return matrix
+
+
+def best_lags(table, target):
+    """
+    target 에 대해 선행변수별 |corr| 가 가장 큰 lag
+    """
+    rows = table[(table['대상변수'] == target) & (table['선행변수'] != target)].dropna(subset=['corr'])
+    idx = rows['corr'].abs().groupby(rows['선행변수']).idxmax()
+    return rows.loc[idx].sort_values('corr', key=np.abs, ascending=False).reset_index(drop=True)
+
+
+# 3. 시각화: 대상변수 기준 선행변수 x lag 히트맵
+def plot_lag_heatmap(table, target, title=None):
+    rows = table[(table['대상변수'] == target) & (table['선행변수'] != target)]
+    heat = rows.pivot(index='선행변수', columns='lag', values='corr')
+    heat = heat.reindex(list(dict.fromkeys(rows['선행변수'])))
+
+    plt.figure(figsize=(1.0 * heat.shape[1] + 4, 0.5 * heat.shape[0] + 2))
+    sns.heatmap(heat, annot=True, fmt=".2f", cmap='coolwarm', vmin=-1, vmax=1, linewidths=.5,
+                cbar_kws={'label': 'Correlation Coefficient'})
+    plt.title(title or f'{target} 와 선행변수의 시차별 상관계수', fontsize=14)
+    plt.xlabel('lag (개월, 선행변수가 앞섬)')
+    plt.ylabel('선행변수')
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,116 @@
+# 회귀변수 조합 탐색 엔진
+# - exhaustive: 모든 부분집합(공집합 포함)을 크기 순으로 평가
+# - forward / backward: 한 변수씩 추가/제거하는 greedy 경로
+# - 외부 변수 예측값(frame)과 fold 정의는 worker 초기화 때 한 번만 전달하고 모든 조합이 공유
+# - 롤링 원점 백테스트의 MAPE/RMSE 로 순위를 매기고, 확실히 밀리는 조합/가지는 중간에 중단
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'predictive_model'))
+from backtest import backtest_prophet, quiet_prophet  # noqa: E402
+
+
+# 1. worker 공유 상태
+_shared = {}
+
+
+def _init_worker(frame, folds, prophet_kwargs, metric):
+    quiet_prophet()
+    _shared.update(frame=frame, folds=folds, prophet_kwargs=prophet_kwargs, metric=metric)
+
+
+def _evaluate(subset, bound):
+    result = backtest_prophet(
+        _shared['frame'], subset, _shared['folds'],
+        prophet_kwargs=_shared['prophet_kwargs'], metric=_shared['metric'], bound=bound
+    )
+    return subset, result
+
+
+def _label(subset):
+    return '+'.join(subset) if subset else '없음'
+
+
+# 2. 한 묶음의 조합을 병렬 평가
+def _run_wave(pool, subsets, bound):
+    futures = [pool.submit(_evaluate, subset, bound) for subset in subsets]
+    return [f.result() for f in futures]
+
+
+# 3. 탐색 방식별 구현
+def _exhaustive(pool, candidates, metric, max_size, prune_ratio, prune_supersets, records):
+    best = np.inf
+    dominated = []
+
+    for size in range(0, max_size + 1):
+        subsets = [s for s in combinations(candidates, size)
+                   if not (prune_supersets and any(set(d) < set(s) for d in dominated))]
+        if not subsets:
+            break
+
+        bound = best * prune_ratio if np.isfinite(best) else None
+        for subset, result in _run_wave(pool, subsets, bound):
+            records.append((subset, result))
+            best = min(best, result[metric])
+
+        # 최적값 대비 prune_ratio 배 이상 나쁜 조합은 상위 집합까지 탐색하지 않음
+        dominated += [s for s, r in records
+                      if len(s) == size and size > 0 and r[metric] > best * prune_ratio]
+
+
+def _greedy(pool, candidates, metric, forward, records):
+    current = () if forward else tuple(candidates)
+    [(_, current_result)] = _run_wave(pool, [current], None)
+    records.append((current, current_result))
+    current_score = current_result[metric]
+
+    while True:
+        if forward:
+            steps = [current + (v,) for v in candidates if v not in current]
+        else:
+            steps = [tuple(v for v in current if v != drop) for drop in current]
+        if not steps:
+            break
+
+        # 현재 조합보다 나빠질 것이 확실한 후보는 중간에 중단
+        wave = _run_wave(pool, steps, current_score)
+        records.extend(wave)
+        subset, result = min(wave, key=lambda item: item[1][metric])
+        if result[metric] >= current_score:
+            break
+        current, current_score = subset, result[metric]
+
+
+# 4. 공개 함수
+def search_subsets(frame, candidates, folds, mode='exhaustive', prophet_kwargs=None, metric='MAPE',
+                   max_size=None, prune_ratio=1.5, prune_supersets=True, max_workers=None):
+    """
+    회귀변수 조합을 프로세스 풀에서 평가하고 metric 기준으로 정렬된 결과표를 반환합니다.
+    frame: ds, y, 후보 회귀변수 컬럼을 가진 DataFrame (외부 변수 예측값은 미리 계산해서 전달)
+    mode: 'exhaustive' | 'forward' | 'backward'
+    prune_ratio: exhaustive 에서 현재 최적 대비 이 배수를 넘는 조합은 중단하고, prune_supersets 면 그 상위 집합도 건너뜀
+    """
+    candidates = list(candidates)
+    max_size = len(candidates) if max_size is None else max_size
+    records = []
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(frame, folds, prophet_kwargs, metric)) as pool:
+        if mode == 'exhaustive':
+            _exhaustive(pool, candidates, metric, max_size, prune_ratio, prune_supersets, records)
+        elif mode in ('forward', 'backward'):
+            _greedy(pool, candidates, metric, mode == 'forward', records)
+        else:
+            raise ValueError(f"지원하지 않는 탐색 방식입니다: {mode}")
+
+    result_df = pd.DataFrame([
+        {'조합': _label(subset), '변수수': len(subset), **result} for subset, result in records
+    ])
+    result_df = result_df.drop_duplicates(subset='조합', keep='last')
+    return result_df.sort_values(by=[metric, 'RMSE']).reset_index(drop=True)
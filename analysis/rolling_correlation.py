@@ -0,0 +1,182 @@
+# 이동(rolling) / 누적(expanding) 구간 상관계수 안정성 분석
+# - 전체 기간 상관계수 하나로는 관계가 기간 내내 유지되는지 알 수 없으므로, 구간별 상관계수의 추이를 계산
+# - 누적합(cumsum) 공식으로 시점별 n, Σx, Σy, Σxy, Σx², Σy² 를 한 번에 만들고 구간 값은 차분으로 계산
+#   → 변수쌍마다 O(n) (구간마다 corr() 를 다시 부르지 않음), 결측은 두 값이 모두 있는 시점만 사용
+# - 변수별로 (그 변수, 뒤쪽 변수들) 쌍을 worker 에 나눠 병렬 계산 (짝 변수들은 열 단위로 한 번에 누적합),
+#   데이터는 worker 초기화 때 한 번만 전달
+# - 변수쌍 x 구간 길이별 안정성 요약: 평균/표준편차/최소/최대, 전체 기간과 부호가 같은 구간 비율
+# - python rolling_correlation.py [엑셀 파일] [구간 길이 ...]   (기본: CRE_merged.xlsx 12 24)
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+DEFAULT_WINDOWS = (12, 24)
+MIN_PERIODS = 6          # 구간 안 공통 관측이 이보다 적으면 NaN
+STABLE_STD = 0.15        # 안정 판정: 구간 상관계수 표준편차 기준
+STABLE_SIGN_RATIO = 0.9  # 안정 판정: 전체 기간과 부호가 같은 구간 비율 기준
+
+
+# 1. 누적합 기반 구간 상관계수
+def _cumulative_sums(x, y):
+    """
+    x, y: (n, k) 배열 (열 k 개 = 변수쌍 k 개). 두 값이 모두 있는 시점만 사용한 누적합
+    반환: (6, n+1, k) 배열 [n, Σx, Σy, Σxy, Σx², Σy²] (앞에 0 한 줄)
+    """
+    both = ~(np.isnan(x) | np.isnan(y))
+    count = both.sum(axis=0).clip(min=1)
+    # 평균을 빼 두면 분산 계산의 자릿수 손실이 줄어듦 (상관계수는 이동에 불변)
+    x = np.where(both, x, 0.0)
+    y = np.where(both, y, 0.0)
+    x = np.where(both, x - x.sum(axis=0) / count, 0.0)
+    y = np.where(both, y - y.sum(axis=0) / count, 0.0)
+    stats = np.stack([both.astype(float), x, y, x * y, x * x, y * y])
+    return np.concatenate([np.zeros((6, 1, x.shape[1])), np.cumsum(stats, axis=1)], axis=1)
+
+
+def window_corr(x, y, window=None, min_periods=MIN_PERIODS):
+    """
+    시점 t 에서 끝나는 구간의 상관계수. window=None 이면 처음부터 t 까지 (expanding)
+    x, y: 길이 n 배열 또는 (n, k) 배열 (열끼리 짝). 반환: (corr, n_obs) 같은 모양
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    vector = x.ndim == 1
+    if vector:
+        x, y = x[:, None], y[:, None]
+
+    sums = _cumulative_sums(x, y)
+    end = np.arange(1, sums.shape[1])
+    start = np.zeros_like(end) if window is None else np.maximum(end - window, 0)
+    n, sx, sy, sxy, sxx, syy = sums[:, end] - sums[:, start]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx ** 2) * (n * syy - sy ** 2)
+        corr = np.where((n >= max(min_periods, 3)) & (var > 1e-12), cov / np.sqrt(np.clip(var, 0, None)), np.nan)
+    if window is not None:
+        corr[:window - 1] = np.nan  # 구간이 다 차기 전은 제외
+    corr, n = np.clip(corr, -1, 1), n.astype(int)
+    return (corr[:, 0], n[:, 0]) if vector else (corr, n)
+
+
+# 2. worker (변수 하나 vs 뒤쪽 변수들을 한 번에)
+_shared = {}
+
+
+def _init_worker(values, columns, index, windows, min_periods):
+    _shared.update(values=values, columns=columns, index=index, windows=windows, min_periods=min_periods)
+
+
+def _pairs_for(i):
+    values, columns, index = _shared['values'], _shared['columns'], _shared['index']
+    partners = np.arange(i + 1, len(columns))
+    x = np.repeat(values[:, [i]], len(partners), axis=1)
+    y = values[:, partners]
+    names = np.asarray(columns, dtype=object)
+
+    frames = []
+    for window in _shared['windows']:
+        corr, n_obs = window_corr(x, y, window, _shared['min_periods'])
+        # (시점, 짝) → 짝 순서로 펼침
+        frames.append(pd.DataFrame({
+            '변수1': columns[i],
+            '변수2': np.repeat(names[partners], len(index)),
+            '구간': 'expanding' if window is None else f'{window}개월',
+            '시점': np.tile(index, len(partners)),
+            'corr': corr.T.ravel(),
+            'n': n_obs.T.ravel(),
+        }))
+    return frames
+
+
+# 3. 전체 변수쌍 계산
+def rolling_correlation(df, columns=None, windows=DEFAULT_WINDOWS, expanding=True, time_col=None,
+                        min_periods=MIN_PERIODS, max_workers=None):
+    """
+    반환 컬럼: 변수1, 변수2, 구간 ('12개월' / 'expanding'), 시점, corr, n
+    time_col 을 주면 그 컬럼을 시점으로 사용 (없으면 행 번호), max_workers=1 이면 현재 프로세스에서 계산
+    """
+    columns = list(columns) if columns is not None else list(df.select_dtypes('number').columns)
+    values = df[columns].to_numpy(dtype=float)
+    index = df[time_col].to_numpy() if time_col is not None else np.arange(len(df))
+    windows = list(windows) + ([None] if expanding else [])
+    init_args = (values, columns, index, windows, min_periods)
+
+    if max_workers == 1 or len(columns) < 3:
+        _init_worker(*init_args)
+        results = [_pairs_for(i) for i in range(len(columns) - 1)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=init_args) as pool:
+            results = list(pool.map(_pairs_for, range(len(columns) - 1)))
+
+    frames = [frame for result in results for frame in result]
+    if not frames:
+        return pd.DataFrame(columns=['변수1', '변수2', '구간', '시점', 'corr', 'n'])
+    return pd.concat(frames, ignore_index=True)
+
+
+# 4. 변수쌍별 안정성 요약
+def stability_summary(table, df, stable_std=STABLE_STD, stable_sign_ratio=STABLE_SIGN_RATIO):
+    """
+    변수쌍 x 구간별: 전체기간 corr, 구간 corr 의 평균/표준편차/최소/최대, 부호 일치율, 안정 여부
+    (expanding 은 마지막 값이 전체기간 값이므로 추이 확인용)
+    """
+    valid = table.dropna(subset=['corr'])
+    full = {}
+    for a, b in valid[['변수1', '변수2']].drop_duplicates().itertuples(index=False):
+        full[(a, b)] = df[a].astype(float).corr(df[b].astype(float))
+    overall = pd.Series([full[k] for k in zip(valid['변수1'], valid['변수2'])], index=valid.index)
+
+    grouped = valid.assign(
+        _same_sign=np.sign(valid['corr']) == np.sign(overall),
+    ).groupby(['변수1', '변수2', '구간'], sort=False)
+    summary = grouped['corr'].agg(['count', 'mean', 'std', 'min', 'max'])
+    summary.columns = ['구간 수', '평균', '표준편차', '최소', '최대']
+    summary.insert(0, '전체기간 corr', [full[(a, b)] for a, b, _ in summary.index])
+    summary['부호 일치율'] = grouped['_same_sign'].mean()
+    summary['안정'] = (summary['표준편차'] < stable_std) & (summary['부호 일치율'] >= stable_sign_ratio)
+    return summary.reset_index()
+
+
+# 5. 시각화: 기준 변수와 나머지 변수의 구간 상관계수 추이
+def plot_rolling(table, target, window):
+    rows = table[((table['변수1'] == target) | (table['변수2'] == target)) & (table['구간'] == window)]
+    plt.figure(figsize=(10, 5))
+    for (a, b), pair in rows.groupby(['변수1', '변수2'], sort=False):
+        other = b if a == target else a
+        plt.plot(pair['시점'], pair['corr'], marker='o', markersize=3, label=other)
+    plt.axhline(0, color='gray', linewidth=0.8)
+    plt.ylim(-1.05, 1.05)
+    plt.title(f'{target} 와의 {window} 이동 상관계수', fontsize=14)
+    plt.ylabel('Correlation Coefficient')
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    file_path = next((a for a in args if a.endswith('.xlsx')), 'CRE_merged.xlsx')
+    windows = [int(a) for a in args if a.isdigit()] or list(DEFAULT_WINDOWS)
+
+    df = pd.read_excel(file_path)
+    time_col = '년월' if '년월' in df.columns else ('ds' if 'ds' in df.columns else None)
+    table = rolling_correlation(df, windows=windows, time_col=time_col)
+    summary = stability_summary(table, df)
+
+    print(f"📊 구간 상관계수 안정성 ({file_path}, 구간 {windows}개월 + expanding):")
+    print(summary.round(3).to_string(index=False))
+
+    out_path = os.path.splitext(os.path.basename(file_path))[0] + '_구간상관.xlsx'
+    with pd.ExcelWriter(out_path) as writer:
+        summary.to_excel(writer, sheet_name='안정성요약', index=False)
+        table.to_excel(writer, sheet_name='구간상관', index=False)
+    print(f"💾 결과 저장: {out_path}")
+
+    target = 'CRE_내부' if 'CRE_내부' in df.columns else df.select_dtypes('number').columns[-1]
+    plot_rolling(table, target, f'{windows[0]}개월')
@@ -1,8 +1,12 @@
 # 라이브러리
+import sys
+
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from lagged_correlation import lagged_correlation, matrix_at_lag, best_lags, plot_lag_heatmap
+
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
@@ -17,6 +21,13 @@ warnings.filterwarnings('ignore')
 # 엑셀 파일 경로 설정 (★★★ 반드시 본인의 파일 경로에 맞게 수정해주세요 ★★★)
 file_path = '표본감시_merged.xlsx'
 
+# 분석 설정
+MAX_LAG = 6                               # 시차 0~6개월
+METHOD = 'pearson'                        # 'spearman' 이면 순위 상관
+TARGET = '표본감시'                       # 시차 히트맵/최대 시차 기준 변수
+lag_path = '표본감시_시차상관.xlsx'
+SHOW_PAIRPLOT = '--pairplot' in sys.argv  # 산점도 행렬은 느리므로 python 상관분석_표본.py --pairplot 일 때만
+
 try:
     # 1. 엑셀 파일 불러오기
     print("='데이터 불러오는 중...'\n")
@@ -35,15 +46,22 @@ try:
 
     correlation_data = df[columns_for_correlation]
 
-    # 3. 상관관계 행렬 계산 (피어슨 상관계수)
+    # 3. 상관관계 행렬 계산: 모든 변수쌍 x 시차 0..MAX_LAG 를 한 번에 (lagged_correlation.py)
     print("='상관관계 행렬 계산 중...'\n")
-    correlation_matrix = correlation_data.corr()
+    lag_table = lagged_correlation(correlation_data, max_lag=MAX_LAG, method=METHOD)
+    correlation_matrix = matrix_at_lag(lag_table, lag=0)  # lag 0 = 기존 corr() 결과
 
     # 4. 상관관계 행렬 출력
     print("='='년월'을 제외한 컬럼 간의 상관관계 행렬='\n")
     print(correlation_matrix)
     print("\n")
 
+    # 4-1. 시차별 상관계수 (선행변수의 t-lag 값 vs 대상변수의 t 값)
+    print(f"='{TARGET}' 기준 |상관계수|가 가장 큰 시차 (lag 0~{MAX_LAG}개월, {METHOD})='\n")
+    print(best_lags(lag_table, TARGET).round(3).to_string(index=False))
+    lag_table.to_excel(lag_path, index=False)
+    print(f"\n='시차별 상관계수 테이블 저장: {lag_path}'\n")
+
     # 5. 상관관계 그래프 시각화
 
     # 5-1. 상관관계 히트맵 그리기
@@ -59,21 +77,28 @@ try:
     )
     plt.title('Correlation Heatmap of Variables (Excluding 년월)', fontsize=16)
     plt.show()
-    print("='히트맵 생성 완료.'\n")
 
-    # 5-2. 산점도 행렬 그리기 (Pair Plot)
-    print("='산점도 행렬 생성 중...'\n")
-    # KDE 플롯 (부드러운 밀도 곡선)
-    # pairplot은 데이터가 많을수록 시간이 오래 걸릴 수 있습니다.
-    sns.pairplot(correlation_data, diag_kind='kde')
-    plt.suptitle('Pair Plot of Variables (Excluding 년월, KDE)', y=1.02, fontsize=16) # 전체 제목
-    plt.show()
+    # 5-2. 시차별 히트맵 (선행변수 x lag)
+    if TARGET in columns_for_correlation:
+        plot_lag_heatmap(lag_table, TARGET)
+    print("='히트맵 생성 완료.'\n")
 
-    # 히스토그램
-    sns.pairplot(correlation_data, diag_kind='hist')
-    plt.suptitle('Pair Plot of Variables (Excluding 년월, Histogram)', y=1.02, fontsize=16) # 전체 제목
-    plt.show()
-    print("='산점도 행렬 생성 완료.'\n")
+    # 5-3. 산점도 행렬 그리기 (Pair Plot) - 옵션
+    if SHOW_PAIRPLOT:
+        print("='산점도 행렬 생성 중...'\n")
+        # KDE 플롯 (부드러운 밀도 곡선)
+        # pairplot은 데이터가 많을수록 시간이 오래 걸릴 수 있습니다.
+        sns.pairplot(correlation_data, diag_kind='kde')
+        plt.suptitle('Pair Plot of Variables (Excluding 년월, KDE)', y=1.02, fontsize=16) # 전체 제목
+        plt.show()
+
+        # 히스토그램
+        sns.pairplot(correlation_data, diag_kind='hist')
+        plt.suptitle('Pair Plot of Variables (Excluding 년월, Histogram)', y=1.02, fontsize=16) # 전체 제목
+        plt.show()
+        print("='산점도 행렬 생성 완료.'\n")
+    else:
+        print("='산점도 행렬 생략 (--pairplot 옵션으로 실행하면 생성)'\n")
 
     print("='분석 및 시각화 프로세스 완료.'")
 
@@ -3,7 +3,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from prophet import Prophet
-from sklearn.metrics import mean_absolute_error, mean_squared_error, mean_absolute_percentage_error
+from tuning import load_best_params
+from regressors import build_model_frame
+from forecast_store import ForecastStore
+from metrics import compute_metrics, with_windows, year_windows
+from profiling import StageProfiler
 import matplotlib.dates as mdates
 import seaborn as sns
 import logging
@@ -19,10 +23,14 @@ warnings.filterwarnings('ignore')
 plt.rcParams['font.family'] = 'Malgun Gothic'  # 맑은 고딕 (한글용)
 plt.rcParams['axes.unicode_minus'] = False     # 음수 부호 깨짐 방지
 
+# 단계별 소요시간/메모리 측정 (PIPELINE_PROFILE=cprofile,tracemalloc 이면 상세 프로파일)
+profiler = StageProfiler('CRE_prophet')
+
 
 
 
 # 1. 데이터 로드 및 전처리
+profiler.mark('load')
 df = pd.read_excel("CRE_FULL.xlsx")
 df['ds'] = pd.to_datetime(df['년월'])
 df = df.rename(columns={
@@ -36,36 +44,12 @@ df = df.rename(columns={
 
 
 
-# 2. 외부 변수 Prophet으로 개별 예측
+# 2. 외부 변수 Prophet으로 개별 예측 + 3. 예측값 병합 (regressors.py)
+profiler.mark('regressors')
+# 예측은 2024년 3월까지 (2023년 12월 기준 future 3개월)
+# 외부 변수 이력이 지난 실행과 같으면 캐시된 {var}_예측 을 그대로 사용 (전국/충북 데이터가 바뀐 변수만 재학습)
 external_vars = ['nationwide_cre', 'chungbuk_cre', 'cre_deaths']
-future_external_preds = {}
-
-for var in external_vars:
-    ext_df = df[['ds', var]].copy().dropna()
-    ext_df = ext_df.rename(columns={var: 'y'})
-
-    model = Prophet()
-    model.fit(ext_df)
-
-    # 예측은 2024년 3월까지 (2023년 12월 기준 future 3개월)
-    future = model.make_future_dataframe(periods=3, freq='M')
-    forecast = model.predict(future)
-
-    future_external_preds[var] = forecast[['ds', 'yhat']].rename(columns={'yhat': f'{var}_예측'})
-
-
-
-
-
-
-# 3. 외부 변수 예측값 병합
-external_merged = future_external_preds[external_vars[0]]
-for var in external_vars[1:]:
-    external_merged = pd.merge(external_merged, future_external_preds[var], on='ds', how='outer')
-
-# 내부 데이터와 병합
-internal_df = df[['ds', 'y']]
-full_model_df = pd.merge(internal_df, external_merged, on='ds', how='left')
+full_model_df = build_model_frame(df, external_vars, periods=3, freq='M')
 
 
 
@@ -73,14 +57,17 @@ full_model_df = pd.merge(internal_df, external_merged, on='ds', how='left')
 
 
 # 4. 내부 Prophet 모델 학습
+profiler.mark('fit')
 train_df = full_model_df.dropna(subset=['y'])
 
-model = Prophet()
+# tuning.py 로 저장한 시리즈별 최적 설정 사용 (기록이 없으면 Prophet 기본값)
+model = Prophet(**load_best_params('CRE_내부'))
 for var in external_vars:
     model.add_regressor(f'{var}_예측')
 
 model.fit(train_df[['ds', 'y'] + [f'{var}_예측' for var in external_vars]])
 
+profiler.mark('predict')
 # 전체 예측 (2021~2024.03)
 forecast = model.predict(full_model_df[['ds'] + [f'{var}_예측' for var in external_vars]])
 
@@ -91,6 +78,7 @@ forecast = model.predict(full_model_df[['ds'] + [f'{var}_예측' for var in exte
 
 
 # 5. 회귀변수 영향력 확인
+profiler.mark('plot_regressors')
 # 회귀계수 시각화 (외부 변수 회귀 효과 확인)
 model.plot_components(forecast)
 plt.show()
@@ -136,31 +124,32 @@ plt.show()
 
 
 # 6. 성능지표 계산
+profiler.mark('metrics')
 forecast_df = pd.merge(full_model_df[['ds', 'y']], forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']], on='ds',
                        how='left')
 forecast_df['year'] = forecast_df['ds'].dt.year
 
-# 연도별 MAE, RMSE, MAPE
-results = []
-for yr in [2021, 2022, 2023]:
-    subset = forecast_df[forecast_df['year'] == yr].dropna()
-    mae = mean_absolute_error(subset['y'], subset['yhat'])
-    rmse = np.sqrt(mean_squared_error(subset['y'], subset['yhat']))
-    mape = mean_absolute_percentage_error(subset['y'], subset['yhat']) * 100
-    results.append({'Year': yr, 'MAE': mae, 'RMSE': rmse, 'MAPE': mape})
-
-results_df = pd.DataFrame(results)
+# 연도별 MAE, RMSE, MAPE, sMAPE, MASE, 구간 포함률 (metrics.py 공용 함수, 실제값 0인 달은 MAPE 에서 제외)
+# 평가 구간: 실제값이 12개월 모두 있는 연도
+observed_df = forecast_df.dropna(subset=['y'])
+eval_df = with_windows(observed_df, year_windows(observed_df['ds']))
+results_df = compute_metrics(eval_df, by='window', history=observed_df).rename(columns={'window': 'Year'})
+results_df = results_df[results_df['n'] == 12].drop(columns='n').reset_index(drop=True)
 
-# 2022 & 2023 평균
-avg_result = results_df[results_df['Year'].isin([2022, 2023])].mean(numeric_only=True)
+# 최근 2개 연도 평균
+recent_years = results_df['Year'].tail(2).tolist()
+avg_result = results_df[results_df['Year'].isin(recent_years)].mean(numeric_only=True)
 
 # 결과 출력
 print("📊 연도별 롤링 예측 평균 성능지표:")
 print(results_df.round(3).to_string(index=False))
-print("\n📌 2022년과 2023년 평균 성능지표:")
-print(f"MAE:  {avg_result['MAE']:.3f}")
-print(f"RMSE: {avg_result['RMSE']:.3f}")
-print(f"MAPE: {avg_result['MAPE']:.3f}")
+if recent_years:
+    print(f"\n📌 {'년과 '.join(str(year) for year in recent_years)}년 평균 성능지표:")
+    print(f"MAE:  {avg_result['MAE']:.3f}")
+    print(f"RMSE: {avg_result['RMSE']:.3f}")
+    print(f"MAPE: {avg_result['MAPE']:.3f}")
+else:
+    print("\n⚠️ 실제값이 12개월 모두 있는 연도가 없어 평균 성능지표를 계산하지 않음")
 
 # 막대 그래프 시각화
 plt.figure(figsize=(10, 5))
@@ -202,6 +191,7 @@ plt.show()
 
 
 # 7. 예측 시각화 (2021.01 ~ 2024.03 구간만 필터링)
+profiler.mark('plot_forecast')
 plot_df = forecast_df[(forecast_df['ds'] >= '2021-01-01') & (forecast_df['ds'] <= '2024-03-31')]
 plt.figure(figsize=(12, 5))
 sns.set(style="whitegrid")
@@ -233,6 +223,7 @@ plt.show()
 
 
 # 8. 경보 로직 (y > yhat_upper 기준)
+profiler.mark('alarm')
 forecast_df['경보'] = False
 alarm_msgs = []
 
@@ -247,10 +238,17 @@ for i in range(len(forecast_df)):
 
 
 # 엑셀 저장 (경보 포함)
+profiler.mark('export')
 save_cols = ['ds', 'y', 'yhat', 'yhat_lower', 'yhat_upper', '경보']
 forecast_df[save_cols].to_excel("CRE_경보결과.xlsx", index=False)
 
+# 예측 저장소에 run 추가 (xlsx 는 덮어쓰지만 저장소에는 실행 이력이 누적됨)
+run_id = ForecastStore().append_run('CRE_내부', forecast_df[save_cols], config={
+    'model': 'prophet', 'params': load_best_params('CRE_내부'), 'regressors': regressors})
+print(f"💾 예측 저장소 기록: run_id={run_id}")
+
 # 시각화: 2023-01 ~ 2024-01
+profiler.mark('plot_alarm')
 import matplotlib.pyplot as plt
 plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
@@ -297,6 +295,7 @@ plt.show()
 
 
 # 9. 구성요소 추출 및 저장
+profiler.mark('components')
 # Prophet 예측 수행 (기존 단계예측 모델 기준)
 forecast = model.predict(full_model_df[['ds'] + [f'{var}_예측' for var in external_vars]])
 
@@ -313,3 +312,6 @@ component_df = forecast[cols_to_export]
 
 # 엑셀 저장
 component_df.to_excel("CRE_구성요소_결과.xlsx", index=False)
+
+# 단계별 소요시간/메모리 보고서 (profile_reports/)
+profiler.save()
@@ -0,0 +1,134 @@
+# 롤링 원점(rolling-origin) 백테스트 공용 모듈
+# - 학습 구간을 한 달씩 늘려가며(확장 윈도우) horizon 개월을 예측하고 오차를 fold별로 계산
+# - bound 를 넘는 것이 확실해지면 남은 fold는 계산하지 않고 중단 (변수선택/튜닝 가지치기용)
+
+import logging
+import time
+import warnings
+
+import numpy as np
+from prophet import Prophet
+
+from metrics import score_errors  # 오차 지표는 metrics.py 로 통일 (실제값 0인 달은 MAPE 에서 제외)
+
+
+# 0. 로그/경고 정리 (프로세스 풀 worker에서도 호출)
+def quiet_prophet():
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    logging.getLogger('prophet').setLevel(logging.WARNING)
+    warnings.filterwarnings('ignore')
+
+
+# 1. fold 정의
+def rolling_origin_folds(frame, n_folds=4, horizon=3, step=None, min_train=24):
+    """
+    y가 관측된 구간의 마지막부터 거꾸로 fold를 만듭니다.
+    반환: [(cutoff, end), ...]  학습 = ds <= cutoff, 검증 = cutoff < ds <= end (시간순)
+    """
+    step = step or horizon
+    ds = frame.loc[frame['y'].notna(), 'ds'].sort_values().reset_index(drop=True)
+
+    folds = []
+    for k in range(n_folds):
+        test_end = len(ds) - 1 - k * step
+        cutoff_idx = test_end - horizon
+        if cutoff_idx + 1 < min_train:
+            break
+        folds.append((ds[cutoff_idx], ds[test_end]))
+    return folds[::-1]
+
+
+# 2. Prophet 1회 학습 + 예측
+def fit_prophet(train_df, regressors=(), prophet_kwargs=None, fit_kwargs=None):
+    """
+    fit_kwargs 는 model.fit 에 그대로 전달 (예: algorithm='LBFGS')
+    """
+    model = Prophet(**(prophet_kwargs or {}))
+    for reg in regressors:
+        model.add_regressor(reg)
+    model.fit(train_df[['ds', 'y'] + list(regressors)], **(fit_kwargs or {}))
+    return model
+
+
+def fit_predict_prophet(train_df, future_df, regressors=(), prophet_kwargs=None):
+    model = fit_prophet(train_df, regressors, prophet_kwargs)
+    return model.predict(future_df[['ds'] + list(regressors)])
+
+
+# 2-1. 학습된 모델로 신뢰구간 폭별 실제값 포함 여부 계산 (재학습 없이 interval_width 만 바꿔 예측)
+def interval_hits(model, future_df, y_true, interval_widths, regressors=()):
+    y_true = np.asarray(y_true, dtype=float)
+    hits = {}
+    for width in interval_widths:
+        model.interval_width = width
+        forecast = model.predict(future_df[['ds'] + list(regressors)])
+        hits[width] = (y_true >= forecast['yhat_lower'].values) & (y_true <= forecast['yhat_upper'].values)
+    return hits
+
+
+# 3. 롤링 원점 백테스트
+def backtest_prophet(frame, regressors, folds, prophet_kwargs=None, metric='MAPE', bound=None,
+                     interval_widths=None, fit_kwargs=None):
+    """
+    fold별로 학습/예측하여 MAE, RMSE, MAPE 의 fold 평균을 반환합니다.
+    bound 가 주어지면 (지금까지 fold 오차 합 / 전체 fold 수) 가 bound 를 넘는 순간 중단합니다.
+    오차는 음수가 될 수 없으므로 이 값은 최종 평균의 하한이고, 중단된 조합은 bound 보다 좋아질 수 없습니다.
+    interval_widths 가 주어지면 폭별 실제값 포함률을 'coverage' ({폭: 포함률}) 로 함께 반환합니다.
+    """
+    regressors = list(regressors)
+    observed = frame[frame['y'].notna()]
+    fold_scores = []
+    inside = {width: [] for width in (interval_widths or [])}
+
+    for cutoff, end in folds:
+        train_df = observed[observed['ds'] <= cutoff]
+        test_df = observed[(observed['ds'] > cutoff) & (observed['ds'] <= end)]
+
+        model = fit_prophet(train_df, regressors, prophet_kwargs, fit_kwargs)
+        forecast = model.predict(test_df[['ds'] + regressors])
+        fold_scores.append(score_errors(test_df['y'].values, forecast['yhat'].values))
+        if interval_widths:
+            for width, hits in interval_hits(model, test_df, test_df['y'].values,
+                                             interval_widths, regressors).items():
+                inside[width].extend(hits)
+
+        if bound is not None:
+            partial = np.nansum([s[metric] for s in fold_scores]) / len(folds)
+            if partial > bound and len(fold_scores) < len(folds):
+                return {'MAE': np.inf, 'RMSE': np.inf, 'MAPE': np.inf,
+                        'folds': len(fold_scores), 'pruned': True}
+
+    result = {key: float(np.nanmean([s[key] for s in fold_scores])) for key in ['MAE', 'RMSE', 'MAPE']}
+    result['folds'] = len(fold_scores)
+    result['pruned'] = False
+    if interval_widths:
+        result['coverage'] = {width: float(np.mean(hits)) for width, hits in inside.items()}
+    return result
+
+
+# 4. 임의의 예측 함수 백테스트 (기준 모델 비교/벤치마크용)
+def backtest_forecaster(frame, regressors, folds, forecaster, **kwargs):
+    """
+    forecaster(train_df, future_df, regressors, **kwargs) → ds, yhat, yhat_lower, yhat_upper
+    형태의 함수를 fold별로 실행해 MAE, RMSE, MAPE, 구간 포함률, fit 1회당 소요시간(ms)을 반환합니다.
+    """
+    regressors = list(regressors)
+    observed = frame[frame['y'].notna()]
+    fold_scores, hits, elapsed = [], [], []
+
+    for cutoff, end in folds:
+        train_df = observed[observed['ds'] <= cutoff]
+        test_df = observed[(observed['ds'] > cutoff) & (observed['ds'] <= end)]
+
+        start = time.perf_counter()
+        forecast = forecaster(train_df, test_df, regressors, **kwargs)
+        elapsed.append((time.perf_counter() - start) * 1000)
+
+        y_true = test_df['y'].to_numpy(dtype=float)
+        fold_scores.append(score_errors(y_true, forecast['yhat'].to_numpy()))
+        hits.extend((y_true >= forecast['yhat_lower'].to_numpy()) & (y_true <= forecast['yhat_upper'].to_numpy()))
+
+    result = {key: float(np.nanmean([s[key] for s in fold_scores])) for key in ['MAE', 'RMSE', 'MAPE']}
+    result['coverage'] = float(np.mean(hits))
+    result['ms_per_fit'] = float(np.mean(elapsed))
+    return result
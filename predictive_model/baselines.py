@@ -0,0 +1,242 @@
+# NumPy 기반 경량 기준(baseline) 예측 모델
+# - 월별 36~48개 시점 시리즈를 Prophet/cmdstan 없이 수 ms 안에 학습/예측
+# - 모든 함수는 fit_predict_prophet 과 같은 형태: (train_df, future_df, regressors, interval_width)
+#   → future_df 의 ds 마다 ds, yhat, yhat_lower, yhat_upper 를 반환 (forecast_df 와 같은 스키마)
+# - 학습 구간 안의 ds 는 한 단계 앞 적합값, 학습 구간 이후 ds 는 h 단계 앞 예측값
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+SEASON = 12
+RIDGE = 10.0
+
+
+# 0. 공통 도우미
+def _months(ds):
+    return np.asarray(ds, dtype='datetime64[M]').astype(np.int64)
+
+
+def _prepare(train_df, future_df):
+    """
+    학습 y 를 첫 관측월 기준 연속 월 배열로 만들고(빈 달은 직전 값), future_df 의 월 위치를 계산합니다.
+    pandas 연산 없이 NumPy 배열만 사용 (호출당 오버헤드 최소화)
+    """
+    y_all = train_df['y'].to_numpy(dtype=float)
+    observed = ~np.isnan(y_all)
+    t_all = _months(train_df['ds'].to_numpy())[observed]
+    origin = t_all.min()
+    t_train = t_all - origin
+
+    y = np.full(t_train.max() + 1, np.nan)
+    y[t_train] = y_all[observed]
+    gaps = np.isnan(y)
+    if gaps.any():
+        idx = np.where(~gaps, np.arange(len(y)), 0)
+        y = y[np.maximum.accumulate(idx)]
+    return y, _months(future_df['ds'].to_numpy()) - origin
+
+
+def _z(interval_width):
+    return NormalDist().inv_cdf(0.5 + interval_width / 2)
+
+
+def _to_frame(future_df, yhat, lower, upper):
+    return pd.DataFrame({
+        'ds': future_df['ds'].to_numpy(),
+        'yhat': yhat,
+        'yhat_lower': lower,
+        'yhat_upper': upper,
+    })
+
+
+def _lookup(t, n, fitted, forecast):
+    """
+    월 위치 t 에 대해 학습 구간이면 fitted[t], 이후면 forecast[h-1] (h = t-n+1) 을 꺼냅니다.
+    """
+    h = t - n + 1
+    out = np.full(len(t), np.nan)
+    hist = (t >= 0) & (t < n)
+    out[hist] = fitted[t[hist]]
+    ahead = h >= 1
+    out[ahead] = forecast[h[ahead] - 1]
+    return out, np.where(ahead, h, 1)
+
+
+# 1. 계절 naive: 12개월 전 값
+def seasonal_naive(train_df, future_df, regressors=(), interval_width=0.95):
+    y, t = _prepare(train_df, future_df)
+    n = len(y)
+    horizon = max(int(t.max()) - n + 1, 1)
+
+    fitted = np.full(n, np.nan)
+    fitted[SEASON:] = y[:-SEASON]
+    steps = np.arange(horizon)
+    forecast = y[n - SEASON + steps % SEASON] if n >= SEASON else np.full(horizon, y[-1])
+
+    yhat, h = _lookup(t, n, fitted, forecast)
+    sigma = np.nanstd(y - fitted) if n > SEASON else np.nanstd(np.diff(y))
+    half = _z(interval_width) * sigma * np.sqrt((h - 1) // SEASON + 1)
+    return _to_frame(future_df, yhat, yhat - half, yhat + half)
+
+
+# 2. EWMA (단순 지수평활): 평활계수 후보 전체를 배열 하나로 동시에 계산
+def ewma(train_df, future_df, regressors=(), interval_width=0.95, alphas=None):
+    y, t = _prepare(train_df, future_df)
+    n = len(y)
+    alphas = np.linspace(0.05, 0.95, 19) if alphas is None else np.asarray(alphas)
+
+    level = np.full(len(alphas), y[0])
+    fitted = np.empty((n, len(alphas)))
+    for i in range(n):
+        fitted[i] = level
+        level = alphas * y[i] + (1 - alphas) * level
+
+    best = np.argmin(((y[1:, None] - fitted[1:]) ** 2).sum(axis=0))
+    alpha = alphas[best]
+    horizon = max(int(t.max()) - n + 1, 1)
+
+    yhat, h = _lookup(t, n, fitted[:, best], np.full(horizon, level[best]))
+    sigma = np.std(y[1:] - fitted[1:, best])
+    half = _z(interval_width) * sigma * np.sqrt(1 + (h - 1) * alpha ** 2)
+    return _to_frame(future_df, yhat, yhat - half, yhat + half)
+
+
+# 3. Holt-Winters (가법 추세 + 가법 계절): (alpha, beta, gamma) 격자를 배열 하나로 동시에 계산
+def holt_winters(train_df, future_df, regressors=(), interval_width=0.95,
+                 alphas=(0.1, 0.3, 0.5, 0.7, 0.9), betas=(0.01, 0.05, 0.1, 0.2),
+                 gammas=(0.05, 0.1, 0.2, 0.4)):
+    y, t = _prepare(train_df, future_df)
+    n = len(y)
+    if n < 2 * SEASON:
+        return ewma(train_df, future_df, regressors, interval_width)
+
+    a, b, g = (arr.ravel() for arr in np.meshgrid(alphas, betas, gammas, indexing='ij'))
+    level = np.full(len(a), y[:SEASON].mean())
+    trend = np.full(len(a), (y[SEASON:2 * SEASON].mean() - y[:SEASON].mean()) / SEASON)
+    season = np.tile(y[:SEASON] - y[:SEASON].mean(), (len(a), 1))
+
+    fitted = np.empty((n, len(a)))
+    for i in range(n):
+        s = season[:, i % SEASON]
+        fitted[i] = level + trend + s
+        new_level = a * (y[i] - s) + (1 - a) * (level + trend)
+        trend = b * (new_level - level) + (1 - b) * trend
+        season[:, i % SEASON] = g * (y[i] - new_level) + (1 - g) * s
+        level = new_level
+
+    # 초기값 영향이 큰 첫 시즌은 제외하고 한 단계 앞 오차 제곱합이 가장 작은 조합 선택
+    resid = y[SEASON:, None] - fitted[SEASON:]
+    best = np.argmin((resid ** 2).sum(axis=0))
+
+    horizon = max(int(t.max()) - n + 1, 1)
+    steps = np.arange(1, horizon + 1)
+    forecast = level[best] + steps * trend[best] + season[best, (n + steps - 1) % SEASON]
+
+    yhat, h = _lookup(t, n, fitted[:, best], forecast)
+    sigma = np.std(resid[:, best])
+    half = _z(interval_width) * sigma * np.sqrt(h)
+    return _to_frame(future_df, yhat, yhat - half, yhat + half)
+
+
+# 4. Poisson / 음이항 GLM (월 더미 + 외부 회귀변수), IRLS 로 적합
+def _design(ds, reg_values, center, scale):
+    months = _months(ds) % 12 + 1
+    dummies = (months[:, None] == np.arange(2, 13)[None, :]).astype(float)  # 1월 기준
+    cols = [np.ones((len(months), 1)), dummies]
+    if reg_values.shape[1]:
+        cols.append((reg_values - center) / scale)
+    return np.hstack(cols)
+
+
+def _irls(X, y, penalty, alpha=0.0, max_iter=50, tol=1e-8):
+    beta = np.zeros(X.shape[1])
+    beta[0] = np.log(max(y.mean(), 1e-3))
+    penalty = np.diag(penalty)
+    for _ in range(max_iter):
+        eta = np.clip(X @ beta, -20, 20)
+        mu = np.exp(eta)
+        w = mu / (1 + alpha * mu)
+        z = eta + (y - mu) / mu
+        XtW = X.T * w
+        new_beta = np.linalg.solve(XtW @ X + penalty, XtW @ z)
+        if np.max(np.abs(new_beta - beta)) < tol:
+            return new_beta
+        beta = new_beta
+    return beta
+
+
+def _count_glm(train_df, future_df, regressors, interval_width, negative_binomial, ridge):
+    y = train_df['y'].to_numpy(dtype=float)
+    observed = ~np.isnan(y)
+    # 결측이 있는 회귀변수는 제외 (Prophet 실패 대체용으로 쓰일 때도 결과가 나오도록)
+    regressors = [reg for reg in regressors
+                  if not (train_df[reg][observed].isna().any() or future_df[reg].isna().any())]
+    y = np.clip(y[observed], 0, None)
+
+    reg_train = train_df[regressors].to_numpy(dtype=float)[observed]
+    center = reg_train.mean(axis=0)
+    scale = reg_train.std(axis=0)
+    scale[scale == 0] = 1.0
+
+    X = _design(train_df['ds'].to_numpy()[observed], reg_train, center, scale)
+    # 30개 남짓한 시점에 월 더미 11개 + 회귀변수를 넣으므로 회귀변수 계수에만 ridge 를 걸어 외삽 폭주 방지
+    penalty = np.r_[0.0, np.full(SEASON - 1, 1e-6), np.full(len(regressors), ridge * len(y))]
+    beta = _irls(X, y, penalty)
+
+    alpha = 0.0
+    if negative_binomial:
+        # NB2 (분산 = mu + alpha*mu^2): 모멘트 추정 alpha 와 가중치 재적합을 번갈아 2회
+        for _ in range(2):
+            mu = np.exp(np.clip(X @ beta, -20, 20))
+            dof = max(len(y) - X.shape[1], 1)
+            alpha = max(np.sum(((y - mu) ** 2 - mu) / mu ** 2) / dof, 1e-8)
+            beta = _irls(X, y, penalty, alpha=alpha)
+
+    X_future = _design(future_df['ds'].to_numpy(), future_df[regressors].to_numpy(dtype=float), center, scale)
+    mu = np.exp(np.clip(X_future @ beta, -20, 20))
+
+    q_low, q_high = 0.5 - interval_width / 2, 0.5 + interval_width / 2
+    if negative_binomial:
+        size, p = 1 / alpha, 1 / (1 + alpha * mu)
+        lower, upper = stats.nbinom.ppf(q_low, size, p), stats.nbinom.ppf(q_high, size, p)
+    else:
+        lower, upper = stats.poisson.ppf(q_low, mu), stats.poisson.ppf(q_high, mu)
+    return _to_frame(future_df, mu, lower, upper)
+
+
+def poisson_glm(train_df, future_df, regressors=(), interval_width=0.95, ridge=RIDGE):
+    return _count_glm(train_df, future_df, regressors, interval_width, False, ridge)
+
+
+def negbin_glm(train_df, future_df, regressors=(), interval_width=0.95, ridge=RIDGE):
+    return _count_glm(train_df, future_df, regressors, interval_width, True, ridge)
+
+
+BASELINES = {
+    'seasonal_naive': seasonal_naive,
+    'ewma': ewma,
+    'holt_winters': holt_winters,
+    'poisson_glm': poisson_glm,
+    'negbin_glm': negbin_glm,
+}
+
+
+# 5. Prophet 실패 시 기준 모델로 대체
+def fit_predict_with_fallback(train_df, future_df, regressors=(), prophet_kwargs=None,
+                              fallback='negbin_glm', interval_width=0.95):
+    """
+    Prophet 으로 예측하고, 학습/예측 중 오류가 나면 fallback 기준 모델 결과를 같은 스키마로 반환합니다.
+    반환: (forecast DataFrame, 사용한 모델 이름)
+    """
+    from backtest import fit_predict_prophet
+
+    try:
+        kwargs = {'interval_width': interval_width, **(prophet_kwargs or {})}
+        forecast = fit_predict_prophet(train_df, future_df, regressors, kwargs)
+        return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']], 'prophet'
+    except Exception as e:
+        print(f"⚠️ Prophet 예측 실패 → {fallback} 로 대체: {e}")
+        return BASELINES[fallback](train_df, future_df, regressors, interval_width), fallback
@@ -0,0 +1,183 @@
+# 다중 시리즈 일괄 예측 (균종 x 검체 x 내성 월별 건수)
+# - 입력: long 형식 테이블 (series_id, ds, y, [회귀변수...]) → 시리즈 묶음(chunk) 단위로 프로세스 풀에서 학습/예측
+# - 출력: 모든 시리즈 결과를 한 테이블로 (series_id, ds, y, yhat, yhat_lower, yhat_upper, 경보, 모델)
+# - 시리즈 하나가 실패해도 나머지는 계속 진행: Prophet 실패 → 기준 모델(fallback) → 그래도 실패하면 상태 테이블에 오류 기록
+# - python batch_forecast.py : CRE_FULL.xlsx / 표본감시_FULL.xlsx 의 모든 건수 컬럼을 시리즈로 예측, 처리량(시리즈/분) 출력
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from backtest import fit_prophet, quiet_prophet
+from baselines import BASELINES
+
+RESULT_COLS = ['series_id', 'ds', 'y', 'yhat', 'yhat_lower', 'yhat_upper', '경보', '모델']
+STATUS_COLS = ['series_id', '상태', '모델', '학습개월', 'ms', '오류']
+STORE_PREFIX = 'batch/'   # 예측 저장소 시리즈 이름 앞에 붙임 (운영 시리즈 CRE_내부 / 표본감시 run 과 섞이지 않게)
+
+
+# 1. wide → long 변환 (년월 x 시리즈 컬럼 엑셀 → series_id, ds, y)
+def to_long(df, value_cols, ds='ds'):
+    long_df = df.melt(id_vars=[ds], value_vars=list(value_cols), var_name='series_id', value_name='y')
+    return long_df.rename(columns={ds: 'ds'}).sort_values(['series_id', 'ds']).reset_index(drop=True)
+
+
+# 2. 시리즈 하나 예측
+def _future_frame(series_df, regressors, periods):
+    """
+    y 가 있는 달은 학습, 마지막 관측 이후 달은 예측 구간.
+    회귀변수가 없으면 예측 구간이 periods 개월이 되도록 월을 채우고,
+    회귀변수가 있으면 테이블에 들어있는 미래 행(회귀변수 예측값 포함)을 그대로 사용합니다.
+    """
+    frame = series_df[['ds', 'y'] + regressors].sort_values('ds').reset_index(drop=True)
+    last_observed = frame.loc[frame['y'].notna(), 'ds'].max()
+    n_ahead = int((frame['ds'] > last_observed).sum())
+    if not regressors and n_ahead < periods:
+        extra = pd.date_range(frame['ds'].max(), periods=periods - n_ahead + 1, freq='MS')[1:]
+        frame = pd.concat([frame, pd.DataFrame({'ds': extra})], ignore_index=True)
+    return frame
+
+
+def forecast_series(series_df, regressors=(), periods=3, prophet_kwargs=None, fit_kwargs=None,
+                    fallback='negbin_glm'):
+    """
+    반환: (결과 DataFrame, 사용한 모델 이름)  결과 컬럼은 RESULT_COLS 에서 series_id 제외
+    """
+    regressors = list(regressors)
+    frame = _future_frame(series_df, regressors, periods)
+    train_df = frame.dropna(subset=['y'])
+
+    try:
+        model = fit_prophet(train_df, regressors, prophet_kwargs, fit_kwargs)
+        forecast = model.predict(frame[['ds'] + regressors])[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+        model_name = 'prophet'
+    except Exception:
+        if not fallback:
+            raise
+        forecast = BASELINES[fallback](train_df, frame, regressors,
+                                       (prophet_kwargs or {}).get('interval_width', 0.8))
+        model_name = fallback
+
+    result = frame[['ds', 'y']].assign(
+        yhat=forecast['yhat'].to_numpy(),
+        yhat_lower=forecast['yhat_lower'].to_numpy(),
+        yhat_upper=forecast['yhat_upper'].to_numpy(),
+    )
+    # 경보 기준은 CRE_prophet.py / 표본감시_prophet.py 와 동일 (실제값 > 예측상한)
+    result['경보'] = (result['y'] > result['yhat_upper']).fillna(False).astype(bool)
+    result['모델'] = model_name
+    return result, model_name
+
+
+# 3. worker: chunk 안의 시리즈를 순서대로 처리 (시리즈별 실패 격리)
+_shared = {}
+
+
+def _init_worker(regressors, periods, prophet_kwargs, fit_kwargs, fallback):
+    quiet_prophet()
+    _shared.update(regressors=regressors, periods=periods, prophet_kwargs=prophet_kwargs,
+                   fit_kwargs=fit_kwargs, fallback=fallback)
+
+
+def _run_chunk(chunk_df):
+    results, statuses = [], []
+    for series_id, series_df in chunk_df.groupby('series_id', sort=False):
+        start = time.perf_counter()
+        status = {'series_id': series_id, '학습개월': int(series_df['y'].notna().sum())}
+        try:
+            result, model_name = forecast_series(
+                series_df, _shared['regressors'], _shared['periods'], _shared['prophet_kwargs'],
+                _shared['fit_kwargs'], _shared['fallback']
+            )
+            results.append(result.assign(series_id=series_id))
+            status.update({'상태': 'ok' if model_name == 'prophet' else 'fallback', '모델': model_name, '오류': ''})
+        except Exception as e:
+            status.update({'상태': 'failed', '모델': '', '오류': f'{type(e).__name__}: {e}'})
+        status['ms'] = (time.perf_counter() - start) * 1000
+        statuses.append(status)
+    return results, statuses
+
+
+# 4. 일괄 예측
+def batch_forecast(long_df, regressors=(), periods=3, prophet_kwargs=None, fit_kwargs=None,
+                   fallback='negbin_glm', chunk_size=8, max_workers=None):
+    """
+    long_df: series_id, ds, y (+ 회귀변수 컬럼). 시리즈마다 y 가 최소 2개월 이상 있어야 학습됩니다.
+    반환: (결과 DataFrame, 상태 DataFrame, 처리 요약 dict)
+    """
+    regressors = list(regressors)
+    long_df = long_df.copy()
+    long_df['ds'] = pd.to_datetime(long_df['ds'])
+
+    series_ids = long_df['series_id'].unique()
+    chunks = [long_df[long_df['series_id'].isin(ids)]
+              for ids in np.array_split(series_ids, max(1, int(np.ceil(len(series_ids) / chunk_size))))]
+
+    start = time.perf_counter()
+    results, statuses = [], []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(regressors, periods, prophet_kwargs, fit_kwargs, fallback)) as pool:
+        futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            chunk_results, chunk_statuses = future.result()
+            results.extend(chunk_results)
+            statuses.extend(chunk_statuses)
+    elapsed = time.perf_counter() - start
+
+    result_df = (pd.concat(results, ignore_index=True)[RESULT_COLS] if results
+                 else pd.DataFrame(columns=RESULT_COLS))
+    result_df = result_df.sort_values(['series_id', 'ds']).reset_index(drop=True)
+    status_df = pd.DataFrame(statuses, columns=STATUS_COLS).sort_values('series_id').reset_index(drop=True)
+
+    summary = {
+        '시리즈 수': len(series_ids),
+        '성공': int((status_df['상태'] == 'ok').sum()),
+        '대체모델': int((status_df['상태'] == 'fallback').sum()),
+        '실패': int((status_df['상태'] == 'failed').sum()),
+        '경과(초)': elapsed,
+        '시리즈/분': len(series_ids) / elapsed * 60 if elapsed > 0 else np.nan,
+    }
+    return result_df, status_df, summary
+
+
+if __name__ == '__main__':
+    from forecast_store import ForecastStore
+
+    quiet_prophet()
+
+    # 두 FULL 파일의 건수 컬럼을 모두 개별 시리즈로
+    frames = []
+    for file_path in ["CRE_FULL.xlsx", "표본감시_FULL.xlsx"]:
+        df = pd.read_excel(file_path)
+        df['ds'] = pd.to_datetime(df['년월'])
+        value_cols = [col for col in df.columns if col not in ('년월', 'ds')]
+        frames.append(to_long(df, value_cols))
+    long_df = pd.concat(frames, ignore_index=True)
+
+    result_df, status_df, summary = batch_forecast(long_df, periods=3, fit_kwargs={'algorithm': 'LBFGS'})
+
+    print("📊 다중 시리즈 예측 요약:")
+    for key, value in summary.items():
+        print(f"  {key}: {value:.1f}" if isinstance(value, float) else f"  {key}: {value}")
+    failed = status_df[status_df['상태'] != 'ok']
+    if len(failed):
+        print("\n⚠️ Prophet 외 결과 / 실패 시리즈:")
+        print(failed.to_string(index=False))
+
+    result_df.to_excel("다중시리즈_예측결과.xlsx", index=False)
+
+    # 예측 저장소에 시리즈별 run 추가 (batch/<컬럼명>: 운영 시리즈의 최신 run 을 덮지 않음)
+    # 설정은 시리즈마다 실제로 쓴 모델 (Prophet 실패 → 기준 모델이면 fallback 이름도 기록)
+    store = ForecastStore()
+    status_by_series = status_df.set_index('series_id')
+    for series_id, series_result in result_df.groupby('series_id'):
+        status = status_by_series.loc[series_id]
+        config = {'model': status['모델'], 'batch': True}
+        if status['모델'] == 'prophet':
+            config['fit'] = {'algorithm': 'LBFGS'}
+        if status['상태'] == 'fallback':
+            config['fallback'] = status['모델']
+        store.append_run(STORE_PREFIX + series_id, series_result, config=config)
+    print(f"\n💾 결과 저장: 다중시리즈_예측결과.xlsx, 예측 저장소 {result_df['series_id'].nunique()}개 시리즈")
@@ -0,0 +1,192 @@
+# 예측/경보 결과 버전 저장소 (SQLite, 추가 전용)
+# - 실행할 때마다 덮어쓰던 *_경보결과.xlsx 대신 (시리즈, run_id, 설정 해시, ds) 단위로 누적 저장
+# - run 하나는 트랜잭션 하나로 기록되므로 중간에 실패하면 아무것도 남지 않음
+# - 조회: 최신 run / 특정 시점 기준(as-of) run / ds 구간만 잘라서 읽기
+
+import hashlib
+import json
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+STORE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'forecast_store.sqlite')
+)
+
+RESULT_COLS = ['ds', 'y', 'yhat', 'yhat_lower', 'yhat_upper', '경보']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    series      TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    config_json TEXT NOT NULL,
+    created_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_series ON runs (series, created_at);
+
+CREATE TABLE IF NOT EXISTS forecasts (
+    series     TEXT NOT NULL,
+    run_id     TEXT NOT NULL REFERENCES runs (run_id),
+    ds         TEXT NOT NULL,
+    y          REAL,
+    yhat       REAL,
+    yhat_lower REAL,
+    yhat_upper REAL,
+    alarm      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (series, run_id, ds)
+);
+"""
+
+
+# 1. 설정 해시 (같은 설정이면 같은 해시)
+def config_hash(config):
+    payload = json.dumps(config or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class ForecastStore:
+    """
+    store = ForecastStore()
+    run_id = store.append_run('CRE_내부', forecast_df[RESULT_COLS], config={'model': 'prophet', ...})
+    latest_df = store.latest('CRE_내부', start='2023-01-01')
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """
+        with 블록이 끝나면 commit(예외 시 rollback) 후 연결을 닫음 (sqlite3 연결의 with 는 닫지 않음)
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # 2. run 추가 (원자적)
+    def append_run(self, series, forecast_df, config=None, run_id=None, created_at=None):
+        """
+        forecast_df: ds, y, yhat, yhat_lower, yhat_upper, 경보 컬럼 (y/경보 는 없어도 됨)
+        반환: run_id
+        """
+        run_id = run_id or uuid.uuid4().hex[:12]
+        created_at = created_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+
+        df = forecast_df.copy()
+        for col in ['y', 'yhat', 'yhat_lower', 'yhat_upper']:
+            if col not in df:
+                df[col] = None
+        alarm = df['경보'].fillna(False).astype(bool).astype(int) if '경보' in df else 0
+        rows = pd.DataFrame({
+            'series': series,
+            'run_id': run_id,
+            'ds': pd.to_datetime(df['ds']).dt.strftime('%Y-%m-%d'),
+            'y': df['y'], 'yhat': df['yhat'], 'yhat_lower': df['yhat_lower'], 'yhat_upper': df['yhat_upper'],
+            'alarm': alarm,
+        })
+        rows = rows.astype(object).where(rows.notna(), None)
+
+        with self._connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'INSERT INTO runs (run_id, series, config_hash, config_json, created_at) VALUES (?, ?, ?, ?, ?)',
+                (run_id, series, config_hash(config),
+                 json.dumps(config or {}, sort_keys=True, ensure_ascii=False, default=str), created_at)
+            )
+            conn.executemany(
+                'INSERT INTO forecasts (series, run_id, ds, y, yhat, yhat_lower, yhat_upper, alarm) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                rows.itertuples(index=False, name=None)
+            )
+        return run_id
+
+    # 3. run 목록
+    def runs(self, series=None):
+        query = 'SELECT run_id, series, config_hash, config_json, created_at FROM runs'
+        params = []
+        if series:
+            query += ' WHERE series = ?'
+            params.append(series)
+        with self._connection() as conn:
+            return pd.read_sql_query(query + ' ORDER BY series, created_at', conn, params=params)
+
+    def list_series(self):
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute('SELECT DISTINCT series FROM runs ORDER BY series')]
+
+    def latest_run(self, series, as_of=None, config=None):
+        """
+        최근 run 의 정보 {'run_id', 'config', 'created_at'}. 없으면 None.
+        """
+        with self._connection() as conn:
+            run_id = self._find_run(conn, series, as_of, config)
+            if run_id is None:
+                return None
+            config_json, created_at = conn.execute(
+                'SELECT config_json, created_at FROM runs WHERE run_id = ?', (run_id,)
+            ).fetchone()
+        return {'run_id': run_id, 'config': json.loads(config_json), 'created_at': created_at}
+
+    # 4. 조회
+    def _find_run(self, conn, series, as_of=None, config=None):
+        query = 'SELECT run_id FROM runs WHERE series = ?'
+        params = [series]
+        if as_of is not None:
+            query += ' AND created_at <= ?'
+            params.append(pd.to_datetime(as_of).strftime('%Y-%m-%d %H:%M:%S.%f'))
+        if config is not None:
+            query += ' AND config_hash = ?'
+            params.append(config if isinstance(config, str) else config_hash(config))
+        row = conn.execute(query + ' ORDER BY created_at DESC LIMIT 1', params).fetchone()
+        return row[0] if row else None
+
+    def read_run(self, series, run_id, start=None, end=None):
+        """
+        run 하나의 결과를 *_경보결과.xlsx 와 같은 컬럼(ds, y, yhat, yhat_lower, yhat_upper, 경보)으로 반환합니다.
+        start/end 를 주면 그 ds 구간만 읽습니다.
+        """
+        query = ('SELECT ds, y, yhat, yhat_lower, yhat_upper, alarm AS "경보" FROM forecasts '
+                 'WHERE series = ? AND run_id = ?')
+        params = [series, run_id]
+        if start is not None:
+            query += ' AND ds >= ?'
+            params.append(pd.to_datetime(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            query += ' AND ds <= ?'
+            params.append(pd.to_datetime(end).strftime('%Y-%m-%d'))
+        with self._connection() as conn:
+            df = pd.read_sql_query(query + ' ORDER BY ds', conn, params=params)
+        df['ds'] = pd.to_datetime(df['ds'])
+        df['경보'] = df['경보'].astype(bool)
+        return df
+
+    def latest(self, series, start=None, end=None, config=None):
+        """
+        가장 최근 run (config 를 주면 그 설정으로 실행한 것 중 최근) 결과. 없으면 빈 DataFrame.
+        """
+        return self.as_of(series, None, start=start, end=end, config=config)
+
+    def as_of(self, series, as_of, start=None, end=None, config=None):
+        """
+        as_of 시각까지 기록된 run 중 가장 최근 run 결과 ("그때 무엇을 예측했었나").
+        """
+        with self._connection() as conn:
+            run_id = self._find_run(conn, series, as_of, config)
+        if run_id is None:
+            return pd.DataFrame(columns=RESULT_COLS)
+        return self.read_run(series, run_id, start, end)
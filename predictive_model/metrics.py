@@ -0,0 +1,117 @@
+# 예측 성능지표 공용 모듈
+# - MAE, RMSE, MAPE, sMAPE, MASE, 구간 포함률(coverage)
+# - 여러 시리즈 x 여러 평가 구간을 groupby 한 번으로 계산 (행 단위 오차를 먼저 배열로 만든 뒤 그룹 평균)
+# - 실제값 0 인 달: MAPE 는 해당 달 제외, sMAPE 는 실제값/예측값 모두 0 이면 0
+
+import numpy as np
+import pandas as pd
+
+METRIC_COLS = ['MAE', 'RMSE', 'MAPE', 'sMAPE', 'MASE', 'coverage']
+
+
+# 1. 배열 하나에 대한 지표 (백테스트 fold 등)
+def score_errors(y_true, y_pred):
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    err = y_true - y_pred
+    nonzero = y_true != 0
+
+    mae = np.mean(np.abs(err))
+    rmse = np.sqrt(np.mean(err ** 2))
+    mape = np.mean(np.abs(err[nonzero] / y_true[nonzero])) * 100 if nonzero.any() else np.nan
+    return {'MAE': mae, 'RMSE': rmse, 'MAPE': mape}
+
+
+# 2. 평가 구간 붙이기 (구간이 겹치면 행이 구간 수만큼 복제됨)
+def with_windows(df, windows, ds='ds'):
+    """
+    windows: {라벨: (시작, 끝)} (양 끝 포함). 각 행이 속한 구간마다 한 행씩 'window' 컬럼을 붙여 반환합니다.
+    """
+    labels = list(windows)
+    starts = pd.to_datetime([windows[k][0] for k in labels]).values
+    ends = pd.to_datetime([windows[k][1] for k in labels]).values
+    values = df[ds].values[:, None]
+
+    rows, cols = np.nonzero((values >= starts[None, :]) & (values <= ends[None, :]))
+    out = df.iloc[rows].copy()
+    out['window'] = np.asarray(labels, dtype=object)[cols]
+    return out.reset_index(drop=True)
+
+
+def year_windows(ds):
+    """
+    ds 에 들어있는 연도별 구간 {연도: (1/1, 12/31)}
+    """
+    years = sorted(pd.DatetimeIndex(ds).year.unique())
+    return {yr: (f'{yr}-01-01', f'{yr}-12-31') for yr in years}
+
+
+# 3. MASE 분모: 시리즈별 계절 naive(lag=season) 평균 절대오차 (짧으면 lag=1)
+def naive_scale(history, series=None, y='y', ds='ds', season=12):
+    keys = [series] if series else []
+    history = history.dropna(subset=[y]).sort_values(keys + [ds])
+    groups = history.groupby(keys)[y] if keys else history[y]
+
+    def scale(values):
+        values = np.asarray(values, dtype=float)
+        lag = season if len(values) > season else 1
+        diffs = np.abs(values[lag:] - values[:-lag])
+        return diffs.mean() if len(diffs) else np.nan
+
+    if keys:
+        return groups.apply(scale)
+    return scale(groups)
+
+
+# 4. 그룹별 지표
+def compute_metrics(df, by=('window',), series=None, y='y', yhat='yhat', lower='yhat_lower',
+                    upper='yhat_upper', history=None, season=12):
+    """
+    df 의 행마다 오차를 한 번에 계산한 뒤 by 컬럼 기준 그룹 평균으로 지표를 만듭니다.
+    series: 시리즈 구분 컬럼 (MASE 분모를 시리즈별로 계산, by 에 자동 포함)
+    history: MASE 분모 계산용 실제값 (기본: df 자신)
+    y 또는 yhat 이 결측인 행은 제외합니다.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    if series and series not in by:
+        by = [series] + by
+
+    data = df.dropna(subset=[y, yhat])
+    y_true = data[y].to_numpy(dtype=float)
+    y_pred = data[yhat].to_numpy(dtype=float)
+    err = y_true - y_pred
+    abs_err = np.abs(err)
+    denom = np.abs(y_true) + np.abs(y_pred)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rows = pd.DataFrame({
+            'abs_err': abs_err,
+            'sq_err': err ** 2,
+            'ape': np.where(y_true != 0, abs_err / np.abs(y_true), np.nan),
+            'sape': np.where(denom != 0, 2 * abs_err / denom, 0.0),
+        }, index=data.index)
+    if lower in data and upper in data:
+        rows['inside'] = ((y_true >= data[lower].to_numpy()) & (y_true <= data[upper].to_numpy())).astype(float)
+    else:
+        rows['inside'] = np.nan
+    for col in by:
+        rows[col] = data[col].to_numpy()
+
+    grouped = rows.groupby(by, sort=True)
+    result = grouped[['abs_err', 'sq_err', 'ape', 'sape', 'inside']].mean()
+    result = pd.DataFrame({
+        'MAE': result['abs_err'],
+        'RMSE': np.sqrt(result['sq_err']),
+        'MAPE': result['ape'] * 100,
+        'sMAPE': result['sape'] * 100,
+        'coverage': result['inside'],
+        'n': grouped.size(),
+    })
+
+    scale = naive_scale(history if history is not None else df, series=series, y=y, season=season)
+    if series:
+        result['MASE'] = result['MAE'] / result.index.get_level_values(series).map(scale).to_numpy()
+    else:
+        result['MASE'] = result['MAE'] / scale
+
+    return result[METRIC_COLS + ['n']].reset_index()
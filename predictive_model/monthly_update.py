@@ -0,0 +1,247 @@
+# 월별 증분 업데이트 (새 달 1개 추가 → 경보 판정)
+# - 예측 저장소(forecast_store.py)의 최신 run 에 새 달 실제값을 넣고, 저장된 예측상한과 비교해 바로 경보 판정
+# - 다시 학습하는 경우만 모델 fit:
+#   1) 잔차 drift: 마지막 학습 이후 관측된 달들의 표준화 잔차 평균이 기준을 넘음
+#   2) 일정: 마지막 학습 후 refit_every 개월이 지남
+#   3) 저장된 예측 구간이 끝남 (새 달 또는 그 다음 달 예측값이 없음)
+# - 그 외에는 저장된 예측을 그대로 이어 쓰는(roll forward) 새 run 을 추가 → 학습 없이 수 초 안에 경보
+# - 재학습은 저장된 run 과 같은 모델: 외부 변수를 쓰는 운영 시리즈(CRE_내부, 표본감시)는 FULL 엑셀에서
+#   regressors.build_model_frame 으로 {var}_예측 을 다시 만들고 tuning.py 의 시리즈별 설정으로 학습
+#   (외부 변수는 FULL 엑셀 마지막 행 이후 새 달 + periods 까지 월초 기준으로 예측, 새 예측 구간 뒤의 저장된 행은 유지)
+# - 새 달 예측상한이 끝내 없으면 기준 모델(negbin_glm)로 판정하고, 그것도 못 하면 오류 (경보 없음으로 저장하지 않음)
+# - 새 run 은 대시보드 / API 가 읽는 alarm_dashboard/*_경보결과.xlsx 에도 내보냄 (경보해석은 기존 파일 값 유지)
+# - python monthly_update.py CRE_내부 2024-01 25
+
+import os
+import sys
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from forecast_store import RESULT_COLS, ForecastStore
+
+DRIFT_THRESHOLD = 1.0
+REFIT_EVERY = 6
+FALLBACK_MODEL = 'negbin_glm'
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DASHBOARD_DIR = os.path.abspath(os.path.join(BASE_DIR, '..', 'alarm_dashboard'))
+
+# 운영 시리즈 입력 (CRE_prophet.py / 표본감시_prophet.py 와 같은 파일, 같은 컬럼 이름) + 대시보드 결과 파일
+SERIES_SOURCES = {
+    'CRE_내부': {'file': 'CRE_FULL.xlsx', 'columns': {
+        'CRE_내부': 'y', 'CRE_전국': 'nationwide_cre', 'CRE_충북': 'chungbuk_cre', 'CRE_사망': 'cre_deaths'},
+        'result_file': 'CRE(병원내부)_경보결과.xlsx'},
+    '표본감시': {'file': '표본감시_FULL.xlsx', 'columns': {'표본감시': 'y'},
+             'result_file': '표본감시(병원내부)_경보결과.xlsx'},
+}
+
+
+# 1. 재학습 필요 여부
+def standardized_residuals(run_df, fit_ds, interval_width=0.8):
+    """
+    마지막 학습 시점(fit_ds) 이후 관측된 달의 (y - yhat) / 예측 표준편차.
+    예측 표준편차는 예측구간 폭에서 역산 (폭 = 2 * z * sigma)
+    """
+    out_of_sample = run_df[(run_df['ds'] > fit_ds) & run_df['y'].notna()]
+    z = NormalDist().inv_cdf(0.5 + interval_width / 2)
+    sigma = (out_of_sample['yhat_upper'] - out_of_sample['yhat_lower']) / (2 * z)
+    return ((out_of_sample['y'] - out_of_sample['yhat']) / sigma.replace(0, np.nan)).dropna()
+
+
+def refit_reason(run_df, fit_ds, month, drift_threshold=DRIFT_THRESHOLD, refit_every=REFIT_EVERY,
+                 interval_width=0.8):
+    """
+    다시 학습해야 하면 이유(문자열), 아니면 None
+    """
+    next_month = month + pd.DateOffset(months=1)
+    ahead = run_df.dropna(subset=['yhat'])
+    if not (ahead['ds'] == month).any() or not (ahead['ds'] == next_month).any():
+        return '예측 구간 종료'
+
+    months_since_fit = (month.year - fit_ds.year) * 12 + (month.month - fit_ds.month)
+    if refit_every and months_since_fit >= refit_every:
+        return f'정기 재학습 ({months_since_fit}개월 경과)'
+
+    resid = standardized_residuals(run_df, fit_ds, interval_width)
+    if len(resid) >= 2 and abs(resid.mean()) > drift_threshold:
+        return f'잔차 drift (표준화 잔차 평균 {resid.mean():.2f})'
+    return None
+
+
+# 2. 기본 재학습: 저장된 run 과 같은 외부 변수 + tuning.py 의 시리즈별 설정 (Prophet 실패 시 기준 모델)
+def regressor_frame(series, history_df, external_vars, periods=3):
+    """
+    FULL 엑셀의 외부 변수 + 저장소의 실제값(history_df, 새 달 포함)으로 ds, y, {var}_예측 프레임을 만듦.
+    외부 변수 예측은 월초(MS) 기준으로 마지막 관측월 + periods 까지 연장 (새 달이 FULL 엑셀보다 뒤여도 {var}_예측 이 채워짐)
+    """
+    from regressors import build_model_frame
+
+    source = SERIES_SOURCES.get(series)
+    if source is None:
+        raise ValueError(f"{series} 는 외부 변수 입력 파일이 등록되지 않아 재학습할 수 없습니다 (SERIES_SOURCES).")
+    df = pd.read_excel(os.path.join(BASE_DIR, source['file']))
+    df['ds'] = pd.to_datetime(df['년월'])
+    df = df.rename(columns=source['columns']).drop(columns='y')
+    df = pd.merge(df, history_df[['ds', 'y']], on='ds', how='outer')
+
+    horizon_end = history_df['ds'].max() + pd.DateOffset(months=periods)
+    horizon = pd.DataFrame({'ds': pd.date_range(df['ds'].min(), horizon_end, freq='MS')})
+    df = pd.merge(df, horizon, on='ds', how='outer').sort_values('ds').reset_index(drop=True)
+
+    # 외부 변수마다 마지막 값 이후로 예측이 필요한 개월 수 (가장 먼저 끊긴 변수 기준)
+    ext_last = min(df.loc[df[var].notna(), 'ds'].max() for var in external_vars)
+    ahead = max((horizon_end.year - ext_last.year) * 12 + (horizon_end.month - ext_last.month), 0)
+    return build_model_frame(df, external_vars, periods=ahead, freq='MS')
+
+
+def default_refit(series, history_df, periods=3, config=None):
+    """
+    history_df: ds, y (새 달까지). config: 저장된 run 의 설정 ('regressors' 가 있으면 같은 외부 변수로 학습)
+    반환: (ds / yhat / yhat_lower / yhat_upper 예측, 실제로 학습한 설정 {'model', 'params', 'regressors'})
+    """
+    from backtest import quiet_prophet
+    from baselines import fit_predict_with_fallback
+    from tuning import load_best_params
+
+    quiet_prophet()
+    params = load_best_params(series)
+    regressors = list((config or {}).get('regressors') or [])
+    last_observed = history_df['ds'].max()
+
+    if regressors:
+        external_vars = [name[:-len('_예측')] for name in regressors]
+        frame = regressor_frame(series, history_df, external_vars, periods)
+        frame = frame.dropna(subset=regressors)
+        train_df = frame[frame['y'].notna() & (frame['ds'] <= last_observed)]
+        future_df = frame[frame['ds'] <= last_observed + pd.DateOffset(months=periods)]
+    else:
+        train_df = history_df
+        future_ds = pd.date_range(last_observed, periods=periods + 1, freq='MS')[1:]
+        future_df = pd.DataFrame({'ds': pd.concat([history_df['ds'], pd.Series(future_ds)], ignore_index=True)})
+
+    forecast, model_name = fit_predict_with_fallback(
+        train_df, future_df, regressors, prophet_kwargs=params, interval_width=params.get('interval_width', 0.8)
+    )
+    return forecast, {'model': model_name, 'params': params, 'regressors': regressors}
+
+
+# 3. 대시보드 결과 파일 내보내기
+def export_result(series, run_df, folder=DASHBOARD_DIR):
+    """
+    run 결과를 대시보드가 읽는 *_경보결과.xlsx 로 저장 (등록되지 않은 시리즈는 None).
+    기존 파일의 경보해석은 같은 달에 그대로 붙임. 임시 파일에 다 쓴 뒤 교체 → 대시보드는 완성된 파일만 읽음
+    """
+    source = SERIES_SOURCES.get(series)
+    if source is None or not os.path.isdir(folder):
+        return None
+    path = os.path.join(folder, source['result_file'])
+
+    out_df = run_df[RESULT_COLS].copy()
+    if os.path.exists(path):
+        previous = pd.read_excel(path)
+        if '경보해석' in previous.columns:
+            previous['ds'] = pd.to_datetime(previous['ds'])
+            out_df = pd.merge(out_df, previous[['ds', '경보해석']], on='ds', how='left')
+
+    tmp_path = f'{os.path.splitext(path)[0]}.{os.getpid()}.tmp.xlsx'   # *_경보결과.xlsx 패턴에 걸리지 않는 이름
+    out_df.to_excel(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+# 4. 월별 업데이트
+def update_month(series, ds, y, store=None, refit_fn=None, force_refit=False, periods=3,
+                 drift_threshold=DRIFT_THRESHOLD, refit_every=REFIT_EVERY, export=True):
+    """
+    series 의 ds 달 실제값 y 를 추가하고 경보를 판정합니다.
+    refit_fn(series, history_df, periods, config) → (예측, 학습한 설정) 으로 재학습 방법을 바꿀 수 있음
+    export=True 이면 대시보드 결과 파일(*_경보결과.xlsx)도 새 run 으로 갱신
+    새 달 예측상한이 없으면 FALLBACK_MODEL 로 새 달만 예측해 판정 (설정의 'month_model' 에 기록)
+    반환: {'ds', 'y', 'yhat_upper', '경보', 'mode' (roll/refit), 'reason', 'run_id', 'result_file'}
+    """
+    store = store or ForecastStore()
+    month = pd.Timestamp(ds).to_period('M').to_timestamp()
+
+    parent = store.latest_run(series)
+    if parent is None:
+        raise ValueError(f"예측 저장소에 {series} 기록이 없습니다. 먼저 예측 스크립트를 실행하세요.")
+    run_df = store.read_run(series, parent['run_id'])
+    config = {k: v for k, v in parent['config'].items() if k != 'month_model'}   # 지난 달 판정 모델은 물려받지 않음
+    interval_width = config.get('params', {}).get('interval_width', 0.8)
+
+    # 마지막 학습 시점: 기록이 없으면(예측 스크립트가 만든 run) 해당 run 의 마지막 관측월
+    fit_ds = pd.Timestamp(config.get('fit_ds') or run_df.loc[run_df['y'].notna(), 'ds'].max())
+
+    # 새 달 실제값 반영 (저장된 행이 없으면 추가)
+    if (run_df['ds'] == month).any():
+        run_df.loc[run_df['ds'] == month, 'y'] = float(y)
+    else:
+        run_df = pd.concat([run_df, pd.DataFrame({'ds': [month], 'y': [float(y)]})], ignore_index=True)
+    run_df = run_df.sort_values('ds').reset_index(drop=True)
+
+    reason = '강제 재학습' if force_refit else refit_reason(
+        run_df, fit_ds, month, drift_threshold, refit_every, interval_width)
+
+    if reason:
+        history_df = run_df.loc[run_df['y'].notna(), ['ds', 'y']]
+        forecast, fitted = (refit_fn or default_refit)(series, history_df, periods, config)
+        # 새 달까지는 저장된 run 의 예측 / 경보를 그대로 둠 (재학습한 in-sample 값으로 지난 경보가 바뀌지 않게)
+        # 새 모델 예측은 다음 달부터만 사용. 새 달 예측이 저장돼 있지 않을 때(예측 구간 종료)만 새 모델 값으로 판정
+        cols = ['yhat', 'yhat_lower', 'yhat_upper']
+        kept = run_df[run_df['ds'] <= month].copy()
+        refit_df = forecast.set_index('ds')[cols]
+        if month in refit_df.index and kept.loc[kept['ds'] == month, 'yhat_upper'].isna().all():
+            kept.loc[kept['ds'] == month, cols] = refit_df.loc[month].to_numpy()
+        ahead = pd.merge(refit_df[refit_df.index > month].reset_index(),
+                         run_df.loc[run_df['ds'] > month, ['ds', 'y']], on='ds', how='left')
+        # 새 모델이 예측하지 않은 달(새 예측 구간 뒤)은 저장된 run 의 행을 그대로 둠 (대시보드 예측 구간이 줄지 않게)
+        beyond = run_df[(run_df['ds'] > month) & ~run_df['ds'].isin(refit_df.index)]
+        run_df = pd.concat([kept, ahead, beyond], ignore_index=True)
+        new_config = {**config, **fitted, 'mode': 'refit', 'reason': reason,
+                      'fit_ds': month.strftime('%Y-%m-%d'), 'parent': parent['run_id']}
+    else:
+        new_config = {**config, 'mode': 'roll', 'reason': '', 'fit_ds': fit_ds.strftime('%Y-%m-%d'),
+                      'parent': parent['run_id']}
+
+    # 새 달 예측상한이 없으면(재학습 결과에 새 달이 빠짐) 경보 없음으로 두지 않고 기준 모델로 새 달만 예측
+    train_df = run_df.loc[(run_df['ds'] < month) & run_df['y'].notna(), ['ds', 'y']]
+    if run_df.loc[run_df['ds'] == month, 'yhat_upper'].isna().all() and len(train_df) >= 12:
+        from baselines import BASELINES
+
+        fallback = BASELINES[FALLBACK_MODEL](train_df, pd.DataFrame({'ds': [month]}), (), interval_width)
+        run_df.loc[run_df['ds'] == month, ['yhat', 'yhat_lower', 'yhat_upper']] = (
+            fallback[['yhat', 'yhat_lower', 'yhat_upper']].to_numpy())
+        new_config['month_model'] = FALLBACK_MODEL
+        print(f"⚠️ {month.strftime('%Y-%m')} 예측상한이 없어 {FALLBACK_MODEL} 로 판정")
+    if run_df.loc[run_df['ds'] == month, 'yhat_upper'].isna().all():
+        raise ValueError(f"{series} {month.strftime('%Y-%m')} 예측상한을 만들 수 없어 경보를 판정하지 않았습니다.")
+
+    # 경보 기준은 예측 스크립트와 동일 (실제값 > 예측상한). 새 달과 새로 생긴 행만 판정, 지난 달은 저장된 판정 유지
+    judged = (run_df['y'] > run_df['yhat_upper']).fillna(False)
+    keep = (run_df['ds'] != month) & run_df['경보'].notna()
+    run_df['경보'] = run_df['경보'].where(keep, judged).astype(bool)
+    run_id = store.append_run(series, run_df[RESULT_COLS], config=new_config)
+    result_file = export_result(series, run_df) if export else None
+
+    row = run_df[run_df['ds'] == month].iloc[0]
+    return {'ds': month, 'y': float(y), 'yhat_upper': row['yhat_upper'], '경보': bool(row['경보']),
+            'mode': new_config['mode'], 'reason': reason or '', 'run_id': run_id, 'result_file': result_file}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4:
+        print("사용법: python monthly_update.py <시리즈> <YYYY-MM> <실제값>")
+        sys.exit(1)
+
+    result = update_month(sys.argv[1], sys.argv[2], float(sys.argv[3]))
+    month_label = result['ds'].strftime('%Y-%m')
+    if result['경보']:
+        print(f"📢 경보 발생: {month_label} - 실제값 {result['y']:.1f} > 예측상한 {result['yhat_upper']:.1f}")
+    else:
+        print(f"✅ 정상: {month_label} - 실제값 {result['y']:.1f} <= 예측상한 {result['yhat_upper']:.1f}")
+    mode = '재학습' if result['mode'] == 'refit' else '저장된 예측 이어쓰기'
+    print(f"💾 {mode}{' (' + result['reason'] + ')' if result['reason'] else ''}: run_id={result['run_id']}")
+    if result['result_file']:
+        print(f"💾 대시보드 결과 갱신: {result['result_file']}")
@@ -0,0 +1,199 @@
+# 파이프라인 단계별 소요시간/메모리 측정
+# - 전처리/카운트/예측 스크립트의 단계(load, parse, explode, fit, predict, plot, export ...)마다
+#   경과시간, CPU 시간, 프로세스 최대 메모리(peak RSS)를 기록하고 실행마다 JSON 보고서를 남김
+# - 선택: 단계별 cProfile(상위 함수 + .prof 파일), tracemalloc(단계 안 Python 할당 최대치)
+#   → 환경변수 PIPELINE_PROFILE=cprofile,tracemalloc 또는 StageProfiler(profile=True, trace_memory=True)
+# - 보고서 저장 시 같은 실행 이름의 직전 보고서와 단계별 시간을 비교해 출력 (실행 간 성능 저하 확인)
+#
+# 사용 예 (스크립트 구조를 바꾸지 않도록 mark 로 다음 단계 시작 = 이전 단계 종료):
+#   profiler = StageProfiler('CRE_prophet')
+#   profiler.mark('load')
+#   ...
+#   profiler.mark('fit')
+#   ...
+#   profiler.save()
+
+import cProfile
+import glob
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+REPORT_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'profile_reports')
+)
+TOP_FUNCTIONS = 15
+
+
+# 1. 프로세스 최대 메모리 (MB)
+def peak_rss_mb():
+    """
+    현재까지 프로세스 최대 RSS. Unix 는 resource, Windows 는 psutil(설치된 경우)로 측정, 둘 다 없으면 None.
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def _env_options():
+    options = {opt.strip().lower() for opt in os.environ.get('PIPELINE_PROFILE', '').split(',')}
+    return 'cprofile' in options, 'tracemalloc' in options
+
+
+# 2. 단계 측정기
+class StageProfiler:
+    def __init__(self, run_name, profile=None, trace_memory=None, report_dir=REPORT_DIR, top=TOP_FUNCTIONS):
+        env_profile, env_trace = _env_options()
+        self.run_name = run_name
+        self.profile = env_profile if profile is None else profile
+        self.trace_memory = env_trace if trace_memory is None else trace_memory
+        self.report_dir = report_dir
+        self.top = top
+        self.started_at = datetime.now()
+        self.stages = []
+        self._current = None
+        self._start = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # 2-1. 단계 시작/종료
+    def start(self, name):
+        if self._current is not None:
+            self.stop()
+        stage = {'name': name, '_wall': time.perf_counter(), '_cpu': time.process_time()}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            stage['_traced'] = tracemalloc.get_traced_memory()[0]
+        if self.profile:
+            stage['_profiler'] = cProfile.Profile()
+            stage['_profiler'].enable()
+        self._current = stage
+
+    def stop(self):
+        stage = self._current
+        if stage is None:
+            return None
+        self._current = None
+
+        profiler = stage.pop('_profiler', None)
+        if profiler is not None:
+            profiler.disable()
+        record = {
+            'name': stage['name'],
+            'wall_s': time.perf_counter() - stage.pop('_wall'),
+            'cpu_s': time.process_time() - stage.pop('_cpu'),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            traced = stage.pop('_traced')
+            record['py_alloc_peak_mb'] = (peak - traced) / (1024 * 1024)
+            record['py_alloc_net_mb'] = (current - traced) / (1024 * 1024)
+        if profiler is not None:
+            record['top_functions'] = self._top_functions(profiler)
+            record['_profiler'] = profiler
+        self.stages.append(record)
+        return record
+
+    def mark(self, name):
+        """
+        이전 단계를 끝내고 name 단계를 시작합니다 (스크립트 들여쓰기를 바꾸지 않고 구간 표시)
+        """
+        self.start(name)
+
+    @contextmanager
+    def stage(self, name):
+        self.start(name)
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def _top_functions(self, profiler):
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({'function': f'{os.path.basename(filename)}:{line}({func})',
+                         'ncalls': ncalls, 'tottime_s': tottime, 'cumtime_s': cumtime})
+        return sorted(rows, key=lambda r: r['cumtime_s'], reverse=True)[:self.top]
+
+    # 3. 보고서
+    def report(self):
+        if self._current is not None:
+            self.stop()
+        return {
+            'run_name': self.run_name,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_wall_s': time.perf_counter() - self._start,
+            'peak_rss_mb': peak_rss_mb(),
+            'python': sys.version.split()[0],
+            'options': {'cprofile': self.profile, 'tracemalloc': self.trace_memory},
+            'stages': [{k: v for k, v in s.items() if not k.startswith('_')} for s in self.stages],
+        }
+
+    def _previous_report(self, options):
+        """
+        같은 측정 옵션으로 실행한 직전 보고서 (cProfile/tracemalloc 자체 오버헤드가 섞이지 않도록)
+        """
+        paths = sorted(glob.glob(os.path.join(self.report_dir, f'{self.run_name}_*.json')), reverse=True)
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+            if report.get('options') == options:
+                return report
+        return None
+
+    def save(self, verbose=True):
+        """
+        profile_reports/{run_name}_{시각}.json 저장 (cProfile 사용 시 단계별 .prof 도 저장) 후 경로 반환
+        """
+        report = self.report()
+        previous = self._previous_report(report['options'])
+        os.makedirs(self.report_dir, exist_ok=True)
+        stamp = self.started_at.strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(self.report_dir, f'{self.run_name}_{stamp}.json')
+
+        for i, stage in enumerate(self.stages):
+            profiler = stage.get('_profiler')
+            if profiler is not None:
+                prof_path = os.path.join(self.report_dir, f'{self.run_name}_{stamp}_{i:02d}_{stage["name"]}.prof')
+                profiler.dump_stats(prof_path)
+                report['stages'][i]['prof_file'] = os.path.basename(prof_path)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        if verbose:
+            print_report(report, previous)
+            print(f"💾 단계별 측정 보고서 저장: {path}")
+        return path
+
+
+# 4. 출력 (직전 실행 대비 변화 포함)
+def print_report(report, previous=None):
+    before = {s['name']: s['wall_s'] for s in previous['stages']} if previous else {}
+    print(f"\n⏱ [{report['run_name']}] 단계별 소요시간 (총 {report['total_wall_s']:.2f}s, "
+          f"peak RSS {report['peak_rss_mb'] or float('nan'):.0f} MB)")
+    for stage in report['stages']:
+        line = f"  {stage['name']:<20} {stage['wall_s']:8.3f}s  cpu {stage['cpu_s']:8.3f}s"
+        if 'py_alloc_peak_mb' in stage:
+            line += f"  alloc peak {stage['py_alloc_peak_mb']:8.1f} MB"
+        if stage['name'] in before and before[stage['name']] > 0:
+            change = (stage['wall_s'] / before[stage['name']] - 1) * 100
+            line += f"  (직전 대비 {change:+.0f}%{' ⚠️' if change > 20 else ''})"
+        print(line)
@@ -0,0 +1,138 @@
+# Prophet 상주(warm) worker 풀
+# - worker 프로세스는 시작할 때 한 번만 prophet/cmdstanpy import, 컴파일된 Stan 모델 로드, 예열용 fit 을 수행하고
+#   이후 작업 큐로 들어오는 fit/predict 요청을 계속 처리 (fit 마다 프로세스를 새로 띄우는 비용 제거)
+# - cmdstanpy 는 fit 마다 Stan 실행 파일을 subprocess 로 띄우므로 그 비용은 풀로도 없어지지 않음
+#   → 데이터가 100개 미만이면 Prophet 기본 최적화가 Newton 인데, algorithm='LBFGS' 가 같은 결과를 훨씬 빨리 냄
+# - python prophet_pool.py : fit 1회당 소요시간/오버헤드 측정 (CRE_FULL.xlsx)
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest import fit_prophet, quiet_prophet
+
+FORECAST_COLS = ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+
+
+# 1. worker 초기화: import + Stan 모델 로드 + 예열 fit
+def _init_worker():
+    quiet_prophet()
+    ds = pd.date_range('2020-01-01', periods=24, freq='MS')
+    warmup_df = pd.DataFrame({'ds': ds, 'y': np.arange(24, dtype=float)})
+    fit_prophet(warmup_df)
+
+
+# 2. worker 작업: fit + predict, 단계별 소요시간 함께 반환
+def _fit_predict_job(train_df, future_df, regressors, prophet_kwargs, fit_kwargs):
+    regressors = list(regressors)
+    start = time.perf_counter()
+    model = fit_prophet(train_df, regressors, prophet_kwargs, fit_kwargs)
+    fitted = time.perf_counter()
+    forecast = model.predict(future_df[['ds'] + regressors])
+    done = time.perf_counter()
+    timing = {'fit_ms': (fitted - start) * 1000, 'predict_ms': (done - fitted) * 1000}
+    return forecast[FORECAST_COLS], timing
+
+
+# 3. 풀
+class ProphetPool:
+    """
+    with ProphetPool(max_workers=4) as pool:
+        future = pool.submit(train_df, future_df, regressors)
+        forecast, timing = future.result()
+    """
+
+    def __init__(self, max_workers=None, fit_kwargs=None):
+        self.fit_kwargs = fit_kwargs
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+
+    def submit(self, train_df, future_df, regressors=(), prophet_kwargs=None, fit_kwargs=None):
+        return self._executor.submit(_fit_predict_job, train_df, future_df, list(regressors),
+                                     prophet_kwargs, fit_kwargs or self.fit_kwargs)
+
+    def map(self, jobs):
+        """
+        jobs: [(train_df, future_df, regressors, prophet_kwargs), ...] → [(forecast, timing), ...] (입력 순서 유지)
+        """
+        futures = [self.submit(*job) for job in jobs]
+        return [f.result() for f in futures]
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 4. 오버헤드 측정
+def _cold_job(train_df, future_df, regressors, prophet_kwargs, fit_kwargs):
+    quiet_prophet()
+    return _fit_predict_job(train_df, future_df, regressors, prophet_kwargs, fit_kwargs)
+
+
+def measure_overhead(jobs, max_workers=4):
+    """
+    같은 작업 목록을 방식별로 실행해 fit 1회당 평균 소요시간(ms)을 반환합니다.
+    - 새 프로세스/fit : fit 마다 spawn 프로세스 생성 + import + Stan 모델 로드 (프로세스 churn)
+    - 현재 프로세스    : 기존 스크립트처럼 한 프로세스에서 Prophet() 을 매번 생성
+    - 상주 풀          : 예열된 worker 풀 (1개 / max_workers 개)
+    - 상주 풀 + LBFGS  : 위와 같고 최적화 알고리즘만 LBFGS
+    """
+    rows = []
+
+    def record(label, workers, start, timings):
+        wall = (time.perf_counter() - start) * 1000 / len(jobs)
+        fit_ms = np.mean([t['fit_ms'] for t in timings])
+        # fit 외 비용(프로세스 생성, import, 데이터 전달, predict)은 순차 실행일 때만 의미가 있음
+        overhead = wall - fit_ms if workers == 1 else np.nan
+        rows.append({'방식': label, 'worker': workers, 'fit당 경과(ms)': wall,
+                     'fit 내부(ms)': fit_ms, 'fit 외 비용(ms)': overhead})
+
+    spawn = multiprocessing.get_context('spawn')
+    start = time.perf_counter()
+    timings = []
+    for job in jobs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+            timings.append(executor.submit(_cold_job, *job, None).result()[1])
+    record('새 프로세스/fit', 1, start, timings)
+
+    start = time.perf_counter()
+    timings = [_fit_predict_job(*job, None)[1] for job in jobs]
+    record('현재 프로세스', 1, start, timings)
+
+    for workers, fit_kwargs, label in [(1, None, '상주 풀'),
+                                       (1, {'algorithm': 'LBFGS'}, '상주 풀 + LBFGS'),
+                                       (max_workers, None, '상주 풀'),
+                                       (max_workers, {'algorithm': 'LBFGS'}, '상주 풀 + LBFGS')]:
+        with ProphetPool(max_workers=workers, fit_kwargs=fit_kwargs) as pool:
+            pool.map(jobs[:workers])  # 모든 worker 예열 완료 대기
+            start = time.perf_counter()
+            timings = [timing for _, timing in pool.map(jobs)]
+            record(label, workers, start, timings)
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    quiet_prophet()
+
+    df = pd.read_excel("CRE_FULL.xlsx")
+    df['ds'] = pd.to_datetime(df['년월'])
+
+    # 외부 변수 3개 x 컷오프 4개 = 12개 fit 작업
+    jobs = []
+    for var in ['CRE_전국', 'CRE_충북', 'CRE_사망']:
+        series = df[['ds', var]].dropna().rename(columns={var: 'y'})
+        for cutoff in ['2023-12-01', '2024-03-01', '2024-06-01', '2024-09-01']:
+            train_df = series[series['ds'] <= cutoff]
+            future_df = series[(series['ds'] > cutoff)].head(3)
+            jobs.append((train_df, future_df, [], None))
+
+    print("⏱ Prophet fit 1회당 소요시간 비교 (ms):")
+    print(measure_overhead(jobs).round(1).to_string(index=False))
@@ -0,0 +1,108 @@
+# 외부 변수(회귀변수) 예측 공용 모듈
+# - CRE_prophet.py / 표본감시_prophet.py 의 "2. 외부 변수 Prophet 개별 예측" + "3. 예측값 병합" 단계를 함수로 분리
+# - 변수선택/튜닝 스크립트가 같은 {var}_예측 컬럼을 한 번만 계산해서 공유하도록 사용
+# - 예측 결과는 (변수 이력 해시, periods, freq, 모델 설정) 키로 캐시 → 전국/충북 데이터가 바뀐 변수만 다시 학습
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+import prophet
+from prophet import Prophet
+
+CACHE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'regressor_cache')
+)
+
+_memory_cache = {}
+
+
+# 0. 캐시 키: 이력(ds, 값) 내용 + 예측 설정이 같으면 변수 이름이 달라도 같은 키
+def cache_key(ext_df, periods, freq, prophet_kwargs=None):
+    h = hashlib.sha1()
+    h.update(ext_df['ds'].to_numpy(dtype='datetime64[ns]').tobytes())
+    h.update(ext_df['y'].to_numpy(dtype=float).tobytes())
+    config = {'periods': periods, 'freq': freq, 'prophet': prophet.__version__,
+              'prophet_kwargs': prophet_kwargs or {}}
+    h.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def _load_cached(key, cache_dir):
+    if key in _memory_cache:
+        return _memory_cache[key]
+    path = os.path.join(cache_dir, f'{key}.pkl')
+    if os.path.exists(path):
+        try:
+            _memory_cache[key] = pd.read_pickle(path)
+            return _memory_cache[key]
+        except Exception as e:
+            print(f"⚠️ 외부 변수 예측 캐시 읽기 실패 → 다시 계산: {path} ({e})")
+    return None
+
+
+def _save_cached(key, forecast, cache_dir):
+    _memory_cache[key] = forecast
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f'{key}.pkl')
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    forecast.to_pickle(tmp_path)
+    os.replace(tmp_path, path)  # 여러 프로세스가 동시에 써도 읽는 쪽은 항상 완성된 파일만 봄
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    _memory_cache.clear()
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(cache_dir, name))
+
+
+# 1. 외부 변수 1개 Prophet 예측
+def forecast_regressor(df, var, periods=3, freq='M', prophet_kwargs=None, cache=True, cache_dir=CACHE_DIR):
+    """
+    외부 변수 하나를 Prophet으로 학습하고 periods 만큼 연장한 예측값을 반환합니다.
+    같은 이력/설정으로 계산한 결과가 캐시에 있으면 학습 없이 바로 반환합니다 (cache=False 이면 항상 재학습).
+    반환 컬럼: ds, {var}_예측
+    """
+    ext_df = df[['ds', var]].dropna().rename(columns={var: 'y'})
+
+    key = cache_key(ext_df, periods, freq, prophet_kwargs) if cache else None
+    forecast = _load_cached(key, cache_dir) if cache else None
+
+    if forecast is None:
+        model = Prophet(**(prophet_kwargs or {}))
+        model.fit(ext_df)
+
+        future = model.make_future_dataframe(periods=periods, freq=freq)
+        forecast = model.predict(future)[['ds', 'yhat']]
+        if cache:
+            _save_cached(key, forecast, cache_dir)
+
+    return forecast.rename(columns={'yhat': f'{var}_예측'})
+
+
+# 2. 외부 변수 전체 예측 및 병합
+def forecast_regressors(df, external_vars, periods=3, freq='M', cache=True):
+    """
+    external_vars 전체를 개별 예측한 뒤 ds 기준으로 병합합니다.
+    """
+    external_merged = None
+    for var in external_vars:
+        pred = forecast_regressor(df, var, periods=periods, freq=freq, cache=cache)
+        if external_merged is None:
+            external_merged = pred
+        else:
+            external_merged = pd.merge(external_merged, pred, on='ds', how='outer')
+    return external_merged
+
+
+# 3. 내부 데이터(ds, y) + 외부 변수 예측값 결합
+def build_model_frame(df, external_vars, periods=3, freq='M', cache=True):
+    """
+    모델 학습/예측에 쓰는 full_model_df (ds, y, {var}_예측 ...) 를 만듭니다.
+    """
+    external_merged = forecast_regressors(df, external_vars, periods=periods, freq=freq, cache=cache)
+    internal_df = df[['ds', 'y']]
+    return pd.merge(internal_df, external_merged, on='ds', how='left')
@@ -0,0 +1,81 @@
+# 합성 월별 건수 시리즈 생성기 (유행(outbreak) 주입)
+# - 계절성(12개월) + 완만한 추세 + 음이항 잡음을 가진 월별 감염 건수 시리즈를 n 개 생성
+# - 평가 구간(마지막 test_months 개월)에만 유행을 주입하고 시작/길이/배수를 정답 테이블로 함께 반환
+#   → 경보 로직의 탐지 지연(개월), 탐지율, 오경보율을 계산할 수 있음
+
+import numpy as np
+import pandas as pd
+
+
+# 1. 시리즈 생성
+def generate_series(n_series, n_months=60, test_months=12, outbreak_rate=0.5, start='2019-01-01',
+                    base_range=(5, 300), amplitude_range=(0.1, 0.5), magnitude_range=(1.5, 3.0),
+                    max_outbreak_months=3, dispersion=0.05, seed=0):
+    """
+    반환: (long_df, outbreaks_df)
+    long_df: series_id, ds, y (월 시작일)
+    outbreaks_df: series_id, start, months, magnitude (유행이 주입된 시리즈만)
+    """
+    rng = np.random.default_rng(seed)
+    ds = pd.date_range(start, periods=n_months, freq='MS')
+    t = np.arange(n_months)
+
+    base = np.exp(rng.uniform(np.log(base_range[0]), np.log(base_range[1]), n_series))[:, None]
+    amplitude = rng.uniform(*amplitude_range, n_series)[:, None]
+    phase = rng.uniform(0, 12, n_series)[:, None]
+    trend = rng.normal(0, 0.005, n_series)[:, None]
+    mu = base * (1 + amplitude * np.sin(2 * np.pi * (t[None, :] + phase) / 12)) * np.exp(trend * t[None, :])
+
+    # 유행: 평가 구간 안에서 시작, 1~max_outbreak_months 개월 동안 평균 magnitude 배
+    has_outbreak = rng.random(n_series) < outbreak_rate
+    starts = rng.integers(n_months - test_months, n_months, n_series)
+    lengths = rng.integers(1, max_outbreak_months + 1, n_series)
+    magnitudes = rng.uniform(*magnitude_range, n_series)
+    in_outbreak = (has_outbreak[:, None] & (t[None, :] >= starts[:, None]) &
+                   (t[None, :] < (starts + lengths)[:, None]))
+    mu = np.where(in_outbreak, mu * magnitudes[:, None], mu)
+
+    # 음이항 (분산 = mu + dispersion * mu^2)
+    size = 1 / dispersion
+    y = rng.negative_binomial(size, size / (size + mu)).astype(float)
+
+    series_ids = np.array([f'S{i:04d}' for i in range(n_series)])
+    long_df = pd.DataFrame({
+        'series_id': np.repeat(series_ids, n_months),
+        'ds': np.tile(ds, n_series),
+        'y': y.ravel(),
+    })
+    end_idx = np.minimum(starts + lengths, n_months)
+    outbreaks_df = pd.DataFrame({
+        'series_id': series_ids[has_outbreak],
+        'start': ds[starts[has_outbreak]],
+        'months': (end_idx - starts)[has_outbreak],
+        'magnitude': magnitudes[has_outbreak],
+    })
+    return long_df, outbreaks_df
+
+
+# 2. 경보 평가 (탐지 지연, 탐지율, 오경보율)
+def score_alarms(alarm_df, outbreaks_df, test_start):
+    """
+    alarm_df: series_id, ds, 경보 (평가 구간 포함)
+    - 탐지: 유행 구간 안에 경보가 1번 이상. 지연 = 유행 시작 ~ 첫 경보 (개월)
+    - 오경보율: 유행이 아닌 평가 구간 달 중 경보 비율
+    """
+    test = alarm_df[alarm_df['ds'] >= pd.Timestamp(test_start)].merge(outbreaks_df, on='series_id', how='left')
+    month = test['ds'].dt.year * 12 + test['ds'].dt.month
+    start_month = test['start'].dt.year * 12 + test['start'].dt.month
+    in_outbreak = (month >= start_month) & (month < start_month + test['months'])
+
+    normal = test[~in_outbreak]
+    false_alarm_rate = normal['경보'].mean() if len(normal) else np.nan
+
+    hits = test[in_outbreak & test['경보']]
+    first_alarm = (month[hits.index] - start_month[hits.index]).groupby(hits['series_id']).min()
+    n_outbreaks = len(outbreaks_df)
+    return {
+        '유행 수': n_outbreaks,
+        '탐지율': len(first_alarm) / n_outbreaks if n_outbreaks else np.nan,
+        '평균 탐지지연(개월)': first_alarm.mean() if len(first_alarm) else np.nan,
+        '오경보율': false_alarm_rate,
+    }
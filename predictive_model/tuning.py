@@ -0,0 +1,160 @@
+# Prophet 하이퍼파라미터 튜닝 모듈
+# - changepoint/seasonality prior scale, seasonality mode 를 프로세스 풀에서 탐색
+# - successive halving: 최근 fold 2개짜리 짧은 백테스트로 전체 후보를 거르고, 살아남은 후보만 fold 수를 늘려 재평가
+# - interval_width 는 예측값(yhat)에 영향이 없으므로 최종 후보에서 재학습 없이 폭만 바꿔 포함률로 선택
+# - 시리즈별 최적 설정은 best_prophet_params.json 에 저장하고 CRE_prophet.py / 표본감시_prophet.py 가 읽어서 사용
+
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+
+import pandas as pd
+
+from backtest import backtest_prophet, quiet_prophet, rolling_origin_folds
+
+PARAMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'best_prophet_params.json')
+
+PARAM_GRID = {
+    'changepoint_prior_scale': [0.001, 0.01, 0.05, 0.1, 0.5],
+    'seasonality_prior_scale': [0.01, 0.1, 1.0, 10.0],
+    'seasonality_mode': ['additive', 'multiplicative'],
+}
+INTERVAL_WIDTHS = [0.8, 0.9, 0.95]
+PROPHET_KEYS = list(PARAM_GRID) + ['interval_width']
+
+
+# 1. 후보 설정 목록
+def param_grid(grid=None):
+    grid = grid or PARAM_GRID
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in product(*[grid[k] for k in keys])]
+
+
+# 2. worker 공유 상태
+_shared = {}
+
+
+def _init_worker(frame, regressors, folds, metric):
+    quiet_prophet()
+    _shared.update(frame=frame, regressors=regressors, folds=folds, metric=metric)
+
+
+def _evaluate(params, n_folds, interval_widths):
+    result = backtest_prophet(
+        _shared['frame'], _shared['regressors'], _shared['folds'][-n_folds:],
+        prophet_kwargs=params, metric=_shared['metric'], interval_widths=interval_widths
+    )
+    return params, result
+
+
+# 3. rung 별 fold 수 (1, 2, 4, ..., 전체)
+def _rung_sizes(total_folds, min_folds=1):
+    sizes = []
+    n = min_folds
+    while n < total_folds:
+        sizes.append(n)
+        n *= 2
+    sizes.append(total_folds)
+    return sizes
+
+
+# 4. 포함률이 명목 폭에 가장 가까운 interval_width 선택 (같으면 좁은 폭)
+def choose_interval_width(coverage):
+    return min(coverage, key=lambda width: (abs(coverage[width] - width), width))
+
+
+# 5. successive halving 탐색
+def successive_halving(frame, regressors, folds, grid=None, interval_widths=None, metric='MAPE',
+                       eta=3, min_folds=2, max_workers=None):
+    """
+    후보 설정을 짧은 백테스트부터 평가해 상위 1/eta 만 다음 rung 으로 올립니다.
+    반환: (최적 설정 dict, 전체 평가 기록 DataFrame)
+    """
+    interval_widths = interval_widths or INTERVAL_WIDTHS
+    survivors = param_grid(grid)
+    rungs = _rung_sizes(len(folds), min_folds)
+    history = []
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(frame, list(regressors), folds, metric)) as pool:
+        for rung, n_folds in enumerate(rungs):
+            last = rung == len(rungs) - 1
+            futures = [pool.submit(_evaluate, params, n_folds, interval_widths if last else None)
+                       for params in survivors]
+            scored = sorted((f.result() for f in futures), key=lambda item: item[1][metric])
+
+            for params, result in scored:
+                history.append({'rung': rung, 'fold수': n_folds, **params,
+                                **{k: result[k] for k in ['MAE', 'RMSE', 'MAPE']}})
+
+            if not last:
+                keep = max(1, math.ceil(len(scored) / eta))
+                survivors = [params for params, _ in scored[:keep]]
+
+    best_params, best_result = scored[0]
+    best = dict(best_params)
+    best['interval_width'] = choose_interval_width(best_result['coverage'])
+    best['scores'] = {k: best_result[k] for k in ['MAE', 'RMSE', 'MAPE']}
+    best['coverage'] = {str(width): cov for width, cov in best_result['coverage'].items()}
+    return best, pd.DataFrame(history)
+
+
+# 6. 시리즈별 최적 설정 저장/로드
+def save_best_params(series, best, path=PARAMS_PATH):
+    store = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            store = json.load(f)
+
+    store[series] = {**best, 'tuned_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(store, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_best_params(series, path=PARAMS_PATH):
+    """
+    Prophet(**kwargs) 에 바로 넣을 수 있는 설정을 반환합니다. 튜닝 기록이 없으면 {} (Prophet 기본값).
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        entry = json.load(f).get(series, {})
+    return {k: entry[k] for k in PROPHET_KEYS if k in entry}
+
+
+# 7. 실행: python tuning.py [CRE|표본감시]
+if __name__ == '__main__':
+    from regressors import build_model_frame
+
+    quiet_prophet()
+
+    series_configs = {
+        'CRE': ('CRE_FULL.xlsx', 'CRE_내부', {
+            'CRE_전국': 'nationwide_cre', 'CRE_충북': 'chungbuk_cre', 'CRE_사망': 'cre_deaths'}),
+        '표본감시': ('표본감시_FULL.xlsx', '표본감시', {
+            v: v for v in ['MRSA_혈액', 'VRE_혈액', 'MRPA_혈액', 'MRAB_혈액',
+                           'MRSA_그외', 'VRE_그외', 'MRPA_그외', 'MRAB_그외']}),
+    }
+    targets = sys.argv[1:] or list(series_configs)
+
+    for name in targets:
+        file_path, target_col, rename_map = series_configs[name]
+        df = pd.read_excel(file_path)
+        df['ds'] = pd.to_datetime(df['년월'])
+        df = df.rename(columns={target_col: 'y', **rename_map})
+        external_vars = list(rename_map.values())
+
+        frame = build_model_frame(df, external_vars)
+        folds = rolling_origin_folds(frame, n_folds=4, horizon=3)
+        best, history = successive_halving(frame, [f'{var}_예측' for var in external_vars], folds)
+
+        save_best_params(target_col, best)
+        print(f"📌 {target_col} 최적 설정: {best}")
+        print(history.groupby('rung').size().rename('평가 후보 수').to_string())
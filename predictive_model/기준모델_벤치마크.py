@@ -0,0 +1,58 @@
+# 기준(baseline) 모델 vs Prophet 벤치마크
+# - CRE_FULL.xlsx / 표본감시_FULL.xlsx 에서 같은 롤링 원점 fold 로 정확도(MAE/RMSE/MAPE, 95% 구간 포함률)와
+#   fit 1회당 소요시간(ms)을 비교
+# - 외부 변수 예측값({var}_예측)은 한 번만 계산해서 모든 모델이 공유
+
+import pandas as pd
+
+from backtest import backtest_forecaster, fit_predict_prophet, quiet_prophet, rolling_origin_folds
+from baselines import BASELINES
+from regressors import build_model_frame
+
+quiet_prophet()
+
+
+# 1. Prophet 을 기준 모델과 같은 호출 형태로 감싸기
+def prophet_forecaster(train_df, future_df, regressors=(), interval_width=0.95):
+    return fit_predict_prophet(train_df, future_df, regressors, {'interval_width': interval_width})
+
+
+MODELS = {'prophet': prophet_forecaster, **BASELINES}
+
+
+# 2. 데이터셋 정의 (파일, 타깃 컬럼, 외부 변수 rename)
+datasets = {
+    'CRE': ('CRE_FULL.xlsx', 'CRE_내부', {
+        'CRE_전국': 'nationwide_cre', 'CRE_충북': 'chungbuk_cre', 'CRE_사망': 'cre_deaths'}),
+    '표본감시': ('표본감시_FULL.xlsx', '표본감시', {
+        v: v for v in ['MRSA_혈액', 'VRE_혈액', 'MRPA_혈액', 'MRAB_혈액',
+                       'MRSA_그외', 'VRE_그외', 'MRPA_그외', 'MRAB_그외']}),
+}
+
+
+# 3. 벤치마크 실행
+results = []
+for name, (file_path, target_col, rename_map) in datasets.items():
+    df = pd.read_excel(file_path)
+    df['ds'] = pd.to_datetime(df['년월'])
+    df = df.rename(columns={target_col: 'y', **rename_map})
+    external_vars = list(rename_map.values())
+
+    frame = build_model_frame(df, external_vars)
+    regressors = [f'{var}_예측' for var in external_vars]
+    folds = rolling_origin_folds(frame, n_folds=4, horizon=3)
+
+    for model_name, forecaster in MODELS.items():
+        result = backtest_forecaster(frame, regressors, folds, forecaster)
+        results.append({'데이터': name, '모델': model_name, **result})
+
+
+# 4. 결과 출력
+result_df = pd.DataFrame(results)
+prophet_ms = result_df[result_df['모델'] == 'prophet'].set_index('데이터')['ms_per_fit']
+result_df['속도배수(vs prophet)'] = result_df['데이터'].map(prophet_ms) / result_df['ms_per_fit']
+
+print("📊 기준 모델 vs Prophet (롤링 원점 백테스트, 3개월 x 4 fold):")
+for name, group in result_df.groupby('데이터', sort=False):
+    print(f"\n[{name}]")
+    print(group.drop(columns='데이터').round(3).to_string(index=False))
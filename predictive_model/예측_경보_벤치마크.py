@@ -0,0 +1,145 @@
+# 예측/경보 벤치마크 (합성 월별 시리즈, 유행 주입)
+# - synthetic_series.py 로 시리즈 2 ~ 1000개를 만들고 모델별로 학습(fit) / 예측(predict) / 경보 판정(alarm) 시간과
+#   탐지율, 평균 탐지지연(개월), 오경보율, 최대 메모리를 함께 기록 → 버전별로 속도와 품질을 같이 추적
+# - 학습: 처음 48개월, 평가: 마지막 12개월 (유행은 평가 구간에만 주입), 경보 기준은 예측 스크립트와 동일 (y > yhat_upper)
+# - Prophet 은 예열된 worker 풀(prophet_pool.py, LBFGS)로, 기준 모델은 현재 프로세스에서 실행
+# - 규모별로 새 프로세스에서 실행하고 결과는 profile_reports/예측_경보_벤치마크_{시각}.json 에 저장
+# - python 예측_경보_벤치마크.py [시리즈수 ...] [--models prophet,holt_winters,negbin_glm] [--workers N]
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from baselines import BASELINES
+from profiling import REPORT_DIR, peak_rss_mb
+from synthetic_series import generate_series, score_alarms
+
+DEFAULT_SIZES = [2, 10, 100, 1000]
+DEFAULT_MODELS = ['prophet', 'holt_winters', 'negbin_glm']
+N_MONTHS = 60
+TEST_MONTHS = 12
+INTERVAL_WIDTH = 0.8  # Prophet 기본값 (CRE_prophet.py / 표본감시_prophet.py 와 동일)
+
+
+# 1. 모델별 학습/예측
+def _split(long_df):
+    """
+    시리즈별 (series_id, 학습 df, 예측 df) 목록. 예측 df 는 학습 + 평가 구간 전체 ds
+    """
+    test_start = long_df['ds'].sort_values().unique()[-TEST_MONTHS]
+    jobs = []
+    for series_id, series_df in long_df.groupby('series_id', sort=True):
+        series_df = series_df[['ds', 'y']].reset_index(drop=True)
+        jobs.append((series_id, series_df[series_df['ds'] < test_start], series_df[['ds']]))
+    return jobs, test_start
+
+
+def _run_prophet(jobs, workers):
+    from prophet_pool import ProphetPool
+
+    with ProphetPool(max_workers=workers, fit_kwargs={'algorithm': 'LBFGS'}) as pool:
+        pool.map([(train, future, [], {'interval_width': INTERVAL_WIDTH}) for _, train, future in jobs[:workers]])
+        start = time.perf_counter()
+        outputs = pool.map([(train, future, [], {'interval_width': INTERVAL_WIDTH}) for _, train, future in jobs])
+        wall = time.perf_counter() - start
+    forecasts = [forecast for forecast, _ in outputs]
+    timing = {
+        'fit_s': sum(t['fit_ms'] for _, t in outputs) / 1000,
+        'predict_s': sum(t['predict_ms'] for _, t in outputs) / 1000,
+        'wall_s': wall,
+    }
+    return forecasts, timing
+
+
+def _run_baseline(jobs, name):
+    forecaster = BASELINES[name]
+    start = time.perf_counter()
+    forecasts = [forecaster(train, future, interval_width=INTERVAL_WIDTH) for _, train, future in jobs]
+    wall = time.perf_counter() - start
+    # 기준 모델은 학습/예측이 한 함수 안에서 끝나므로 전체를 fit 으로 기록
+    return forecasts, {'fit_s': wall, 'predict_s': np.nan, 'wall_s': wall}
+
+
+# 2. 규모 하나 실행 (별도 프로세스)
+def run_size(n_series, models, workers, seed=0):
+    long_df, outbreaks_df = generate_series(n_series, n_months=N_MONTHS, test_months=TEST_MONTHS, seed=seed)
+    jobs, test_start = _split(long_df)
+
+    rows = []
+    for model in models:
+        forecasts, timing = _run_prophet(jobs, workers) if model == 'prophet' else _run_baseline(jobs, model)
+
+        # 경보 판정: 전체 시리즈를 한 테이블로 모아 벡터 연산 한 번
+        start = time.perf_counter()
+        forecast_df = pd.concat(
+            [f.assign(series_id=series_id) for (series_id, _, _), f in zip(jobs, forecasts)], ignore_index=True
+        )
+        alarm_df = long_df.merge(forecast_df[['series_id', 'ds', 'yhat_upper']], on=['series_id', 'ds'])
+        alarm_df['경보'] = (alarm_df['y'] > alarm_df['yhat_upper']).to_numpy()
+        alarm_s = time.perf_counter() - start
+
+        quality = score_alarms(alarm_df, outbreaks_df, test_start)
+        total = timing['wall_s'] + alarm_s
+        rows.append({
+            '시리즈 수': n_series, '모델': model,
+            'fit(s)': timing['fit_s'], 'predict(s)': timing['predict_s'], 'alarm(s)': alarm_s,
+            '전체(s)': total, '시리즈/분': n_series / total * 60,
+            **quality,
+            'peak RSS(MB)': peak_rss_mb(),
+        })
+    return rows
+
+
+# 3. 전체 실행
+def run_benchmark(sizes=None, models=None, workers=None):
+    workers = workers or os.cpu_count() or 1
+    spawn = multiprocessing.get_context('spawn')
+    rows = []
+    for n_series in sizes or DEFAULT_SIZES:
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+            size_rows = executor.submit(run_size, n_series, models or DEFAULT_MODELS, workers).result()
+        rows.extend(size_rows)
+        print(f"✅ 시리즈 {n_series}개 완료 ({sum(r['전체(s)'] for r in size_rows):.1f}s)")
+    return pd.DataFrame(rows)
+
+
+def save_report(result_df, report_dir=REPORT_DIR):
+    os.makedirs(report_dir, exist_ok=True)
+    path = os.path.join(report_dir, f"예측_경보_벤치마크_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    report = {
+        'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'settings': {'n_months': N_MONTHS, 'test_months': TEST_MONTHS, 'interval_width': INTERVAL_WIDTH},
+        'results': json.loads(result_df.to_json(orient='records', force_ascii=False)),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    models, workers, sizes = DEFAULT_MODELS, None, []
+    i = 0
+    while i < len(args):
+        if args[i] == '--models':
+            models = args[i + 1].split(',')
+            i += 2
+        elif args[i] == '--workers':
+            workers = int(args[i + 1])
+            i += 2
+        else:
+            sizes.append(int(args[i]))
+            i += 1
+
+    result_df = run_benchmark(sizes or DEFAULT_SIZES, models, workers)
+
+    print(f"\n📊 예측/경보 벤치마크 (학습 {N_MONTHS - TEST_MONTHS}개월, 평가 {TEST_MONTHS}개월, 구간 {INTERVAL_WIDTH:.0%}):")
+    print(result_df.round(3).to_string(index=False))
+    print(f"\n💾 결과 저장: {save_report(result_df)}")
@@ -1,5 +1,15 @@
 import pandas as pd
 import os
+import sys
+
+# 단계별 소요시간/메모리 측정 (predictive_model/profiling.py, 실행마다 JSON 보고서)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'predictive_model'))
+from profiling import StageProfiler
+
+# First isolation 은 lab_report.first_isolation (파싱 벤치마크와 같은 코드 사용)
+from lab_report import first_isolation
+
+profiler = StageProfiler('2급_카운트')
 
 # 엑셀 파일 경로
 file_path = 'C:/kdtcb_learn/내부데이터_전처리_최종(FirstIsolation 전).xlsx'
@@ -15,6 +25,7 @@ if not os.path.exists(file_path):
     print(f"오류: 파일을 찾을 수 없습니다 - {file_path}")
 else:
     try:
+        profiler.mark('load')
         # 엑셀 파일 읽기
         df = pd.read_excel(file_path)
         print(f"파일 불러오기 성공. 총 {len(df)} 행.")
@@ -30,6 +41,7 @@ else:
                 print(f"오류: 필수 컬럼 '{col}'을(를) 찾을 수 없습니다. 엑셀 파일의 컬럼 이름을 확인해주세요.")
                 exit()  # 필수 컬럼이 없으면 종료
 
+        profiler.mark('flag')
         # --- 새로운 CRE(R) 컬럼 생성 로직 추가 ---
         # CIMP(R), CMEM(R), CETP(R) 중 하나라도 1이면 CRE(R)을 1로, 아니면 0으로 설정
         # df[cre_source_cols].any(axis=1)은 해당 행에서 이 3개 컬럼 중 하나라도 True(즉, 1)이면 True 반환
@@ -52,20 +64,20 @@ else:
         # 각 감염병 유형별 First Isolation 데이터프레임을 저장할 딕셔너리
         first_isolation_dfs = {}
 
+        profiler.mark('first_isolation')
         # --- CRE First Isolation 데이터 처리 (환자별, 검체별, 년도별 기준) ---
         print("\n========== CRE First Isolation 데이터 처리 시작 ==========")
         # 이제 CRE First Isolation은 새로 생성된 'CRE(R)' 컬럼을 기준으로 합니다.
         cre_target_col = 'CRE(R)'
-        df_cre_only = df[df[cre_target_col] == 1].copy()
+        cre_mask = df[cre_target_col] == 1
+        df_cre_only = df[cre_mask]
         if df_cre_only.empty:
             print(f"경고: '{cre_target_col}' 컬럼 값이 1인 데이터가 없어 CRE First Isolation을 수행할 수 없습니다.")
             first_isolation_dfs['CRE'] = pd.DataFrame()
         else:
             print(f"'{cre_target_col}'이 1인 원본 데이터 수: {len(df_cre_only)} 행")
             # 환자번호, 검체명(주검체), 년도를 기준으로 그룹화하여 첫 번째 발생만 선택
-            df_cre_first_isolation = df_cre_only.sort_values(by='검사시행일자').groupby(
-                ['환자번호', '검체명(주검체)', '년도'], as_index=False
-            ).first()
+            df_cre_first_isolation = first_isolation(df, cre_mask, keys=('환자번호', '검체명(주검체)', '년도'))
             first_isolation_dfs['CRE'] = df_cre_first_isolation
             print(f"CRE First Isolation 적용 후 데이터 수: {len(df_cre_first_isolation)} 행")
             print("CRE First Isolation 적용 후 데이터프레임의 상위 5행:")
@@ -104,16 +116,15 @@ else:
             first_isolation_dfs['VRSA'] = pd.DataFrame()
             print("VRSA 분석을 건너뜜니다.")
         else:
-            df_vrsa_only = df[df[vrsa_target_col] == 1].copy()
+            vrsa_mask = df[vrsa_target_col] == 1
+            df_vrsa_only = df[vrsa_mask]
             if df_vrsa_only.empty:
                 print(f"경고: '{vrsa_target_col}' 컬럼 값이 1인 데이터가 없어 VRSA First Isolation을 수행할 수 없습니다.")
                 first_isolation_dfs['VRSA'] = pd.DataFrame()
             else:
                 print(f"'{vrsa_target_col}'이 1인 원본 데이터 수: {len(df_vrsa_only)} 행")
                 # 환자번호, 검체명(주검체), 년도를 기준으로 그룹화하여 첫 번째 발생만 선택
-                df_vrsa_first_isolation = df_vrsa_only.sort_values(by='검사시행일자').groupby(
-                    ['환자번호', '검체명(주검체)', '년도'], as_index=False
-                ).first()
+                df_vrsa_first_isolation = first_isolation(df, vrsa_mask, keys=('환자번호', '검체명(주검체)', '년도'))
                 first_isolation_dfs['VRSA'] = df_vrsa_first_isolation
                 print(f"VRSA First Isolation 적용 후 데이터 수: {len(df_vrsa_first_isolation)} 행")
                 print("VRSA First Isolation 적용 후 데이터프레임의 상위 5행:")
@@ -138,6 +149,7 @@ else:
                                                                ) * 1000
                 print(merged_counts_vrsa)
 
+        profiler.mark('yearly_counts')
         # --- 모든 2급감염병의 연도별 First Isolation 건수 합계 (참고용) ---
         print("\n========== 연도별 2급감염병 건수 합계 (참고용) ==========")
 
@@ -156,6 +168,7 @@ else:
         print("\n--- 연도별 2급감염병 건수 요약 ---")
         print(combined_annual_counts)
 
+        profiler.mark('export')
         # --- 최종 결과 엑셀 파일로 저장: 월별 First Isolation 건수 요약 ---
         output_file_name = '연도별_2급감염병_건수.xlsx'
         print(f"\n========== 월별 2급감염병 건수 요약 엑셀 파일 저장 시작 ==========")
@@ -188,4 +201,6 @@ else:
     except Exception as e:
         print(f"데이터 처리 중 오류 발생: {e}")
 
+profiler.save()
+
 print(f"\n--- '{file_path}'에서 2급감염병 건수 세기 완료 ---")
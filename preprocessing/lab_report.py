@@ -0,0 +1,179 @@
+# 미생물 배양 검사결과 텍스트 파싱/플래그 공용 모듈
+# - 원데이터에서 데이터 전처리(isolation 전).py 의 2/6/7/8 단계를 함수로 분리 (합성 데이터 벤치마크에서도 같은 코드 사용)
+# - parse_multi_organism_and_resistance : 검사결과 텍스트 → [{'Organism', 'Resistance_Patterns'}, ...]
+# - explode_organisms : 동정결과 2개 이상인 행을 균주별 행으로 확장, No Growth / 파싱 실패 제거
+# - flag_organisms / flag_resistance : 균주명 약어(EFU, ..., CRE), 항생제 내성 약어(EVAN(R), ...) 0/1 컬럼
+# - first_isolation : 환자 x 검체 x 기간별 첫 분리 (카운트 스크립트 기준)
+
+import re
+
+
+# 1. 검사결과 텍스트 파싱
+def parse_multi_organism_and_resistance(result_text):
+    if not isinstance(result_text, str):
+        return []
+    results = []
+    # 'No Growth' 패턴을 먼저 확인
+    if "No Growth" in result_text:
+        return [{'Organism': "No Growth", 'Resistance_Patterns': {}}]
+
+    blocks = re.split(r'(?=동정결과:)', result_text, flags=re.MULTILINE)
+    blocks = [block for block in blocks if block.strip().startswith('동정결과:')]
+
+    for block in blocks:
+        organism = None
+        resistance_patterns = {}
+
+        # 동정결과에서 균주명 파싱
+        organism_match = re.search(r'동정결과:\s*([^,\n]+?)(?:,\s*정도:\s*.+?)?\s*(?:\n|$)', block, re.MULTILINE)
+        if organism_match:
+            organism = organism_match.group(1).strip()
+            if organism.endswith('.'):
+                organism = organism[:-1]
+
+        # 항생제 감수성 결과 섹션 파싱
+        resistance_section_match = re.search(
+            r'항생제 감수성결과\s*\n-+\n(.+?)(?=\n\nCOMMENT:|\n\n\(최종보고\)|\Z)',
+            block, re.DOTALL | re.IGNORECASE
+        )
+
+        if resistance_section_match:
+            resistance_lines = resistance_section_match.group(1).strip().split('\n')
+            for line in resistance_lines:
+                # 각 항생제의 이름과 감수성 결과(S, I, R) 파싱
+                match = re.search(r'(.+?)\s+([<>=]?[\d.]+)\s+\(([RS])\)', line.strip())
+                if match:
+                    antibiotic = match.group(1).strip()
+                    judgment = match.group(3).strip()
+                    resistance_patterns[antibiotic] = judgment
+
+        if organism:
+            results.append({'Organism': organism, 'Resistance_Patterns': resistance_patterns})
+    return results
+
+
+# 2. 균주별 행 확장
+def explode_organisms(df, parsed_col='Parsed_Results'):
+    """
+    parsed_col(파싱 결과 리스트)을 균주별 행으로 펼쳐 '균주명' 컬럼을 만들고,
+    No Growth 와 균주명을 파싱하지 못한 행은 제거합니다. parsed_col 은 결과에서 빠집니다.
+    """
+    df_expanded = df.explode(parsed_col)
+    parsed = df_expanded[parsed_col].to_numpy()
+    df_expanded = df_expanded.drop(columns=[parsed_col])
+    df_expanded['균주명'] = [x['Organism'] if isinstance(x, dict) and 'Organism' in x else None for x in parsed]
+
+    keep = df_expanded['균주명'].notna() & (df_expanded['균주명'] != "No Growth")
+    return df_expanded[keep].copy()
+
+
+# 3. 균주명 약어 컬럼
+ORGANISM_FLAGS = {
+    'EFU': 'Enterococcus faecium',
+    'EFA': 'Enterococcus faecalis',
+    'PSA': 'Pseudomonas aeruginosa',
+    'ABA': 'Acinetobacter baumannii',
+    'SAU': 'Staphylococcus aureus',
+}
+
+CRE_ORGANISMS = [
+    'Escherichia coli',
+    'Escherichia hermanii',
+    'Escherichia vulneris',
+    'Klebsiella aerogenes',
+    'Klebsiella ornithinolytica',
+    'Klebsiella oxytoca',
+    'Klebsiella planticola',
+    'Klebsiella pneumoniae',
+    'Klebsiella variicola',
+    'Enterobacter aerogenes',
+    'Enterobacter asburiae',
+    'Enterobacter bugandensis',
+    'Enterobacter cloacae',
+    'Enterobacter gergoviae',
+    'Enterobacter kobei',
+    'Enterobacter ludwigii',
+    'Enterobacter sakazakii',
+    'Citrobacter amalonaticus',
+    'Citrobacter braakii',
+    'Citrobacter farmeri',
+    'Citrobacter freundii',
+    'Citrobacter sedlakii',
+    'Citrobacter youngae',
+    'Salmonella Group B',
+    'Salmonella Group C',
+    'Salmonella Group D',
+    'Salmonella species',
+    'Proteus hauseri',
+    'Proteus mirabilis',
+    'Proteus penneri',
+    'Proteus vulgaris',
+    'Morganella morganii',
+    'Providencia rettgeri',
+    'Providencia stuartii',
+    'Providencia vermicola',
+    'Serratia grimesii',
+    'Serratia liquefaciens',
+    'Serratia marcescens',
+    'Serratia nematodiphila',
+    'Serratia odorifera',
+    'Serratia plymuthica',
+    'Serratia rubidaea',
+    'Hafnia alvei',
+    'Leclercia adecarboxylata',
+]
+
+
+def flag_organisms(df):
+    """
+    '균주명' 에 해당 균 문자열이 포함되어 있으면 1, 아니면 0 (EFU, EFA, PSA, ABA, SAU, CRE). df 를 직접 수정합니다.
+    행마다 lambda 를 부르지 않고 컬럼 단위 문자열 검색 한 번으로 계산 (결과는 기존 apply 방식과 동일)
+    """
+    names = df['균주명'].astype(str)
+    for col, organism in ORGANISM_FLAGS.items():
+        df[col] = names.str.contains(organism, regex=False).astype(int)
+    cre_pattern = '|'.join(re.escape(organism) for organism in CRE_ORGANISMS)
+    df['CRE'] = names.str.contains(cre_pattern, regex=True).astype(int)
+    return df
+
+
+# 4. 항생제 내성 약어 컬럼: (컬럼, 대상 균 약어 컬럼, 항생제)
+RESISTANCE_RULES = [
+    ('EVAN(R)', ['EFU', 'EFA'], 'Vancomycin'),
+    ('PIMP(R)', ['PSA'], 'Imipenem'),
+    ('PMEM(R)', ['PSA'], 'Meropenem'),
+    ('AIMP(R)', ['ABA'], 'Imipenem'),
+    ('AMEM(R)', ['ABA'], 'Meropenem'),
+    ('OXA(R)', ['SAU'], 'Oxacillin'),
+    ('SVAN(R)', ['SAU'], 'Vancomycin'),
+    ('CIMP(R)', ['CRE'], 'Imipenem'),
+    ('CMEM(R)', ['CRE'], 'Meropenem'),
+    ('CETP(R)', ['CRE'], 'Ertapenem'),
+]
+
+
+def flag_resistance(df, text_col='검사결과'):
+    """
+    대상 균이면서 검사결과에 '<항생제> <MIC> (R)' 이 있으면 1. df 를 직접 수정합니다.
+    같은 항생제 검색은 한 번만 수행해서 규칙끼리 공유합니다.
+    """
+    text = df[text_col]
+    resistant = {}
+    for _, _, antibiotic in RESISTANCE_RULES:
+        if antibiotic not in resistant:
+            resistant[antibiotic] = (
+                text.str.contains(antibiotic, case=False, na=False) &
+                text.str.contains(rf'{antibiotic}\s+\S+\s+\(R\)', regex=True, na=False)
+            )
+    for col, organism_cols, antibiotic in RESISTANCE_RULES:
+        target = (df[organism_cols] == 1).any(axis=1)
+        df[col] = (target & resistant[antibiotic]).astype(int)
+    return df
+
+
+# 5. First isolation
+def first_isolation(df, mask, date_col='검사시행일자', keys=('환자번호', '검체명(주검체)', '년월')):
+    """
+    mask 가 True 인 행 중 keys 그룹마다 date_col 이 가장 빠른 행 1개
+    """
+    return df[mask].sort_values(by=date_col).groupby(list(keys), as_index=False).first()
@@ -0,0 +1,153 @@
+# 합성 미생물 배양 검사결과 생성기
+# - 실제 환자 데이터 없이 parse/explode/flag/first isolation 단계를 대량으로 벤치마크하기 위한 데이터
+# - 원데이터(미생물 배양 검사*.xlsx)와 같은 컬럼: 환자번호, 검사시행일시, 검사시행일자, 검체명(주검체), 검사결과
+# - 검사결과 텍스트: 동정결과 블록(균 1~3개), 항생제 감수성결과 표(MIC + (S)/(R)/(I)), No Growth, COMMENT/(최종보고)
+# - 규모, 균 구성비, 다균 비율, No Growth 비율, 내성률을 인자로 조절
+
+import numpy as np
+import pandas as pd
+
+# 1. 기본 구성비 (균, 상대 빈도)
+ORGANISM_MIX = {
+    'Escherichia coli': 20,
+    'Klebsiella pneumoniae': 12,
+    'Staphylococcus aureus': 12,
+    'Pseudomonas aeruginosa': 8,
+    'Enterococcus faecium': 7,
+    'Enterococcus faecalis': 6,
+    'Acinetobacter baumannii': 5,
+    'Enterobacter cloacae': 4,
+    'Proteus mirabilis': 3,
+    'Serratia marcescens': 2,
+    'Citrobacter freundii': 2,
+    'Klebsiella oxytoca': 2,
+    'Morganella morganii': 1,
+    'Staphylococcus epidermidis': 8,
+    'Streptococcus agalactiae': 3,
+    'Candida albicans': 5,
+}
+
+# 균 그룹별 항생제 패널: (항생제, 내성(R) 확률)
+PANELS = {
+    'enterobacterales': [('Ampicillin', 0.6), ('Cefazolin', 0.4), ('Cefotaxime', 0.3), ('Ciprofloxacin', 0.35),
+                         ('Ertapenem', 0.04), ('Imipenem', 0.03), ('Meropenem', 0.03), ('Gentamicin', 0.15),
+                         ('Trimethoprim/Sulfamethoxazole', 0.3)],
+    'pseudomonas': [('Piperacillin/Tazobactam', 0.2), ('Ceftazidime', 0.2), ('Cefepime', 0.15),
+                    ('Imipenem', 0.25), ('Meropenem', 0.2), ('Amikacin', 0.05), ('Ciprofloxacin', 0.25)],
+    'acinetobacter': [('Ampicillin/Sulbactam', 0.6), ('Ceftazidime', 0.75), ('Imipenem', 0.8),
+                      ('Meropenem', 0.8), ('Amikacin', 0.5), ('Colistin', 0.02)],
+    'staphylococcus': [('Penicillin G', 0.9), ('Oxacillin', 0.5), ('Erythromycin', 0.5), ('Clindamycin', 0.35),
+                       ('Vancomycin', 0.002), ('Teicoplanin', 0.01), ('Linezolid', 0.005)],
+    'enterococcus': [('Ampicillin', 0.6), ('High level gentamicin', 0.4), ('Vancomycin', 0.3),
+                     ('Teicoplanin', 0.25), ('Linezolid', 0.01)],
+    'streptococcus': [('Penicillin G', 0.05), ('Erythromycin', 0.4), ('Clindamycin', 0.3)],
+}
+
+ORGANISM_PANEL = {
+    'Pseudomonas aeruginosa': 'pseudomonas',
+    'Acinetobacter baumannii': 'acinetobacter',
+    'Staphylococcus aureus': 'staphylococcus',
+    'Staphylococcus epidermidis': 'staphylococcus',
+    'Enterococcus faecium': 'enterococcus',
+    'Enterococcus faecalis': 'enterococcus',
+    'Streptococcus agalactiae': 'streptococcus',
+    'Candida albicans': None,
+}
+
+SPECIMENS = {
+    'Sputum': 25, 'Urine': 25, 'Whole Blood(Peripheral)': 10, 'Whole Blood(C line)': 4, 'Whole Blood(성인)': 4,
+    'Whole Blood(소아)': 1, 'Wound': 8, 'Stool': 6, 'Pus': 6, 'Bronchial washing': 5, 'Catheter tip': 3,
+    'Body fluid': 3,
+}
+
+AMOUNTS = ['Few', 'Moderate', 'Many', '10^5 CFU/mL 이상', '10^4 CFU/mL']
+SUSCEPTIBLE_MIC = ['<=0.25', '<=0.5', '<=1', '0.5', '1', '2']
+RESISTANT_MIC = ['>=16', '>=32', '>=64', '8', '16', '32']
+COMMENTS = [
+    '',
+    'COMMENT: 다제내성균 의심, 감염관리실 통보\n',
+    'COMMENT: 재검 요망\n',
+    'COMMENT: 혼합균 배양됨\n',
+]
+
+
+# 2. 텍스트 생성
+def _organism_block(organism, amount, panel, rng, resistance_scale):
+    lines = [f'동정결과: {organism}, 정도: {amount}\n']
+    if panel is not None:
+        lines.append('항생제 감수성결과\n')
+        lines.append('-' * 40 + '\n')
+        for antibiotic, p_resistant in PANELS[panel]:
+            u = rng.random()
+            p = min(p_resistant * resistance_scale, 1.0)
+            if u < p:
+                mic, judgment = RESISTANT_MIC[int(u * 1e6) % len(RESISTANT_MIC)], 'R'
+            elif u < p + 0.03:
+                mic, judgment = '4', 'I'
+            else:
+                mic, judgment = SUSCEPTIBLE_MIC[int(u * 1e6) % len(SUSCEPTIBLE_MIC)], 'S'
+            lines.append(f'{antibiotic:<32}{mic:<10}({judgment})\n')
+    return ''.join(lines)
+
+
+def _report_text(organisms, amounts, comment, rng, resistance_scale):
+    if not organisms:
+        return 'No Growth (48시간 배양)\n\n(최종보고)'
+    blocks = [
+        _organism_block(org, amt, ORGANISM_PANEL.get(org, 'enterobacterales'), rng, resistance_scale)
+        for org, amt in zip(organisms, amounts)
+    ]
+    return '\n'.join(blocks) + '\n' + comment + '(최종보고)'
+
+
+# 3. 데이터프레임 생성
+def generate_reports(n, organism_mix=None, multi_rate=0.15, no_growth_rate=0.35, resistance_scale=1.0,
+                     n_patients=None, start='2020-01-01', end='2024-12-31', seed=0):
+    """
+    n 건의 검사결과 행을 만듭니다.
+    organism_mix: {균주명: 상대 빈도} (기본 ORGANISM_MIX), multi_rate: 균 2개 이상 보고 비율,
+    no_growth_rate: No Growth 비율, resistance_scale: 패널 내성률 배수, n_patients: 환자 수 (기본 n/4)
+    """
+    rng = np.random.default_rng(seed)
+    mix = organism_mix or ORGANISM_MIX
+    names = np.array(list(mix))
+    weights = np.array(list(mix.values()), dtype=float)
+    weights /= weights.sum()
+
+    # 보고서별 균 수: 0 (No Growth), 1, 2~3 (다균)
+    n_orgs = np.where(rng.random(n) < no_growth_rate, 0,
+                      np.where(rng.random(n) < multi_rate, rng.integers(2, 4, n), 1))
+    organism_idx = rng.choice(len(names), size=(n, 3), p=weights)
+    amount_idx = rng.integers(0, len(AMOUNTS), size=(n, 3))
+    comment_idx = rng.choice(len(COMMENTS), size=n, p=[0.85, 0.05, 0.05, 0.05])
+
+    texts = []
+    for i in range(n):
+        k = n_orgs[i]
+        organisms = list(dict.fromkeys(names[organism_idx[i, :k]]))  # 같은 보고서에 같은 균은 한 번만
+        amounts = [AMOUNTS[j] for j in amount_idx[i, :len(organisms)]]
+        texts.append(_report_text(organisms, amounts, COMMENTS[comment_idx[i]], rng, resistance_scale))
+
+    specimen_names = list(SPECIMENS)
+    specimen_p = np.array(list(SPECIMENS.values()), dtype=float)
+    specimen_p /= specimen_p.sum()
+
+    start_ns = pd.Timestamp(start).value
+    end_ns = pd.Timestamp(end).value
+    timestamps = pd.to_datetime(rng.integers(start_ns, end_ns, n)).floor('min')
+
+    n_patients = n_patients or max(n // 4, 1)
+    return pd.DataFrame({
+        '환자번호': rng.integers(10_000_000, 10_000_000 + n_patients, n),
+        '검사시행일시': timestamps,
+        '검사시행일자': timestamps.normalize(),
+        '검체명(주검체)': np.array(specimen_names)[rng.choice(len(specimen_names), size=n, p=specimen_p)],
+        '검사결과': texts,
+    })
+
+
+if __name__ == '__main__':
+    sample = generate_reports(5, seed=1)
+    for text in sample['검사결과']:
+        print(text)
+        print('=' * 60)
@@ -0,0 +1,101 @@
+# 검사결과 파싱/플래그 처리량 벤치마크 (합성 데이터)
+# - synthetic_reports.py 로 만든 검사결과 n 건에 대해 단계별 처리량(보고서/초)과 메모리 측정
+#   parse (검사결과 → 균/내성 패턴), explode (균별 행 확장), flag (균주/내성 약어 컬럼), first_isolation (카운트 스크립트와 같은 lab_report.first_isolation, 표본감시 월별 키)
+# - 규모별로 새 프로세스에서 실행 (프로세스 최대 메모리가 이전 규모 결과와 섞이지 않도록)
+# - python 파싱_벤치마크.py [건수 ...] [--tracemalloc]   (기본: 10000 100000 1000000)
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from lab_report import explode_organisms, first_isolation, flag_organisms, flag_resistance, \
+    parse_multi_organism_and_resistance
+from synthetic_reports import generate_reports
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'predictive_model'))
+from profiling import StageProfiler
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# 카운트 스크립트의 감염병별 first isolation 대상 (플래그 컬럼 중 하나라도 1)
+FIRST_ISOLATION_TARGETS = {
+    'VRE': ['EVAN(R)'],
+    'MRPA': ['PIMP(R)', 'PMEM(R)'],
+    'MRAB': ['AIMP(R)', 'AMEM(R)'],
+    'MRSA': ['OXA(R)'],
+    'CRE': ['CIMP(R)', 'CMEM(R)', 'CETP(R)'],
+    'VRSA': ['SVAN(R)'],
+}
+
+
+# 1. 규모 하나 실행 (별도 프로세스)
+def run_size(n, trace_memory=False, seed=0):
+    start = time.perf_counter()
+    df = generate_reports(n, seed=seed)
+    generate_s = time.perf_counter() - start
+
+    profiler = StageProfiler(f'파싱_벤치마크_{n}', profile=False, trace_memory=trace_memory)
+
+    profiler.mark('parse')
+    df['Parsed_Results'] = df['검사결과'].apply(parse_multi_organism_and_resistance)
+
+    profiler.mark('explode')
+    expanded = explode_organisms(df)
+
+    profiler.mark('flag')
+    flag_organisms(expanded)
+    flag_resistance(expanded)
+
+    profiler.mark('first_isolation')
+    expanded['년월'] = expanded['검사시행일자'].dt.to_period('M')
+    isolates = {name: len(first_isolation(expanded, (expanded[cols] == 1).any(axis=1)))
+                for name, cols in FIRST_ISOLATION_TARGETS.items()}
+
+    profiler.stop()
+    profiler.save(verbose=False)
+    report = profiler.report()
+
+    rows = []
+    for stage in report['stages']:
+        rows.append({
+            '건수': n,
+            '단계': stage['name'],
+            '경과(s)': stage['wall_s'],
+            '보고서/초': n / stage['wall_s'] if stage['wall_s'] > 0 else float('nan'),
+            'peak RSS(MB)': stage['peak_rss_mb'],
+            '할당 peak(MB)': stage.get('py_alloc_peak_mb'),
+        })
+    summary = {'건수': n, '생성(s)': generate_s, '확장 행수': len(expanded), **isolates}
+    return rows, summary
+
+
+# 2. 전체 규모 실행
+def run_benchmark(sizes=None, trace_memory=False):
+    spawn = multiprocessing.get_context('spawn')
+    rows, summaries = [], []
+    for n in sizes or DEFAULT_SIZES:
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+            size_rows, summary = executor.submit(run_size, n, trace_memory).result()
+        rows.extend(size_rows)
+        summaries.append(summary)
+        print(f"✅ {n:,}건 완료 ({sum(r['경과(s)'] for r in size_rows):.1f}s)")
+    return pd.DataFrame(rows), pd.DataFrame(summaries)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    trace_memory = '--tracemalloc' in args
+    sizes = [int(arg) for arg in args if arg != '--tracemalloc'] or DEFAULT_SIZES
+
+    result_df, summary_df = run_benchmark(sizes, trace_memory)
+    if not trace_memory:
+        result_df = result_df.drop(columns='할당 peak(MB)')
+
+    print("\n📊 단계별 처리량 (보고서/초 = 원본 검사결과 건수 기준):")
+    print(result_df.round(2).to_string(index=False))
+    print("\n📌 규모별 요약 (생성 시간, 균별 확장 행수, 감염병별 first isolation 건수):")
+    print(summary_df.round(2).to_string(index=False))
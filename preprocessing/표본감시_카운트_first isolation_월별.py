@@ -1,6 +1,16 @@
 # 라이브러리 임포트
 import pandas as pd
 import os
+import sys
+
+# 단계별 소요시간/메모리 측정 (predictive_model/profiling.py, 실행마다 JSON 보고서)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'predictive_model'))
+from profiling import StageProfiler
+
+# First isolation 은 lab_report.first_isolation (파싱 벤치마크와 같은 코드 사용)
+from lab_report import first_isolation
+
+profiler = StageProfiler('표본감시_카운트')
 
 # 엑셀 파일 경로
 file_path = 'C:/kdtcb_learn/내부데이터_전처리_최종(FirstIsolation 전).xlsx'
@@ -15,10 +25,12 @@ if not os.path.exists(file_path):
     print(f"오류: 파일을 찾을 수 없습니다 - {file_path}")
 else:
     try:
+        profiler.mark('load')
         # 엑셀 파일 읽기
         df = pd.read_excel(file_path)
         print(f"파일 불러오기 성공. 총 {len(df)} 행.")
 
+        profiler.mark('prepare')
         # 필요한 공통 컬럼 ('검사시행일자', '환자번호', '검체명(주검체)')이 존재하는지 확인
         common_required_cols = ['검사시행일자', '환자번호', '검체명(주검체)'] # '검체명(주검체)' 추가
         for col in common_required_cols:
@@ -35,6 +47,7 @@ else:
         # '검사시행일자'를 기준으로 '년월' 컬럼 생성 (월 단위)
         df['년월'] = df['검사시행일자'].dt.to_period('M')
 
+        profiler.mark('first_isolation')
         # 각 감염병 유형별 First Isolation 데이터프레임을 저장할 딕셔너리
         first_isolation_dfs = {}
 
@@ -46,16 +59,15 @@ else:
             first_isolation_dfs['VRE'] = pd.DataFrame() # 빈 데이터프레임 할당
             print("VRE 분석을 건너e띄니다.")
         else:
-            df_vre_only = df[df['EVAN(R)'] == 1].copy() #
+            vre_mask = df['EVAN(R)'] == 1
+            df_vre_only = df[vre_mask] #
             if df_vre_only.empty:
                 print("경고: 'EVAN(R)' 컬럼 값이 1인 데이터가 없어 VRE First Isolation을 수행할 수 없습니다.") #
                 first_isolation_dfs['VRE'] = pd.DataFrame()
             else:
                 print(f"'EVAN(R)'이 1인 원본 데이터 수: {len(df_vre_only)} 행")
                 # Groupby에 '검체명(주검체)' 추가
-                df_vre_first_isolation = df_vre_only.sort_values(by='검사시행일자').groupby(
-                    ['환자번호', '검체명(주검체)', '년월'], as_index=False # '검체명(주검체)' 추가
-                ).first()
+                df_vre_first_isolation = first_isolation(df, vre_mask, keys=('환자번호', '검체명(주검체)', '년월'))
                 first_isolation_dfs['VRE'] = df_vre_first_isolation
                 print(f"VRE(EVAN(R)) First Isolation 적용 후 데이터 수: {len(df_vre_first_isolation)} 행")
                 print("VRE(EVAN(R)) First Isolation 적용 후 데이터프레임의 상위 5행:")
@@ -74,16 +86,15 @@ else:
             first_isolation_dfs['MRPA'] = pd.DataFrame()
             print("MRPA 분석을 건너뜁니다.")
         else:
-            df_mrpa_only = df[((df['PIMP(R)'] == 1) | (df['PMEM(R)'] == 1))].copy() #
+            mrpa_mask = ((df['PIMP(R)'] == 1) | (df['PMEM(R)'] == 1))
+            df_mrpa_only = df[mrpa_mask] #
             if df_mrpa_only.empty:
                 print("경고: 'PIMP(R)' 또는 'PMEM(R)' 컬럼 값이 1인 데이터가 없어 MRPA First Isolation을 수행할 수 없습니다.") #
                 first_isolation_dfs['MRPA'] = pd.DataFrame()
             else:
                 print(f"MRPA 관련 원본 데이터 수: {len(df_mrpa_only)} 행")
                 # Groupby에 '검체명(주검체)' 추가
-                df_mrpa_first_isolation = df_mrpa_only.sort_values(by='검사시행일자').groupby(
-                    ['환자번호', '검체명(주검체)', '년월'], as_index=False # '검체명(주검체)' 추가
-                ).first()
+                df_mrpa_first_isolation = first_isolation(df, mrpa_mask, keys=('환자번호', '검체명(주검체)', '년월'))
                 first_isolation_dfs['MRPA'] = df_mrpa_first_isolation
                 print(f"MRPA First Isolation 적용 후 데이터 수: {len(df_mrpa_first_isolation)} 행")
                 print("MRPA First Isolation 적용 후 데이터프레임의 상위 5행:")
@@ -102,16 +113,15 @@ else:
             first_isolation_dfs['MRAB'] = pd.DataFrame()
             print("MRAB 분석을 건너뜁니다.")
         else:
-            df_mrab_only = df[((df['AIMP(R)'] == 1) | (df['AMEM(R)'] == 1))].copy() #
+            mrab_mask = ((df['AIMP(R)'] == 1) | (df['AMEM(R)'] == 1))
+            df_mrab_only = df[mrab_mask] #
             if df_mrab_only.empty:
                 print("경고: 'AIMP(R)' 또는 'AMEM(R)' 컬럼 값이 1인 데이터가 없어 MRAB First Isolation을 수행할 수 없습니다.") #
                 first_isolation_dfs['MRAB'] = pd.DataFrame()
             else:
                 print(f"MRAB 관련 원본 데이터 수: {len(df_mrab_only)} 행")
                 # Groupby에 '검체명(주검체)' 추가
-                df_mrab_first_isolation = df_mrab_only.sort_values(by='검사시행일자').groupby(
-                    ['환자번호', '검체명(주검체)', '년월'], as_index=False # '검체명(주검체)' 추가
-                ).first()
+                df_mrab_first_isolation = first_isolation(df, mrab_mask, keys=('환자번호', '검체명(주검체)', '년월'))
                 first_isolation_dfs['MRAB'] = df_mrab_first_isolation
                 print(f"MRAB First Isolation 적용 후 데이터 수: {len(df_mrab_first_isolation)} 행")
                 print("MRAB First Isolation 적용 후 데이터프레임의 상위 5행:")
@@ -130,16 +140,15 @@ else:
             first_isolation_dfs['MRSA'] = pd.DataFrame()
             print("MRSA 분석을 건너킵니다.")
         else:
-            df_mrsa_only = df[df['OXA(R)'] == 1].copy() #
+            mrsa_mask = df['OXA(R)'] == 1
+            df_mrsa_only = df[mrsa_mask] #
             if df_mrsa_only.empty:
                 print("경고: 'OXA(R)' 컬럼 값이 1인 데이터가 없어 MRSA First Isolation을 수행할 수 없습니다.") #
                 first_isolation_dfs['MRSA'] = pd.DataFrame()
             else:
                 print(f"'OXA(R)'이 1인 원본 데이터 수: {len(df_mrsa_only)} 행")
                 # Groupby에 '검체명(주검체)' 추가
-                df_mrsa_first_isolation = df_mrsa_only.sort_values(by='검사시행일자').groupby(
-                    ['환자번호', '검체명(주검체)', '년월'], as_index=False # '검체명(주검체)' 추가
-                ).first()
+                df_mrsa_first_isolation = first_isolation(df, mrsa_mask, keys=('환자번호', '검체명(주검체)', '년월'))
                 first_isolation_dfs['MRSA'] = df_mrsa_first_isolation
                 print(f"MRSA First Isolation 적용 후 데이터 수: {len(df_mrsa_first_isolation)} 행")
                 print("MRSA First Isolation 적용 후 데이터프레임의 상위 5행:")
@@ -150,6 +159,7 @@ else:
                 print(f"\n총 MRSA (OXA(R)) First Isolation 건수: {len(df_mrsa_first_isolation)} 건")
 
 
+        profiler.mark('monthly_counts')
         # --- 모든 표본감시 감염병의 월별 First Isolation 건수 합계 ---
         print("\n========== 월별 의료관련감염병 (표본감시) 건수 합계 ==========")
 
@@ -179,6 +189,7 @@ else:
         print("\n--- 월별 표본감시 감염볍 건수 요약 ---")
         print(combined_monthly_counts)
 
+        profiler.mark('export')
         # --- 최종 결과 엑셀 파일로 저장 ---
         output_combined_file_name = '월별_표본감시_건수.xlsx'
         print(f"\n========== 월별 표본감시 감염병 건수 엑셀 파일 저장 시작 ==========")
@@ -191,4 +202,6 @@ else:
     except Exception as e:
         print(f"파일 처리 중 오류 발생: {e}")
 
+profiler.save()
+
 print("\n--- 표본감시 감염병 건수 세기 완료 ---")